@@ -10,9 +10,17 @@ import socket
 # Add backend to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from src.api.server import app
+from src.api.server import app, begin_drain
 import uvicorn
 
+class GracefulServer(uvicorn.Server):
+    """uvicorn server that lets the app drain before connections are closed"""
+    
+    async def shutdown(self, sockets=None):
+        # Tell clients to reconnect and stop admitting matches while sockets are still open
+        await begin_drain()
+        await super().shutdown(sockets=sockets)
+
 def get_local_ip():
     """Get the local IP address"""
     try:
@@ -42,9 +50,14 @@ def main():
     print("  - Wordle: API at /api/wordle/*")
     print("  - NYT Connections: API at /api/connections/*")
     print("  - Voting: API at /api/vote/*")
+    print("  - Multiplexed WebSocket: /ws (subscribe to game/votes/interviews topics)")
     print("-" * 50)
     
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # permessage-deflate is negotiated per connection; set VERSUS_WS_DEFLATE=0 to turn it off
+    ws_deflate = os.getenv("VERSUS_WS_DEFLATE", "1") != "0"
+    
+    config = uvicorn.Config(app, host="0.0.0.0", port=8000, ws_per_message_deflate=ws_deflate)
+    GracefulServer(config).run()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Bot simulation runner
+Plays bot-vs-bot games on the game engines across all cores and streams win rates and the game
+length distribution as chunks finish. Bots swap seats every other game.
+
+Usage:
+  python scripts/simulate.py battleship hunt_target probability --games 10000
+  python scripts/simulate.py battleship hunt_target probability --board-size 12 --ship carrier=5 --ship sub=3
+  python scripts/simulate.py wordle solver random --games 2000 --workers 4 --seed 7
+  python scripts/simulate.py connections solver solver --games 500 --json
+  python scripts/simulate.py --list
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from src.utils.log import setup_logging, shutdown_logging  # noqa: E402
+from src.services.simulation import (BOTS, DEFAULT_CHUNK_SIZE, DEFAULT_WORKERS, SimulationConfig,  # noqa: E402
+                                     simulate)
+
+# Seconds between progress lines
+PROGRESS_INTERVAL = 1.0
+HISTOGRAM_WIDTH = 40
+
+
+def print_summary(summary: dict):
+    print(f"\n🎲 {summary['game_type']}: {summary['games']} games in {summary['elapsed']}s "
+          f"({summary['games_per_second']} games/s)")
+    for player in summary["players"]:
+        score = next(f"{key[5:]} {value}" for key, value in player.items() if key.startswith("mean_"))
+        print(f"  {player['bot']:<14} {player['win_rate']:>7.1%} wins   mean {score}")
+    print(f"  {'draws':<14} {summary['draw_rate']:>7.1%}")
+
+    length = summary["length"]
+    print(f"\nLength: mean {length['mean']}, p50 {length['p50']}, p90 {length['p90']}, "
+          f"range {length['min']}-{length['max']}")
+    peak = max(length["histogram"].values(), default=1)
+    for turns, count in length["histogram"].items():
+        print(f"  {turns:>4} {'#' * max(1, round(count / peak * HISTOGRAM_WIDTH))} {count}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("game", nargs="?", choices=BOTS, help="game engine to simulate")
+    parser.add_argument("bot1", nargs="?", help="first bot (see --list)")
+    parser.add_argument("bot2", nargs="?", help="second bot")
+    parser.add_argument("--list", action="store_true", help="list the bots of each game and exit")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0, help="same seed, same games")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="processes (default: one per core)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="games per task sent to a worker")
+    parser.add_argument("--board-size", type=int, help="battleship board size (default 8)")
+    parser.add_argument("--ship", action="append", metavar="NAME=SIZE",
+                        help="battleship fleet, one per ship (default: the standard fleet)")
+    parser.add_argument("--no-touch", action="store_true", help="battleship ships may not touch, even diagonally")
+    parser.add_argument("--json", action="store_true", help="print the final statistics as JSON")
+    args = parser.parse_args()
+
+    if args.list:
+        for game, bots in BOTS.items():
+            print(f"{game}: {', '.join(bots)}")
+        return 0
+    if not (args.game and args.bot1 and args.bot2):
+        parser.error("game, bot1 and bot2 are required")
+
+    try:
+        ships = {name: int(size) for name, size in (ship.split("=", 1) for ship in args.ship)} if args.ship else None
+    except ValueError:
+        parser.error("--ship takes NAME=SIZE")
+    config = SimulationConfig(args.game, args.bot1, args.bot2, games=args.games, seed=args.seed,
+                              workers=args.workers, chunk_size=args.chunk_size, board_size=args.board_size, ships=ships,
+                              no_touch=args.no_touch)
+    try:
+        config.validate()
+    except ValueError as e:
+        parser.error(str(e))
+
+    # Keep stdout pure JSON in --json mode
+    setup_logging(output=sys.stderr if args.json else None)
+    try:
+        last_print = 0.0
+        stats = None
+        for stats in simulate(config):
+            now = time.monotonic()
+            if not args.json and now - last_print >= PROGRESS_INTERVAL:
+                last_print = now
+                rates = " / ".join(f"{bot} {wins / stats.games:.1%}" for bot, wins in zip(stats.bots, stats.wins))
+                print(f"\r  {stats.games}/{config.games} games  {rates}  draws {stats.draws / stats.games:.1%}",
+                      end="", flush=True)
+        summary = stats.to_dict()
+        if args.json:
+            print(json.dumps(summary, indent=2))
+        else:
+            print_summary(summary)
+        return 0
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        shutdown_logging()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Startup budget check
+Times a cold `import src.api.server` in fresh interpreters (minus a bare interpreter's own
+startup) and fails (exit 1) when the median goes over budget, or when a provider SDK / Flask
+is pulled onto the import path
+
+Usage: python scripts/startup_budget.py [--runs 5] [--budget-ms 800] [--top 10]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY_MODULE = "src.api.server"
+
+DEFAULT_BUDGET_MS = float(os.getenv("VERSUS_STARTUP_BUDGET_MS", "800"))
+
+# These are only needed once a match (or the standalone Flask apps) actually runs
+LAZY_MODULES = ("flask", "flask_cors", "openai", "anthropic", "groq", "google.generativeai",
+                "letta_client", "httpx", "uvicorn", "numpy")
+
+CHECK_SCRIPT = (
+    "import sys; import {entry}; "
+    "print(','.join(m for m in {lazy!r} if m in sys.modules))"
+)
+
+
+def run_once(env: dict, code: str) -> Tuple[float, List[str], str]:
+    """Run `code` in a new interpreter; returns (ms, eagerly imported lazy modules, importtime log)"""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        raise SystemExit(f"❌ Importing {ENTRY_MODULE} failed")
+    lines = result.stdout.strip().splitlines()
+    leaked = [name for name in (lines[-1].split(",") if lines else []) if name]
+    return elapsed_ms, leaked, result.stderr
+
+
+def heaviest_imports(importtime_log: str, baseline_log: str, top: int) -> List[Tuple[int, str]]:
+    """The entry module's direct imports by cumulative import time (microseconds)"""
+    preloaded = set(_parse(baseline_log))
+    entries = []
+    for cumulative, name, depth in _parse(importtime_log).values():
+        if depth == 1 and name not in preloaded:
+            entries.append((cumulative, name))
+    return sorted(entries, reverse=True)[:top]
+
+
+def _parse(importtime_log: str) -> dict:
+    """module name -> (cumulative microseconds, name, nesting depth)"""
+    entries = {}
+    for line in importtime_log.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # importtime indents each nesting level by two spaces after the separator
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries[name.strip()] = (int(cumulative), name.strip(), depth)
+    return entries
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to time")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="median cold import budget (default VERSUS_STARTUP_BUDGET_MS or 800)")
+    parser.add_argument("--top", type=int, default=10, help="heaviest imports to list")
+    args = parser.parse_args()
+
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1", VERSUS_LOG_LEVEL="ERROR")
+    # Warm the OS file cache and .pyc files so every timed run is comparable
+    subprocess.run([sys.executable, "-c", f"import {ENTRY_MODULE}"], cwd=BACKEND_DIR,
+                   env=dict(env, PYTHONDONTWRITEBYTECODE=""), capture_output=True)
+
+    check = CHECK_SCRIPT.format(entry=ENTRY_MODULE, lazy=LAZY_MODULES)
+    baselines, timings, leaked, importtime_log, baseline_log = [], [], [], "", ""
+    for _ in range(args.runs):
+        # Interleave bare-interpreter runs so machine noise hits both the same way
+        elapsed_ms, _, baseline_log = run_once(env, "pass")
+        baselines.append(elapsed_ms)
+        elapsed_ms, leaked, importtime_log = run_once(env, check)
+        timings.append(elapsed_ms)
+
+    baseline = statistics.median(baselines)
+    median = statistics.median(timings) - baseline
+    print(f"⏱️  {ENTRY_MODULE} cold import: median {median:.0f}ms over {args.runs} runs "
+          f"(plus {baseline:.0f}ms interpreter startup; budget {args.budget_ms:.0f}ms)")
+    print("Heaviest imports:")
+    for cumulative, name in heaviest_imports(importtime_log, baseline_log, args.top):
+        print(f"  {cumulative / 1000:8.1f}ms  {name}")
+
+    failed = False
+    if leaked:
+        print(f"❌ Imported eagerly, should load on first use: {', '.join(leaked)}")
+        failed = True
+    if median > args.budget_ms:
+        print(f"❌ Over budget by {median - args.budget_ms:.0f}ms")
+        failed = True
+    if not failed:
+        print("✅ Within startup budget")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Headless tournament runner
+Plays every pairing of the given models in the given game types (round-robin, or Swiss rounds)
+with no server or browser, and checkpoints each match in the results store. Ctrl+C pauses;
+--resume picks up the remaining matches.
+
+Usage:
+  python scripts/tournament.py --models gpt-4o-mini claude-3-haiku-20240307 gemini-pro --games battleship trivia
+  python scripts/tournament.py --models ... --games wordle --format swiss --rounds 4 --rpm openai=500 --rpm anthropic=50
+  python scripts/tournament.py --resume <id> [--retry-failed]
+  python scripts/tournament.py --standings <id> | --list
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from src.utils.log import setup_logging, shutdown_logging  # noqa: E402
+from src.services.headless import GAME_TYPES  # noqa: E402
+from src.services.provider_limits import ProviderLimiter, DEFAULT_CONCURRENCY as PROVIDER_CONCURRENCY, DEFAULT_RPM  # noqa: E402
+from src.services.tournaments import (FORMATS, DEFAULT_CONCURRENCY, DEFAULT_DB_PATH, TournamentConfig,  # noqa: E402
+                                      TournamentRunner, TournamentStore, standings)
+
+
+def parse_limit_args(values) -> dict:
+    limits = {}
+    for value in values or []:
+        provider, sep, limit = value.partition("=")
+        if not sep or not limit.isdigit():
+            raise SystemExit(f"❌ Expected provider=N, got '{value}'")
+        limits[provider.strip().lower()] = int(limit)
+    return limits
+
+
+def print_standings(store: TournamentStore, tournament_id: str):
+    tournament = store.get(tournament_id)
+    if tournament is None:
+        raise SystemExit(f"❌ No tournament {tournament_id} in {store.db_path}")
+    matches = store.matches(tournament_id)
+    progress = store.progress(tournament_id)
+    config = tournament["config"]
+    print(f"🏆 {tournament['name']} ({tournament_id}) - {tournament['state']}: "
+          f"{progress['done']} played, {progress['pending'] + progress['running']} left, {progress['failed']} failed")
+    for game_type in config["game_types"] + [None]:
+        rows = standings([m for m in matches if game_type is None or m["game_type"] == game_type], config["models"])
+        print(f"\n{game_type or 'overall'}")
+        print(f"  {'model':<32} {'P':>3} {'W':>3} {'D':>3} {'L':>3} {'pts':>5} {'ms/call':>8} {'tokens':>8}")
+        for row in rows:
+            print(f"  {row['model']:<32} {row['played']:>3} {row['wins']:>3} {row['draws']:>3} {row['losses']:>3} "
+                  f"{row['points']:>5g} {row['latency_ms']:>8g} {row['tokens']:>8}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--models", nargs="+", help="model IDs to enter")
+    parser.add_argument("--games", nargs="+", choices=GAME_TYPES, help="game types to play")
+    parser.add_argument("--format", choices=FORMATS, default="round_robin")
+    parser.add_argument("--matches", type=int, default=2, help="matches per pairing and game type (seats alternate)")
+    parser.add_argument("--rounds", type=int, default=3, help="Swiss rounds")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="matches in flight at once")
+    parser.add_argument("--seed", type=int, default=0, help="picks boards, words, puzzles and questions")
+    parser.add_argument("--name", help="tournament name")
+    parser.add_argument("--rpm", action="append", metavar="PROVIDER=N",
+                        help=f"requests per minute for a provider (default {DEFAULT_RPM}; 0 = unlimited)")
+    parser.add_argument("--provider-concurrency", action="append", metavar="PROVIDER=N",
+                        help=f"concurrent calls for a provider (default {PROVIDER_CONCURRENCY})")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="results store (default VERSUS_TOURNAMENT_DB)")
+    parser.add_argument("--resume", metavar="ID", help="play the unfinished matches of a tournament")
+    parser.add_argument("--retry-failed", action="store_true", help="with --resume, replay failed matches too")
+    parser.add_argument("--standings", metavar="ID", help="print a tournament's standings and exit")
+    parser.add_argument("--list", action="store_true", help="list tournaments and exit")
+    args = parser.parse_args()
+
+    setup_logging()
+    store = TournamentStore(args.db)
+    try:
+        if args.list:
+            for tournament in store.recent():
+                print(f"{tournament['id']}  {tournament['state']:<9} {tournament['name']}")
+            return 0
+        if args.standings:
+            print_standings(store, args.standings)
+            return 0
+
+        if args.resume:
+            tournament = store.get(args.resume)
+            if tournament is None:
+                raise SystemExit(f"❌ No tournament {args.resume} in {store.db_path}")
+            tournament_id, config = args.resume, TournamentConfig(**tournament["config"])
+        else:
+            if not args.models or not args.games:
+                parser.error("--models and --games are required to start a tournament")
+            config = TournamentConfig(models=args.models, game_types=args.games, format=args.format,
+                                      matches_per_pair=args.matches, rounds=args.rounds,
+                                      concurrency=args.concurrency, seed=args.seed)
+            try:
+                config.validate()
+            except ValueError as e:
+                parser.error(str(e))
+            tournament_id = store.create(args.name or f"{len(config.models)} models, {', '.join(config.game_types)}", config)
+            print(f"🏟️  Tournament {tournament_id} created ({store.db_path})")
+
+        # Limits given here replace VERSUS_PROVIDER_*_BY_PROVIDER
+        limiter = ProviderLimiter(rpm=parse_limit_args(args.rpm) or None,
+                                  concurrency=parse_limit_args(args.provider_concurrency) or None)
+        try:
+            asyncio.run(TournamentRunner(store, tournament_id, config, limiter).run(args.retry_failed))
+        except KeyboardInterrupt:
+            print(f"\n⏸️  Paused. Resume with: python scripts/tournament.py --resume {tournament_id}")
+        print_standings(store, tournament_id)
+        return 0
+    finally:
+        shutdown_logging()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
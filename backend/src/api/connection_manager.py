@@ -0,0 +1,241 @@
+"""
+Topic-based WebSocket connection manager
+One socket can subscribe to several topics (game events, votes, interviews)
+"""
+
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+from fastapi import WebSocket
+
+from src.api.event_journal import EventJournal
+from src.api.protocol import JSON, encode_message, negotiate_protocol, receive_message, send_encoded
+from src.utils.metrics import BROADCAST_FANOUT
+
+# Topic kinds a client can subscribe to for a given game
+TOPIC_KINDS = ("game", "votes", "interviews")
+
+# Topic kinds whose events are journaled for catch-up on reconnect; vote
+# updates are cumulative, so the latest one is all a client needs
+JOURNALED_KINDS = ("game", "interviews")
+
+
+def game_topic(game_id: str) -> str:
+    """Topic carrying game events for a match"""
+    return f"game:{game_id}"
+
+
+def votes_topic(game_id: str) -> str:
+    """Topic carrying audience vote updates for a match"""
+    return f"votes:{game_id}"
+
+
+def interviews_topic(game_id: str) -> str:
+    """Topic carrying post-game roasts for a match"""
+    return f"interviews:{game_id}"
+
+
+def parse_topic(topic: str) -> Optional[tuple]:
+    """Split a topic into (kind, game_id), or None if it isn't a known topic"""
+    kind, sep, game_id = topic.partition(":")
+    if not sep or not game_id or kind not in TOPIC_KINDS:
+        return None
+    return kind, game_id
+
+
+class Subscriber:
+    """A connected socket and the topics it listens to"""
+
+    def __init__(self, websocket: WebSocket, tagged: bool = False, protocol: str = JSON):
+        self.websocket = websocket
+        # Multiplexed clients get a "topic" field on every message so they can
+        # route it; legacy per-game endpoints get the bare message.
+        self.tagged = tagged
+        self.protocol = protocol
+        self.topics: Set[str] = set()
+        # Live events held back per topic while journal replay is in progress
+        self.held: Dict[str, List[dict]] = {}
+
+    def encode(self, topic: Optional[str], message: dict):
+        if self.tagged and topic:
+            message = {"topic": topic, **message}
+        return encode_message(message, self.protocol)
+
+    async def send(self, topic: Optional[str], message: dict):
+        await send_encoded(self.websocket, self.encode(topic, message))
+
+
+class ConnectionManager:
+    def __init__(self):
+        self.topics: Dict[str, Set[Subscriber]] = {}
+        self.subscribers: Dict[WebSocket, Subscriber] = {}
+        # Last sequence number published on each topic
+        self.sequences: Dict[str, int] = {}
+        self.journal = EventJournal()
+
+    async def connect(self, websocket: WebSocket, topics: Iterable[str] = (), tagged: bool = False,
+                      since: Optional[Dict[str, int]] = None) -> Subscriber:
+        """Accept a socket, negotiate its wire protocol and subscribe it to the given topics
+
+        Topics listed in `since` are resumed from that sequence number instead
+        of starting with live events only.
+        """
+        protocol, subprotocol = negotiate_protocol(websocket)
+        await websocket.accept(subprotocol=subprotocol)
+        subscriber = Subscriber(websocket, tagged, protocol)
+        self.subscribers[websocket] = subscriber
+        since = since or {}
+        for topic in topics:
+            if topic in since:
+                await self.catch_up(websocket, topic, since[topic])
+            else:
+                self.subscribe(websocket, topic)
+        return subscriber
+
+    def subscribe(self, websocket: WebSocket, topic: str):
+        subscriber = self.subscribers.get(websocket)
+        if subscriber is None:
+            return
+        subscriber.topics.add(topic)
+        self.topics.setdefault(topic, set()).add(subscriber)
+
+    def unsubscribe(self, websocket: WebSocket, topic: str):
+        subscriber = self.subscribers.get(websocket)
+        if subscriber is None:
+            return
+        subscriber.topics.discard(topic)
+        if topic in self.topics:
+            self.topics[topic].discard(subscriber)
+            if not self.topics[topic]:
+                del self.topics[topic]
+
+    def disconnect(self, websocket: WebSocket):
+        subscriber = self.subscribers.pop(websocket, None)
+        if subscriber is None:
+            return
+        for topic in list(subscriber.topics):
+            if topic in self.topics:
+                self.topics[topic].discard(subscriber)
+                if not self.topics[topic]:
+                    del self.topics[topic]
+
+    def subscriber_count(self, topic: str) -> int:
+        return len(self.topics.get(topic, ()))
+
+    def current_seq(self, topic: str) -> int:
+        """Sequence number of the last message published on a topic (0 if none)"""
+        return self.sequences.get(topic, 0)
+
+    async def publish(self, topic: str, message: dict) -> int:
+        """Send a message to every socket subscribed to a topic
+
+        Each message is stamped with a per-topic, monotonically increasing "seq"
+        so clients can spot gaps and ask for a fresh snapshot.
+        """
+        start = time.perf_counter()
+        kind = topic.partition(":")[0]
+        seq = self.sequences.get(topic, 0) + 1
+        self.sequences[topic] = seq
+        message = {**message, "seq": seq}
+        if kind in JOURNALED_KINDS:
+            self.journal.append(topic, seq, message)
+
+        # Encode once per (protocol, tagged) combination rather than once per socket
+        encoded = {}
+        for subscriber in list(self.topics.get(topic, ())):
+            if topic in subscriber.held:
+                subscriber.held[topic].append(message)
+                continue
+            key = (subscriber.protocol, subscriber.tagged)
+            try:
+                if key not in encoded:
+                    encoded[key] = subscriber.encode(topic, message)
+                await send_encoded(subscriber.websocket, encoded[key])
+            except:
+                pass  # Connection might be closed
+        BROADCAST_FANOUT.observe(time.perf_counter() - start, kind)
+        return seq
+
+    async def catch_up(self, websocket: WebSocket, topic: str, since: int) -> bool:
+        """Subscribe a socket to a topic and replay every event published after `since`
+
+        Live events published while the replay is being sent are held and flushed
+        afterwards, so the client sees one gap-free, ordered stream. Returns False
+        (and tells the client to resync) when the journal no longer has those events.
+        """
+        subscriber = self.subscribers.get(websocket)
+        if subscriber is None:
+            return False
+
+        subscriber.held[topic] = []
+        self.subscribe(websocket, topic)
+        try:
+            events = await self.journal.since(topic, since)
+            current = self.current_seq(topic)
+            if since > current or (events is not None and since < current
+                                   and (not events or events[0]["seq"] != since + 1)):
+                # Sequence numbers from another server run, or a topic the journal evicted
+                events = None
+            if events is None:
+                await subscriber.send(topic, {
+                    "type": "resync_required",
+                    "since": since,
+                    "seq": self.current_seq(topic)
+                })
+                return False
+
+            last_seq = since
+            for message in events:
+                await subscriber.send(topic, message)
+                last_seq = message["seq"]
+
+            # Flush whatever arrived during the replay, skipping anything already sent
+            while subscriber.held[topic]:
+                message = subscriber.held[topic].pop(0)
+                if message["seq"] > last_seq:
+                    await subscriber.send(topic, message)
+                    last_seq = message["seq"]
+            return True
+        finally:
+            subscriber.held.pop(topic, None)
+
+    async def send(self, websocket: WebSocket, message: dict):
+        """Reply to a single socket using its negotiated protocol"""
+        subscriber = self.subscribers.get(websocket)
+        if subscriber is None:
+            await websocket.send_json(message)
+            return
+        await subscriber.send(None, message)
+
+    async def receive(self, websocket: WebSocket) -> dict:
+        """Receive the next client frame as a dict (JSON text or msgpack binary)"""
+        return await receive_message(websocket)
+
+    def export_topics(self, topics: Iterable[str]) -> Dict[str, Dict]:
+        """Sequence numbers and journaled events of some topics, for a shutdown snapshot"""
+        return {
+            topic: {"seq": self.current_seq(topic), **self.journal.export(topic)}
+            for topic in topics if topic in self.sequences
+        }
+
+    def restore_topics(self, state: Dict[str, Dict]):
+        """Continue topics from a snapshot, so ?since=<seq> still works after a restart"""
+        for topic, topic_state in state.items():
+            self.sequences[topic] = max(self.sequences.get(topic, 0), topic_state["seq"])
+            if topic.partition(":")[0] in JOURNALED_KINDS:
+                self.journal.restore(topic, topic_state)
+
+    async def close_all(self, message: dict, code: int = 1012):
+        """Send every socket a final message and close it (1012 = service restart, reconnect later)"""
+        for subscriber in list(self.subscribers.values()):
+            try:
+                await subscriber.send(None, message)
+                await subscriber.websocket.close(code=code)
+            except:
+                pass  # Connection might be closed
+        self.subscribers.clear()
+        self.topics.clear()
+
+    def topics_for(self, websocket: WebSocket) -> List[str]:
+        subscriber = self.subscribers.get(websocket)
+        return sorted(subscriber.topics) if subscriber else []
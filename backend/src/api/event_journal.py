@@ -0,0 +1,189 @@
+"""
+Per-topic event journal
+Keeps the most recent broadcast events of each game in a bounded ring buffer,
+spilling older ones to disk, so reconnecting clients can catch up from a sequence number.
+Spill files are only written and read in a worker thread, never on the event loop
+"""
+
+import asyncio
+import json
+import os
+from collections import OrderedDict, deque
+from itertools import groupby
+from typing import Deque, Dict, List, Optional, Tuple
+
+from src.utils.log import get_logger
+
+logger = get_logger("journal")
+
+DEFAULT_CAPACITY = int(os.getenv("VERSUS_JOURNAL_SIZE", "256"))
+DEFAULT_MAX_TOPICS = int(os.getenv("VERSUS_JOURNAL_TOPICS", "512"))
+DEFAULT_SPILL_DIR = os.getenv("VERSUS_JOURNAL_DIR", os.path.join("data", "journal"))
+
+
+class EventJournal:
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, max_topics: int = DEFAULT_MAX_TOPICS,
+                 spill_dir: Optional[str] = DEFAULT_SPILL_DIR):
+        self.capacity = capacity
+        self.max_topics = max_topics
+        # Empty spill_dir keeps the journal memory-only
+        self.spill_dir = spill_dir or None
+        # topic -> ring buffer of (seq, message); ordered by last use for topic eviction
+        self.buffers: "OrderedDict[str, Deque[Tuple[int, dict]]]" = OrderedDict()
+        # topic -> oldest seq still available on disk (or queued to be written there)
+        self.spilled_from: Dict[str, int] = {}
+        # Spill file operations waiting for the writer, in order: (topic, (seq, message)) appends
+        # an event, (topic, None) deletes the file
+        self.pending: List[Tuple[str, Optional[Tuple[int, dict]]]] = []
+        # Topics whose spill file was started by this run (the writer thread's own state)
+        self._started: set = set()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    def _spill_path(self, topic: str) -> str:
+        safe_topic = "".join(c if c.isalnum() or c in "-_" else "_" for c in topic)
+        return os.path.join(self.spill_dir, f"{safe_topic}.jsonl")
+
+    def _spill(self, topic: str, seq: int, message: dict):
+        """Queue an event that fell out of the ring buffer for the topic's spill file"""
+        if not self.spill_dir:
+            return
+        self.pending.append((topic, (seq, message)))
+        self.spilled_from.setdefault(topic, seq)
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        try:
+            self._flush_task = asyncio.get_running_loop().create_task(self.flush())
+        except RuntimeError:
+            # No event loop (scripts, tests): write in place
+            batch, self.pending = self.pending, []
+            self._write_spill(batch)
+
+    async def flush(self):
+        """Write every queued spill operation to disk"""
+        async with self._lock:
+            await self._drain()
+
+    async def _drain(self):
+        while self.pending:
+            batch, self.pending = self.pending, []
+            await asyncio.to_thread(self._write_spill, batch)
+
+    def _write_spill(self, batch: List[Tuple[str, Optional[Tuple[int, dict]]]]):
+        """Apply queued spill operations (runs in a worker thread)"""
+        for topic, ops in groupby(batch, key=lambda op: op[0]):
+            events = []
+            for _, event in ops:
+                if event is None:
+                    # A drop: write what came before it, then remove the file
+                    self._append_spill(topic, events)
+                    events = []
+                    self._started.discard(topic)
+                    try:
+                        os.remove(self._spill_path(topic))
+                    except OSError:
+                        pass
+                else:
+                    events.append(event)
+            self._append_spill(topic, events)
+
+    def _append_spill(self, topic: str, events: List[Tuple[int, dict]]):
+        if not events:
+            return
+        try:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            # Truncate on the first spill so files left by a previous run don't leak in
+            mode = "a" if topic in self._started else "w"
+            with open(self._spill_path(topic), mode, encoding="utf-8") as f:
+                f.writelines(json.dumps({"seq": seq, "message": message}) + "\n" for seq, message in events)
+            self._started.add(topic)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"⚠️  Could not spill journal events for {topic}: {e}")
+
+    def append(self, topic: str, seq: int, message: dict):
+        """Record an event published on a topic"""
+        buffer = self.buffers.get(topic)
+        if buffer is None:
+            buffer = deque()
+            self.buffers[topic] = buffer
+            if len(self.buffers) > self.max_topics:
+                oldest_topic = next(iter(self.buffers))
+                self.drop(oldest_topic)
+        else:
+            self.buffers.move_to_end(topic)
+
+        if len(buffer) >= self.capacity:
+            old_seq, old_message = buffer.popleft()
+            self._spill(topic, old_seq, old_message)
+        buffer.append((seq, message))
+
+    async def since(self, topic: str, seq: int) -> Optional[List[dict]]:
+        """Events published after `seq`, oldest first
+
+        Returns None when events after `seq` are no longer available, in which
+        case the client needs a full snapshot instead.
+        """
+        buffer = self.buffers.get(topic)
+        if buffer and seq >= buffer[-1][0]:
+            return []
+        if buffer and seq + 1 >= buffer[0][0]:
+            return [message for event_seq, message in buffer if event_seq > seq]
+        if topic not in self.spilled_from:
+            return None if buffer else []
+
+        # Older events are on disk: hold the writer off while reading them in a thread
+        async with self._lock:
+            await self._drain()
+            in_memory = list(self.buffers.get(topic, ()))
+            before = in_memory[0][0] if in_memory else None
+            spilled = await asyncio.to_thread(self._read_spill, topic, seq, before)
+        if spilled is None:
+            return None
+        return spilled + [message for event_seq, message in in_memory if event_seq > seq]
+
+    def _read_spill(self, topic: str, seq: int, before: Optional[int]) -> Optional[List[dict]]:
+        start = self.spilled_from.get(topic)
+        if start is None or seq + 1 < start:
+            return None
+        events = []
+        try:
+            with open(self._spill_path(topic), "r", encoding="utf-8") as f:
+                for line in f:
+                    entry = json.loads(line)
+                    if entry["seq"] > seq and (before is None or entry["seq"] < before):
+                        events.append(entry["message"])
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️  Could not read journal spill for {topic}: {e}")
+            return None
+        return events
+
+    def drop(self, topic: str):
+        """Forget a topic's events, in memory and on disk"""
+        self.buffers.pop(topic, None)
+        if self.spilled_from.pop(topic, None) is not None:
+            self.pending.append((topic, None))
+            self._schedule_flush()
+
+    def export(self, topic: str) -> Dict:
+        """A topic's journal state, for a shutdown snapshot (spill files stay on disk; flush first)"""
+        return {
+            "events": list(self.buffers.get(topic, ())),
+            "spilled_from": self.spilled_from.get(topic)
+        }
+
+    def restore(self, topic: str, state: Dict):
+        """Reload a topic exported by a previous run, so clients can resume across a restart"""
+        self.buffers[topic] = deque((seq, message) for seq, message in state["events"])
+        if state.get("spilled_from") is not None and os.path.exists(self._spill_path(topic)):
+            self.spilled_from[topic] = state["spilled_from"]
+            self._started.add(topic)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "topics": len(self.buffers),
+            "events_in_memory": sum(len(b) for b in self.buffers.values()),
+            "spilled_topics": len(self.spilled_from)
+        }
@@ -0,0 +1,114 @@
+"""
+WebSocket wire protocols
+JSON text frames by default, or compact msgpack binary frames when a client asks for them
+"""
+
+import json
+from typing import Any, Dict, Optional, Union
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON = "json"
+MSGPACK = "msgpack"
+
+# Cell state codes used by the compact encoding (row-major byte per cell)
+SHOT_CODES = {None: 0, "miss": 1, "hit": 2}
+SHIP_CODES = {None: 0, "carrier": 1, "battleship": 2, "destroyer": 3, "submarine": 4, "patrol": 5}
+
+# Message fields holding battleship grids, and the code table for each
+GRID_FIELDS = {
+    "player1Shots": SHOT_CODES,
+    "player2Shots": SHOT_CODES,
+    "player1Board": SHIP_CODES,
+    "player2Board": SHIP_CODES,
+    "board": SHIP_CODES,
+}
+
+
+def negotiate_protocol(websocket: WebSocket) -> tuple:
+    """Pick the wire protocol for a connection
+
+    Clients opt in with ?protocol=msgpack or by offering the "msgpack" subprotocol.
+    Returns (protocol, subprotocol to echo back in the handshake or None).
+    """
+    offered = [p.strip() for p in websocket.headers.get("sec-websocket-protocol", "").split(",") if p.strip()]
+    requested = websocket.query_params.get("protocol", "").lower()
+
+    if msgpack is not None and (requested == MSGPACK or MSGPACK in offered):
+        return MSGPACK, MSGPACK if MSGPACK in offered else None
+    return JSON, JSON if JSON in offered else None
+
+
+def _encode_grid(grid: Any, codes: Dict[Optional[str], int]) -> Any:
+    """Pack a 2D grid into one byte per cell, or leave it alone if it has unknown values"""
+    if not isinstance(grid, list) or not grid or not isinstance(grid[0], list):
+        return grid
+    try:
+        return bytes(codes[cell] for row in grid for cell in row)
+    except KeyError:
+        return grid
+
+
+def compact_message(message: dict) -> dict:
+    """Shrink a message for binary clients: grids become byte strings and
+    trivia results reference questions by ID instead of embedding them"""
+    compact = dict(message)
+
+    for field, codes in GRID_FIELDS.items():
+        if field in compact:
+            compact[field] = _encode_grid(compact[field], codes)
+
+    if compact.get("type") == "player_question_result" and isinstance(compact.get("data"), dict):
+        data = dict(compact["data"])
+        question = data.pop("question", None)
+        if isinstance(question, dict):
+            data["question_id"] = question.get("id")
+        compact["data"] = data
+
+    return compact
+
+
+def encode_message(message: dict, protocol: str) -> Union[str, bytes]:
+    """Serialize a message for the given protocol"""
+    if protocol == MSGPACK:
+        return msgpack.packb(compact_message(message), use_bin_type=True)
+    return json.dumps(message)
+
+
+async def send_encoded(websocket: WebSocket, payload: Union[str, bytes]):
+    if isinstance(payload, bytes):
+        await websocket.send_bytes(payload)
+    else:
+        await websocket.send_text(payload)
+
+
+async def receive_message(websocket: WebSocket) -> dict:
+    """Receive one client frame as a dict, whichever protocol it was sent with
+
+    Raises WebSocketDisconnect when the client goes away and ValueError on
+    frames that can't be decoded.
+    """
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+
+    if message.get("bytes") is not None:
+        raw = message["bytes"]
+        if msgpack is not None:
+            try:
+                data = msgpack.unpackb(raw, raw=False)
+            except Exception as e:
+                raise ValueError(f"Invalid msgpack frame: {e}")
+        else:
+            data = json.loads(raw)
+    else:
+        data = json.loads(message.get("text") or "")
+
+    if not isinstance(data, dict):
+        raise ValueError("Frames must be objects")
+    return data
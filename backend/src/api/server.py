@@ -3,37 +3,59 @@
 Unified VERSUS Server - Runs all game modes from a single server
 """
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Header
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
 from pydantic import BaseModel
 import asyncio
-import json
-import uvicorn
 from typing import Dict, List, Optional
 import uuid
-import random
 import sys
 import os
 from datetime import datetime
-import re
 import time
 
+# Logging goes through a background writer thread; set it up before anything logs
+from src.utils.log import setup_logging, get_logger, game_fields, move_fields
+setup_logging()
+
 # Import Letta service
 from src.services.letta_service import letta_service  # Updated with fallback
+from src.api.connection_manager import ConnectionManager, game_topic, votes_topic, interviews_topic, parse_topic
+from src.services.match_loops import match_loops
+from src.services.task_supervisor import task_supervisor
+from src.services.job_queue import job_queue, PRIORITY_LIVE, PRIORITY_BACKFILL
+from src.services.readiness import readiness, WarmupSkipped
+from src.services.game_snapshots import snapshot_store, SNAPSHOTS_ENABLED
+from src.services.admission import admission, Admission
+from src.services.turn_guard import turn_guard, TurnConflict
+from src.services.match_actor import match_actors, MatchActor, Effect, ActorBusy, AnswerQuestion, PlayConnectionsTurn, GuessWord
+from src.services.orchestrator import orchestrator, TurnLoop, DEFAULT_TURN_DELAY
+from src.services.ratings import ratings, OVERALL as OVERALL_RATINGS
+from src.services.tournaments import tournaments, TournamentConfig, DEFAULT_CONCURRENCY as TOURNAMENT_CONCURRENCY
+from src.services.provider_limits import provider_limiter
+from src.utils.loop_monitor import loop_monitor
+from src.utils.common import preload_provider_sdks
+from src.utils.pacing import Pacing, get_pacing
+from src.utils.metrics import metrics, GAMES_ACTIVE, GAMES_FINISHED, TURN_DURATION, VOTES, WEBSOCKET_CONNECTIONS, JOB_QUEUE_DEPTH
 
 # Add backend to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # Import game implementations
-from src.games.battleship.battleship import BattleshipGame
+from src.games.battleship.battleship import BattleshipGame, validate_config as validate_battleship_config
 from src.games.trivia.trivia_game import TriviaGame
-from src.games.trivia.questions import TRIVIA_QUESTIONS, get_random_questions
-from src.games.wordle.wordle_game import WordleGame
-from src.games.nyt_connections.connections_game import ConnectionsGame
-from src.games.debate.debate_game import DebateGame
+from src.games.trivia.questions import get_question_bank, get_random_questions
+from src.games.nyt_connections.connections_game import ConnectionsGame, load_puzzles
+from src.games.debate.debate_game import DebateGame, GameStatus as DebateStatus
+from src.games.wordle.wordle_simple import WordleGame as WordleSimpleGame, get_client as get_wordle_client, get_llm_guess, parse_reasoning_for_ui
 
-# Import Flask app for Wordle (we'll integrate it)
-from src.games.wordle.wordle_simple import app as wordle_flask_app, WordleGame as WordleSimpleGame, get_llm_guess, parse_reasoning_for_ui
+logger = get_logger("server")
+battleship_logger = get_logger("battleship")
+trivia_logger = get_logger("trivia")
+wordle_logger = get_logger("wordle")
+connections_logger = get_logger("connections")
+debate_logger = get_logger("debate")
 
 # Default model configurations
 DEFAULT_MODELS = {
@@ -62,123 +84,391 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize Letta personalities on startup
+# Background warmers: the server serves games while these finish, and features that need
+# them wait briefly (readiness.wait_for) or fall back until they are warm
+async def warm_letta():
+    await letta_service.initialize_personalities()
+    if not letta_service.letta_client:
+        raise WarmupSkipped("Letta client not configured")
+    if not letta_service.initialized:
+        raise RuntimeError("no personalities could be created")
+    logger.info("✅ AI personalities ready for competition!")
+
+async def warm_providers():
+    loaded = await asyncio.to_thread(preload_provider_sdks)
+    if not loaded:
+        raise WarmupSkipped("no provider API keys configured")
+    # Wordle keeps one long-lived client per provider, so build those now as well
+    await asyncio.to_thread(lambda: [get_wordle_client(model) for model in ("openai", "anthropic")])
+
+async def warm_trivia_questions():
+    if not await asyncio.to_thread(get_question_bank):
+        raise RuntimeError("trivia question bank is empty")
+
+async def warm_connections_puzzles():
+    await asyncio.to_thread(load_puzzles)
+
+readiness.register("letta", warm_letta)
+readiness.register("providers", warm_providers)
+readiness.register("trivia_questions", warm_trivia_questions)
+readiness.register("connections_puzzles", warm_connections_puzzles)
+
 @app.on_event("startup")
 async def startup_event():
-    """Initialize Letta personalities when server starts"""
-    print("🚀 Starting VERSUS server with Letta personalities...")
+    """Bring up what games need to run, then warm everything else in the background"""
+    logger.info("🚀 Starting VERSUS server...")
     
     # Create static directories if they don't exist
     os.makedirs("static/interviews", exist_ok=True)
-    print("📁 Static directories initialized")
+    logger.info("📁 Static directories initialized")
+
+    # Post-game jobs left over from the last run resume here
+    await job_queue.start()
     
-    try:
-        print("🎭 Initializing Letta personalities...")
-        await letta_service.initialize_personalities()
-        
-        if letta_service.initialized:
-            print("✅ AI personalities ready for competition!")
-        else:
-            print("❌ Letta personalities failed to initialize")
-            print(f"   - Client created: {bool(letta_service.letta_client)}")
-            print(f"   - Initialized: {letta_service.initialized}")
-            
-    except Exception as e:
-        print(f"❌ Error initializing Letta personalities: {e}")
-        import traceback
-        traceback.print_exc()
+    if os.getenv("VERSUS_LOOP_MONITOR", "1") != "0":
+        loop_monitor.start()
+    
+    # Matches that were live when the previous process shut down pick up where they stopped
+    if SNAPSHOTS_ENABLED:
+        await restore_live_games()
+    
+    # Letta personalities, provider SDKs and game data load after the server is up
+    readiness.start()
+    readiness.serving = True
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop admitting matches, let loops finish their turn, snapshot live games, then drain background jobs"""
+    drain_seconds = float(os.getenv("VERSUS_SHUTDOWN_DRAIN_SECONDS", "10"))
+    await begin_drain()
+    # Turns and model calls already in progress finish (up to the deadline) rather than being replayed
+    await asyncio.gather(
+        match_loops.drain(timeout=drain_seconds),
+        match_actors.stop(timeout=drain_seconds),
+        tournaments.stop(timeout=drain_seconds)
+    )
+    if SNAPSHOTS_ENABLED:
+        try:
+            await snapshot_live_games()
+        except Exception as e:
+            logger.exception(f"❌ Could not snapshot live games: {e}")
+    await job_queue.stop(timeout=drain_seconds)
+    await task_supervisor.shutdown(timeout=drain_seconds)
+    await loop_monitor.stop()
 
 # Store active games
-active_games = {}
 battleship_games = {}  # Add this to store battleship games
 trivia_sessions: Dict[str, Dict] = {}
 wordle_games: Dict[str, WordleSimpleGame] = {}
 connections_games: Dict[str, ConnectionsGame] = {}
 debate_games: Dict[str, DebateGame] = {}
 
-# Connection manager for WebSockets
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: Dict[str, List[WebSocket]] = {}
-
-    async def connect(self, websocket: WebSocket, game_id: str):
-        await websocket.accept()
-        if game_id not in self.active_connections:
-            self.active_connections[game_id] = []
-        self.active_connections[game_id].append(websocket)
-
-    def disconnect(self, websocket: WebSocket, game_id: str):
-        if game_id in self.active_connections:
-            self.active_connections[game_id].remove(websocket)
-            if not self.active_connections[game_id]:
-                del self.active_connections[game_id]
-
-    async def broadcast_to_game(self, message: str, game_id: str):
-        if game_id in self.active_connections:
-            for connection in self.active_connections[game_id]:
-                try:
-                    await connection.send_text(message)
-                except:
-                    pass  # Connection might be closed
-
+# Topic-based connection manager shared by every WebSocket endpoint
 manager = ConnectionManager()
 
+# ====================
+# SHUTDOWN AND RESTORE
+# ====================
+
+# Suggested client back-off while the server restarts
+RESTART_RETRY_SECONDS = int(os.getenv("VERSUS_RESTART_RETRY_SECONDS", "5"))
+
+async def begin_drain():
+    """First phase of shutdown: stop admitting matches and tell every socket to reconnect
+
+    main.py runs this before uvicorn starts closing connections, so clients get the
+    notice; shutdown_event calls it again (a no-op then) when run some other way.
+    """
+    if readiness.draining:
+        return
+    readiness.draining = True
+    logger.info("🚦 Draining: no new matches, asking clients to reconnect")
+    await manager.close_all({
+        "type": "server_restarting",
+        "message": "Server is restarting, reconnect shortly",
+        "retry_after": RESTART_RETRY_SECONDS
+    })
+
+def reject_if_draining():
+    """Refuse new matches (503 + Retry-After) once shutdown has begun"""
+    if readiness.draining:
+        raise HTTPException(status_code=503, detail="Server is restarting, try again shortly",
+                            headers={"Retry-After": str(RESTART_RETRY_SECONDS)})
+
+def attach_debate_callbacks(game: DebateGame, game_id: str):
+    # Debate events go to every viewer of the game topic; the loop pauses when the server drains
+    game.publish = lambda message: manager.publish(game_topic(game_id), message)
+    game.should_pause = lambda: match_loops.draining
+    # Debates skip the post-game pipeline, so they're rated as soon as the verdict is in
+    game.on_judged = lambda winner: ratings.record(game_id, "Debate", game.player1_model, game.player2_model, winner)
+
+def live_games() -> Dict[str, Dict]:
+    """Every unfinished match, by game type"""
+    return {
+        "battleship": {game_id: game for game_id, game in battleship_games.items() if not game.winner},
+        "debate": {game_id: game for game_id, game in debate_games.items() if game.status == DebateStatus.IN_PROGRESS},
+        "trivia": {game_id: session for game_id, session in trivia_sessions.items() if session.get("is_active", True)},
+        "wordle": {game_id: game for game_id, game in wordle_games.items() if not game.game_over},
+        "connections": {game_id: games for game_id, games in connections_games.items()
+                        if not (games["player1_game"].game_over and games["player2_game"].game_over)}
+    }
+
+async def snapshot_live_games():
+    games = live_games()
+    game_ids = {game_id for by_id in games.values() for game_id in by_id}
+    if not game_ids:
+        return
+    topics = [topic for game_id in game_ids for topic in (game_topic(game_id), votes_topic(game_id), interviews_topic(game_id))]
+    # Spilled journal events must be on disk before the snapshot points at them
+    await manager.journal.flush()
+    extra = {
+        "topics": manager.export_topics(topics),
+        "votes": {game_id: vote_storage[game_id] for game_id in game_ids if game_id in vote_storage},
+        "autoplay": {game_id: info for game_id, info in orchestrator.matches.items() if game_id in game_ids}
+    }
+    saved = await asyncio.to_thread(snapshot_store.save, games, extra)
+    logger.info(f"💾 Snapshotted {saved} live games to {snapshot_store.path}")
+
+async def restore_live_games():
+    """Reload the previous run's live games and restart their loops from the last finished turn"""
+    snapshot = await asyncio.to_thread(snapshot_store.load)
+    if not snapshot:
+        return
+    games = snapshot["games"]
+    manager.restore_topics(snapshot["extra"].get("topics", {}))
+    vote_storage.update(snapshot["extra"].get("votes", {}))
+    trivia_sessions.update(games.get("trivia", {}))
+    wordle_games.update(games.get("wordle", {}))
+    connections_games.update(games.get("connections", {}))
+    
+    for game_id, game in games.get("battleship", {}).items():
+        if game.status != "active":
+            # Still placing ships: nothing has been asked of the models yet, so start over
+            pacing = game.pacing
+            game = BattleshipGame(game.player1_model, game.player2_model, game.board_size, game.ships, game.no_touch)
+            game.pacing = pacing
+            battleship_games[game_id] = game
+            match_loops.ensure(game_id, lambda game=game, game_id=game_id: run_battleship_match(game, game_id))
+        else:
+            battleship_games[game_id] = game
+            match_loops.ensure(game_id, lambda game=game, game_id=game_id: run_battleship_game_loop(game, game_id))
+    
+    for game_id, game in games.get("debate", {}).items():
+        debate_games[game_id] = game
+        attach_debate_callbacks(game, game_id)
+        match_loops.ensure(game_id, game.run_debate)
+    
+    for game_id, info in snapshot["extra"].get("autoplay", {}).items():
+        if client_paced_game_type(game_id) == info["game_type"]:
+            orchestrator.start(game_id, autoplay_loop(info["game_type"], game_id), info["turn_delay"])
+    
+    restored = sum(len(by_id) for by_id in games.values())
+    logger.info(f"♻️  Restored {restored} live games from a snapshot taken {snapshot['age']:.0f}s ago")
+
+def resume_point(websocket: WebSocket, game_id: str) -> Dict[str, int]:
+    """Read ?since=<seq> from a per-game socket so a reconnecting client only gets what it missed"""
+    since = websocket.query_params.get("since")
+    if since is None or not since.lstrip("-").isdigit():
+        return {}
+    return {game_topic(game_id): int(since)}
+
+# ====================
+# ADMISSION CONTROL
+# ====================
+
+def admit_match(game_type: str, ticket: Optional[str] = None) -> Admission:
+    """Ask admission control whether a new match may start; matches already running are never shed"""
+    return admission.admit(game_type, len(live_games()[game_type]), ticket)
+
+def require_admission(game_type: str, ticket: Optional[str] = None):
+    """Refuse a new match (503 + Retry-After) while draining or overloaded
+
+    The 503 carries a waiting-room ticket; retrying with it in an Admission-Ticket header keeps the caller's place.
+    """
+    reject_if_draining()
+    decision = admit_match(game_type, ticket)
+    if not decision.admitted:
+        headers = {"Retry-After": str(decision.retry_after)}
+        if decision.ticket:
+            headers["Admission-Ticket"] = decision.ticket
+        raise HTTPException(status_code=503, detail=decision.to_dict(), headers=headers)
+
+async def send_admission_denied(websocket: WebSocket, decision: Admission):
+    """Socket equivalent of the 503: resend the start message with this ticket after retry_after seconds"""
+    await manager.send(websocket, {"type": "waiting_room", **decision.to_dict()})
+
+# ====================
+# IDEMPOTENT TURNS
+# ====================
+
+async def play_turn(response: Response, game_type: str, game_id: str, player: str, next_turn, play,
+                    idempotency_key: Optional[str] = None, expected_turn: Optional[int] = None):
+    """Run a turn-advancing request at most once per turn
+
+    Clients send an Idempotency-Key header and/or ?expected_turn=N (1-based). A retry of a finished
+    turn gets the cached response (marked Idempotent-Replayed), a duplicate of the turn in progress
+    waits for it, and any other request overlapping or skipping a turn gets 409 with the current turn.
+    """
+    try:
+        result, replayed = await turn_guard.run(game_type, game_id, player, next_turn, play,
+                                                key=idempotency_key, expected_turn=expected_turn)
+    except TurnConflict as e:
+        raise HTTPException(status_code=409, detail={"message": str(e), "current_turn": e.current_turn})
+    except ActorBusy as e:
+        raise HTTPException(status_code=409, detail={"message": str(e), "current_turn": next_turn()})
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return result
+
+# ====================
+# SERVER-SIDE AUTOPLAY
+# ====================
+
+def client_paced_game_type(game_id: str) -> Optional[str]:
+    """Which turn-by-turn game (trivia, wordle, connections) a match id belongs to, if any"""
+    if game_id in trivia_sessions:
+        return "trivia"
+    if game_id in wordle_games:
+        return "wordle"
+    if game_id in connections_games:
+        return "connections"
+    return None
+
+def autoplay_loop(game_type: str, game_id: str) -> TurnLoop:
+    """How the orchestrator drives a client-paced match; players are named as in the manual endpoints"""
+    publish = lambda message: manager.publish(game_topic(game_id), message)
+    
+    if game_type == "trivia":
+        session = trivia_sessions[game_id]
+        game = session["game"]
+        responses = {"player1": game.player1_responses, "player2": game.player2_responses}
+        return TurnLoop(
+            game_type, ["player1", "player2"],
+            actor=lambda: match_actors.get(game_id, lambda: TriviaActor(game_id, session)),
+            command=lambda player: AnswerQuestion(int(player[-1])),
+            next_turn=lambda player: len(responses[player]) + 1,
+            finished=lambda player: game.game_over or game.get_player_current_question(int(player[-1])) is None,
+            publish=publish
+        )
+    
+    if game_type == "wordle":
+        game = wordle_games[game_id]
+        return TurnLoop(
+            game_type, ["openai", "anthropic"],
+            actor=lambda: match_actors.get(game_id, lambda: WordleActor(game_id, game)),
+            command=GuessWord,
+            next_turn=lambda model: len(game.models[model]['guesses']) + 1,
+            finished=lambda model: game.game_over or game.models[model]['won'],
+            publish=publish
+        )
+    
+    session = connections_games[game_id]
+    boards = {"player1": session["player1_game"], "player2": session["player2_game"]}
+    return TurnLoop(
+        game_type, ["player1", "player2"],
+        actor=lambda: match_actors.get(game_id, lambda: ConnectionsActor(game_id, session)),
+        command=lambda player: PlayConnectionsTurn(int(player[-1])),
+        next_turn=lambda player: len(boards[player].correct_guesses) + len(boards[player].incorrect_guesses) + 1,
+        # The match ends as soon as either player clears their board
+        finished=lambda player: any(board.game_over for board in boards.values()),
+        publish=publish
+    )
+
+def start_autoplay(game_type: str, game_id: str, turn_delay: Optional[float] = None, pacing: Optional[Pacing] = None) -> bool:
+    """Explicit turn_delay wins; otherwise the default gap scaled by the match's pacing profile"""
+    if turn_delay is None:
+        game = trivia_sessions[game_id]["game"] if game_type == "trivia" else None
+        turn_delay = (pacing or getattr(game, "pacing", None) or get_pacing()).seconds(DEFAULT_TURN_DELAY)
+    return orchestrator.start(game_id, autoplay_loop(game_type, game_id), max(0.0, turn_delay))
+
+def requested_pacing(name: Optional[str]) -> Pacing:
+    """Pacing profile from a start request (400 if unknown); the server default when not given"""
+    try:
+        return get_pacing(name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 # ====================
 # LETTA INTEGRATION
 # ====================
 
+async def submit_game_completion(game_type: str, winner: int, player1_model: str, player2_model: str,
+                                 game_data: dict, game_id: str, job_key: Optional[str] = None):
+    """Queue the post-game pipeline; games with spectators connected jump ahead of backfill"""
+    GAMES_FINISHED.inc(game_type.lower())
+    await ratings.record(job_key or game_id, game_type, player1_model, player2_model, winner)
+    watched = manager.subscriber_count(game_topic(game_id)) + manager.subscriber_count(interviews_topic(game_id))
+    await job_queue.enqueue("post_game", game_id, {
+        "game_type": game_type,
+        "winner": winner,
+        "player1_model": player1_model,
+        "player2_model": player2_model,
+        "game_data": game_data,
+        "game_id": game_id
+    }, priority=PRIORITY_LIVE if watched else PRIORITY_BACKFILL, job_key=job_key)
+
+async def run_post_game_job(payload: dict, progress: dict):
+    await handle_game_completion(**payload, progress=progress)
+
 async def handle_game_completion(game_type: str, winner: int, player1_model: str, player2_model: str, 
-                               game_data: dict, game_id: str):
-    """Enhanced game completion with Letta personality updates and interviews"""
+                               game_data: dict, game_id: str, progress: Optional[dict] = None):
+    """Enhanced game completion with Letta personality updates and interviews
+
+    `progress` records finished steps so a retried run doesn't count the match twice.
+    """
+    progress = progress if progress is not None else {}
     try:
         winner_model = player1_model if winner == 1 else player2_model
         loser_model = player2_model if winner == 1 else player1_model
         
-        print(f"🎭 GAME COMPLETION DEBUG:")
-        print(f"   Game Type: {game_type}")
-        print(f"   Winner: Player {winner} ({winner_model})")
-        print(f"   Loser: Player {3-winner} ({loser_model})")
-        print(f"   Game ID: {game_id}")
-        print(f"   Game Data: {game_data}")
+        fields = game_fields(game_id, game_type=game_type)
+        logger.info(f"🎭 {game_type} complete: Player {winner} ({winner_model}) beat Player {3-winner} ({loser_model})", extra=fields)
+        logger.debug("Game data: %s", game_data, extra=fields)
         
-        # Update Letta personalities with match results
-        print(f"🧠 Updating Letta memories for future roasts...")
-        await letta_service.update_match_memories(
-            game_type=game_type,
-            winner_model=winner_model,
-            loser_model=loser_model,
-            game_data=game_data
-        )
+        # Update Letta personalities with match results (right after boot, give the agents a moment)
+        await readiness.wait_for("letta")
+        if not progress.get("memories_updated"):
+            logger.info(f"🧠 Updating Letta memories for future roasts...", extra=fields)
+            await letta_service.update_match_memories(
+                game_type=game_type,
+                winner_model=winner_model,
+                loser_model=loser_model,
+                game_data=game_data
+            )
+            progress["memories_updated"] = True
         
         # Generate post-game trash talk
-        print(f"🔥 Generating savage roast...")
+        logger.info(f"🔥 Generating savage roast...", extra=fields)
         interviews = await letta_service.generate_post_game_interviews(
             player1_model, player2_model, winner, game_type, game_data
         )
         
         if interviews:
-            print(f"✅ ROAST generated! Keys: {list(interviews.keys())}")
+            logger.info(f"✅ ROAST generated! Keys: {list(interviews.keys())}", extra=fields)
             # Convert to voice and broadcast
             await broadcast_post_game_interviews(interviews, game_id)
         else:
-            print(f"❌ No roast generated!")
+            logger.error(f"❌ No roast generated!", extra=fields)
         
     except Exception as e:
-        print(f"❌ Error handling game completion: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.error(f"❌ Error handling game completion: {e}", extra=game_fields(game_id))
+        raise  # Let the job queue retry or dead-letter it
+
+def write_file(path: str, data: bytes):
+    """Write a file in one go; call through asyncio.to_thread to keep disk I/O off the event loop"""
+    with open(path, "wb") as f:
+        f.write(data)
 
 async def broadcast_post_game_interviews(interviews: dict, game_id: str):
     """Convert trash talk to voice and broadcast to clients"""
+    fields = game_fields(game_id)
     try:
-        print(f"🔥 ROAST BROADCAST: Starting trash talk for game {game_id}")
-        print(f"   Roast roles: {list(interviews.keys())}")
+        logger.info(f"🔥 ROAST BROADCAST: roles {list(interviews.keys())}", extra=fields)
         
         interview_audio = {}
         
         for role, interview in interviews.items():
-            print(f"🔥 Processing {role} roast: {interview['personality']}")
-            print(f"   Savage response preview: {interview['response'][:100]}...")
+            logger.debug(f"🔥 Processing {role} roast ({interview['personality']}): {interview['response'][:100]}...", extra=fields)
             
             # Convert to voice
             audio_bytes = await letta_service.convert_to_voice_with_vapi(
@@ -187,7 +477,7 @@ async def broadcast_post_game_interviews(interviews: dict, game_id: str):
             )
             
             if audio_bytes:
-                print(f"🔊 Voice generated for {role} ({len(audio_bytes)} bytes)")
+                logger.debug(f"🔊 Voice generated for {role} ({len(audio_bytes)} bytes)", extra=fields)
                 # Create audio directory if it doesn't exist
                 audio_dir = "static/interviews"
                 os.makedirs(audio_dir, exist_ok=True)
@@ -198,8 +488,7 @@ async def broadcast_post_game_interviews(interviews: dict, game_id: str):
                 audio_path = f"{audio_dir}/{audio_filename}"
                 
                 try:
-                    with open(audio_path, "wb") as f:
-                        f.write(audio_bytes)
+                    await asyncio.to_thread(write_file, audio_path, audio_bytes)
                     
                     # Verify the file was written correctly
                     if os.path.exists(audio_path) and os.path.getsize(audio_path) > 0:
@@ -211,14 +500,13 @@ async def broadcast_post_game_interviews(interviews: dict, game_id: str):
                             "model": interview["model"],
                             "voice_style": interview["voice_style"]
                         }
-                        print(f"✅ Audio saved: {audio_path} ({os.path.getsize(audio_path)} bytes)")
-                        print(f"🔗 Audio URL: http://localhost:8000/static/interviews/{audio_filename}")
+                        logger.debug(f"✅ Audio saved: {audio_path} ({os.path.getsize(audio_path)} bytes)", extra=fields)
                     else:
-                        print(f"❌ Audio file verification failed: {audio_path}")
+                        logger.error(f"❌ Audio file verification failed: {audio_path}", extra=fields)
                         raise Exception("Audio file not created properly")
                         
                 except Exception as e:
-                    print(f"❌ Error saving audio file: {e}")
+                    logger.error(f"❌ Error saving audio file: {e}", extra=fields)
                     # Text-only fallback
                     interview_audio[role] = {
                         "audio_url": None,
@@ -229,7 +517,7 @@ async def broadcast_post_game_interviews(interviews: dict, game_id: str):
                         "voice_style": interview["voice_style"]
                     }
             else:
-                print(f"⚠️  No audio generated for {role}, using text-only")
+                logger.warning(f"⚠️  No audio generated for {role}, using text-only", extra=fields)
                 # Text-only fallback
                 interview_audio[role] = {
                     "audio_url": None,
@@ -246,230 +534,233 @@ async def broadcast_post_game_interviews(interviews: dict, game_id: str):
             "interviews": interview_audio
         }
         
-        print(f"📡 Broadcasting to WebSocket clients...")
-        
-        # Broadcast to both game channel and vote channel for compatibility
-        await manager.broadcast_to_game(
-            json.dumps(broadcast_data),
-            game_id
-        )
-        
-        # Also broadcast to vote channel (where Wordle connects)
-        await manager.broadcast_to_game(
-            json.dumps(broadcast_data),
-            f"votes-{game_id}"
-        )
-        
-        print(f"📡 Broadcast sent to both game_id and votes-{game_id} channels")
+        # Every game and vote socket for this match listens on the interviews topic,
+        # so a single publish reaches all of them
+        await manager.publish(interviews_topic(game_id), broadcast_data)
         
-        print(f"✅ Successfully broadcasted SAVAGE ROAST for game {game_id}")
+        logger.info(f"✅ Broadcast SAVAGE ROAST to {interviews_topic(game_id)}", extra=fields)
         
     except Exception as e:
-        print(f"❌ Error broadcasting interviews: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"❌ Error broadcasting interviews: {e}", extra=fields)
+
+job_queue.register("post_game", run_post_game_job)
 
 # ====================
 # BATTLESHIP ENDPOINTS
 # ====================
 
+def battleship_snapshot(game: BattleshipGame, game_id: str, message: str) -> dict:
+    """Full battleship state, stamped with the last event sequence number on the game topic"""
+    return {
+        "type": "game_state",
+        "seq": manager.current_seq(game_topic(game_id)),
+        "status": game.status,
+        "message": message,
+        "currentPlayer": game.current_player,
+        "boardSize": game.board_size,
+        "ships": game.ships,
+        "noTouch": game.no_touch,
+        "player1Shots": game.shots_grid(1),
+        "player2Shots": game.shots_grid(2),
+        "player1Board": game.board_grid(1),
+        "player2Board": game.board_grid(2),
+        "shipsPlaced": game.ships_placed,
+        "winner": game.winner
+    }
+
 @app.websocket("/games/battleship/{game_id}")
 async def battleship_websocket(websocket: WebSocket, game_id: str):
-    """WebSocket endpoint for Battleship games"""
-    await websocket.accept()
-    print(f"Client connected to battleship game {game_id}")
+    """WebSocket endpoint for Battleship games
+    
+    Game events carry a per-game "seq". Full boards are only sent in snapshots
+    (on join and in reply to get_state/resync); each shot is a single-cell delta.
+    Each match is driven by one loop task; every socket is just a viewer of it.
+    """
+    await manager.connect(websocket, [game_topic(game_id), interviews_topic(game_id)], since=resume_point(websocket, game_id))
+    battleship_logger.info(f"Client connected to battleship game {game_id}", extra=game_fields(game_id))
     
     try:
         while True:
-            data = await websocket.receive_json()
+            data = await manager.receive(websocket)
             
             if data.get("type") == "start_game":
                 # Check if game already exists
                 if game_id in battleship_games:
                     game = battleship_games[game_id]
-                    print(f"Game {game_id} already exists, sending current state")
+                    battleship_logger.info(f"Game {game_id} already exists, sending current state", extra=game_fields(game_id))
                     
-                    # Send current game state
-                    await websocket.send_json({
-                        "type": "game_state",
-                        "status": game.status,
-                        "message": "Game already in progress",
-                        "currentPlayer": game.current_player,
-                        "player1Shots": game.game_state["player1_shots"],
-                        "player2Shots": game.game_state["player2_shots"],
-                        "player1Board": game.game_state["player1_board"],
-                        "player2Board": game.game_state["player2_board"],
-                        "shipsPlaced": game.ships_placed,
-                        "winner": game.winner
-                    })
+                    # Send current game state; this socket now just watches the running match
+                    await manager.send(websocket, battleship_snapshot(game, game_id, "Game already in progress"))
                     
-                    # If game is active, continue the game loop
+                    # Only restart the loop if it died, never run a second one next to it
                     if game.status == "active" and not game.winner:
-                        asyncio.create_task(continue_battleship_game(game, websocket, game_id))
+                        match_loops.ensure(game_id, lambda: run_battleship_game_loop(game, game_id))
+                    continue
+                
+                if readiness.draining:
+                    await manager.send(websocket, {"type": "error", "message": "Server is restarting, try again shortly"})
+                    continue
+                
+                # Validate the request before admission, so a bad one doesn't use up a waiting-room ticket
+                try:
+                    pacing = get_pacing(data.get("pacing"))
+                except ValueError as e:
+                    await manager.send(websocket, {"type": "error", "message": str(e)})
                     continue
                 
                 # Create new game
                 player1_model = data.get("player1Model", "gpt-4o-mini")
                 player2_model = data.get("player2Model", "claude-3-haiku")
                 
-                print(f"Creating new battleship game {game_id} with models: {player1_model} vs {player2_model}")
-                
-                # Create and store the battleship game
-                game = BattleshipGame(player1_model, player2_model)
-                battleship_games[game_id] = game
-                
-                # Send initial game state
-                await websocket.send_json({
-                    "type": "game_state",
-                    "status": "placement",
-                    "message": "Placing ships...",
-                    "currentPlayer": 1,
-                    "player1Shots": game.game_state["player1_shots"],
-                    "player2Shots": game.game_state["player2_shots"],
-                    "shipsPlaced": game.ships_placed
-                })
+                try:
+                    # Board size, fleet and the no-touch rule are optional match parameters (8x8, standard fleet, off)
+                    no_touch = bool(data.get("noTouch"))
+                    board_size, ships = validate_battleship_config(data.get("boardSize"), data.get("ships"), no_touch)
+                except ValueError as e:
+                    await manager.send(websocket, {"type": "error", "message": str(e)})
+                    continue
                 
-                # Place ships for both players
-                for player in [1, 2]:
-                    await websocket.send_json({
-                        "type": "placement_start",
-                        "player": player,
-                        "message": f"Player {player} is placing ships..."
-                    })
-                    
-                    # Place all ships for this player
-                    game.place_ships_for_player(player)
-                    
-                    # Send the complete board after all ships are placed
-                    await websocket.send_json({
-                        "type": "ship_placed",
-                        "player": player,
-                        "board": game.game_state[f'player{player}_board']
-                    })
-                    
-                    await asyncio.sleep(0.2)
+                decision = admit_match("battleship", data.get("ticket"))
+                if not decision.admitted:
+                    await send_admission_denied(websocket, decision)
+                    continue
                 
-                # Send placement complete
-                await websocket.send_json({
-                    "type": "placement_complete",
-                    "message": "All ships placed! Game starting...",
-                    "player1Board": game.game_state['player1_board'],
-                    "player2Board": game.game_state['player2_board']
-                })
+                battleship_logger.info(f"Creating new battleship game {game_id} with models: {player1_model} vs {player2_model}", extra=game_fields(game_id))
                 
-                await asyncio.sleep(0.5)
+                # Create and store the battleship game
+                game = BattleshipGame(player1_model, player2_model, board_size, ships, no_touch)
+                game.pacing = pacing
+                battleship_games[game_id] = game
                 
-                # Start game loop
-                game.status = "active"
-                asyncio.create_task(run_battleship_game_loop(game, websocket, game_id))
+                # Placement and the game loop run as the match's single driver task
+                match_loops.ensure(game_id, lambda: run_battleship_match(game, game_id))
             
-            elif data.get("type") == "get_state":
-                # Handle request for current game state
+            elif data.get("type") in ("get_state", "resync"):
+                # Full snapshot on request, e.g. after the client detects a sequence gap
                 if game_id in battleship_games:
                     game = battleship_games[game_id]
-                    await websocket.send_json({
-                        "type": "game_state",
-                        "status": game.status,
-                        "currentPlayer": game.current_player,
-                        "player1Shots": game.game_state["player1_shots"],
-                        "player2Shots": game.game_state["player2_shots"],
-                        "player1Board": game.game_state["player1_board"],
-                        "player2Board": game.game_state["player2_board"],
-                        "winner": game.winner,
-                        "message": "Current game state"
-                    })
+                    await manager.send(websocket, battleship_snapshot(game, game_id, "Current game state"))
                 else:
-                    await websocket.send_json({
+                    await manager.send(websocket, {
                         "type": "error",
                         "message": "Game not found"
                     })
             
     except WebSocketDisconnect:
-        print(f"Client disconnected from battleship game {game_id}")
+        battleship_logger.info(f"Client disconnected from battleship game {game_id}", extra=game_fields(game_id))
     except Exception as e:
-        print(f"WebSocket error in game {game_id}: {e}")
-        import traceback
-        traceback.print_exc()
+        battleship_logger.exception(f"WebSocket error in game {game_id}: {e}", extra=game_fields(game_id))
+    finally:
+        manager.disconnect(websocket)
 
-async def continue_battleship_game(game: BattleshipGame, websocket: WebSocket, game_id: str):
-    """Continue an existing battleship game"""
-    try:
-        # Send current state first
-        await websocket.send_json({
-            "type": "game_state",
-            "status": game.status,
-            "currentPlayer": game.current_player,
-            "player1Shots": game.game_state["player1_shots"],
-            "player2Shots": game.game_state["player2_shots"],
-            "winner": game.winner,
-            "message": "Continuing game..."
+async def run_battleship_match(game: BattleshipGame, game_id: str):
+    """Place ships for both players, then run the game loop"""
+    # Send initial game state
+    await manager.publish(game_topic(game_id), {
+        "type": "game_state",
+        "status": "placement",
+        "message": "Placing ships...",
+        "currentPlayer": 1,
+        "boardSize": game.board_size,
+        "ships": game.ships,
+        "noTouch": game.no_touch,
+        "player1Shots": game.shots_grid(1),
+        "player2Shots": game.shots_grid(2),
+        "shipsPlaced": game.ships_placed
+    })
+    
+    # Place ships for both players
+    for player in [1, 2]:
+        await manager.publish(game_topic(game_id), {
+            "type": "placement_start",
+            "player": player,
+            "message": f"Player {player} is placing ships..."
         })
         
-        # Continue the game loop
-        await run_battleship_game_loop(game, websocket, game_id)
-    except Exception as e:
-        print(f"Error continuing game {game_id}: {e}")
+        # Place all ships for this player
+        game.place_ships_for_player(player)
+        
+        # Send the complete board after all ships are placed
+        await manager.publish(game_topic(game_id), {
+            "type": "ship_placed",
+            "player": player,
+            "boardSize": game.board_size,
+            "board": game.board_grid(player)
+        })
+        
+        await game.pacing.pause(0.2)
+    
+    # Send placement complete
+    await manager.publish(game_topic(game_id), {
+        "type": "placement_complete",
+        "message": "All ships placed! Game starting...",
+        "boardSize": game.board_size,
+        "player1Board": game.board_grid(1),
+        "player2Board": game.board_grid(2)
+    })
+    
+    await game.pacing.pause(0.5)
+    
+    # Start game loop
+    game.status = "active"
+    await run_battleship_game_loop(game, game_id)
+
+async def publish_battleship_shot(game: BattleshipGame, game_id: str, player: int, row_idx: int, col_idx: int,
+                                  result: str, fallback: bool = False):
+    """Publish a single shot as a delta event"""
+    event = {
+        "type": "shot",
+        "player": player,
+        "row": row_idx,
+        "col": col_idx,
+        "result": result,
+        "currentPlayer": game.current_player,
+        "winner": game.winner
+    }
+    if fallback:
+        event["fallback"] = True
+    await manager.publish(game_topic(game_id), event)
 
-async def run_battleship_game_loop(game: BattleshipGame, websocket: WebSocket, game_id: str):
-    """Run the battleship game loop in a separate task"""
+async def run_battleship_game_loop(game: BattleshipGame, game_id: str):
+    """Run the battleship game loop (started through match_loops, one per match)"""
     try:
-        while game.status == "active" and not game.winner:
+        while game.status == "active" and not game.winner and not match_loops.draining:
             current_player = game.current_player
             max_retries = 5
             retry_count = 0
             
             while retry_count < max_retries:
+                if match_loops.draining:
+                    return  # stop between model calls; the snapshot resumes from this turn
+                
                 # Generate a fresh prompt for each retry
                 prompt = game.get_prompt_for_player(current_player)
                 
-                if current_player == 1:
-                    move_response = game.player1.get_move(prompt, game.game_state)
-                else:
-                    move_response = game.player2.get_move(prompt, game.game_state)
+                player_model = game.player1_model if current_player == 1 else game.player2_model
+                client = game.player1 if current_player == 1 else game.player2
+                with TURN_DURATION.time("battleship", player_model):
+                    # The provider SDKs block, so keep the call off the event loop
+                    move_response = await asyncio.to_thread(client.get_move, prompt, game.game_state)
                 
                 try:
-                    # Clean up the response
-                    move_str = move_response.strip().upper()
-                    
-                    # Remove any extra text, just get the first word
-                    move_str = move_str.split()[0] if move_str else ""
-                    
-                    # Try to parse the move
-                    # Look for pattern like A5, H8, etc.
-                    coord_match = re.search(r'[A-H][1-8]', move_str)
-                    
-                    if coord_match:
-                        coord = coord_match.group(0)
-                        col_letter = coord[0]
-                        row_num = int(coord[1])
-                        col_idx = ord(col_letter) - ord('A')
-                        row_idx = row_num - 1
-                    else:
+                    # Find the first coordinate on this board in the reply, like A5 or H8
+                    coordinate = game.parse_coordinate(move_response)
+                    if not coordinate:
                         raise ValueError(f"Could not parse move: {move_response}")
-                    
-                    # Validate bounds
-                    if not (0 <= row_idx < game.board_size and 0 <= col_idx < game.board_size):
-                        raise ValueError(f"Move out of bounds: row={row_idx}, col={col_idx}")
+                    row_idx, col_idx = coordinate
                     
                     move_result = game.make_move(row_idx, col_idx)
                     
                     if move_result["success"]:
-                        col_letter = chr(col_idx + ord('A'))
-                        await websocket.send_json({
-                            "type": "game_state",
-                            "currentPlayer": game.current_player,
-                            "player1Shots": game.game_state["player1_shots"],
-                            "player2Shots": game.game_state["player2_shots"],
-                            "lastMove": f"{col_letter}{row_idx + 1}",
-                            "lastResult": move_result["result"],
-                            "message": f"Player {3 - game.current_player} fired at {col_letter}{row_idx + 1} - {move_result['result'].upper()}!",
-                            "status": "finished" if game.winner else "in_progress",
-                            "winner": game.winner
-                        })
+                        battleship_logger.debug(
+                            f"Player {current_player} fired at {move_result['move']}: {move_result['result']}",
+                            extra=move_fields(game_id, game.game_state.get('turn_count'), player=current_player)
+                        )
+                        await publish_battleship_shot(game, game_id, current_player, row_idx, col_idx, move_result["result"])
                         
                         if game.winner:
                             game.status = "finished"
-                            await websocket.send_json({
+                            await manager.publish(game_topic(game_id), {
                                 "type": "game_over",
                                 "winner": game.winner,
                                 "message": f"🎉 Player {game.winner} wins!"
@@ -478,96 +769,86 @@ async def run_battleship_game_loop(game: BattleshipGame, websocket: WebSocket, g
                             # LETTA INTEGRATION: Handle game completion
                             game_data = {
                                 "game_duration": int(time.time() - getattr(game, 'start_time', time.time())),
-                                "winning_move": f"{col_letter}{row_idx + 1}",
+                                "winning_move": move_result["move"],
                                 "total_moves": game.game_state.get('turn_count', 0),
                                 "match_quality": "intense" if game.game_state.get('turn_count', 0) > 20 else "quick"
                             }
                             
-                            asyncio.create_task(handle_game_completion(
+                            await submit_game_completion(
                                 "Battleship", game.winner, game.player1_model, game.player2_model, 
                                 game_data, game_id
-                            ))
+                            )
                             
                             # Remove the game after it's finished
                             if game_id in battleship_games:
                                 del battleship_games[game_id]
                             break
                         
-                        await asyncio.sleep(0.3)
+                        await game.pacing.pause(0.3)
                         break
                     else:
-                        print(f"Invalid move from player {current_player}: {move_result.get('reason', move_result.get('result', 'unknown error'))}")
+                        battleship_logger.debug(
+                            f"Invalid move from player {current_player}: {move_result.get('reason', move_result.get('result', 'unknown error'))}",
+                            extra=move_fields(game_id, game.game_state.get('turn_count'), player=current_player)
+                        )
                         retry_count += 1
-                        await asyncio.sleep(0.5)
+                        await game.pacing.pause(0.5)
                         
                 except Exception as e:
-                    print(f"Error processing move from player {current_player}: {e}")
-                    print(f"Raw response was: {move_response}")
+                    battleship_logger.warning(
+                        f"Error processing move from player {current_player}: {e} (raw response: {move_response!r})",
+                        extra=game_fields(game_id, game.game_state.get('turn_count'), player=current_player)
+                    )
                     retry_count += 1
-                    await asyncio.sleep(0.5)
+                    await game.pacing.pause(0.5)
                     continue
             
-            # If we exhausted all retries, try a random valid move
+            # If we exhausted all retries, play the recommended target for them
             if retry_count >= max_retries:
-                print(f"Player {current_player} failed to make a valid move after {max_retries} attempts")
-                # Find a random available position
-                available_positions = []
-                shots = game.game_state[f'player{current_player}_shots']
-                for i in range(game.board_size):
-                    for j in range(game.board_size):
-                        if shots[i][j] is None:
-                            available_positions.append((i, j))
+                battleship_logger.warning(
+                    f"Player {current_player} failed to make a valid move after {max_retries} attempts",
+                    extra=game_fields(game_id, game.game_state.get('turn_count'), player=current_player)
+                )
+                # Fire where a ship most likely is
+                target = game.recommend_target(current_player)
                 
-                if available_positions:
-                    row_idx, col_idx = random.choice(available_positions)
+                if target:
+                    row_idx, col_idx = target
                     move_result = game.make_move(row_idx, col_idx)
                     
                     if move_result["success"]:
-                        col_letter = chr(col_idx + ord('A'))
-                        await websocket.send_json({
-                            "type": "game_state",
-                            "currentPlayer": game.current_player,
-                            "player1Shots": game.game_state["player1_shots"],
-                            "player2Shots": game.game_state["player2_shots"],
-                            "lastMove": f"{col_letter}{row_idx + 1}",
-                            "lastResult": move_result["result"],
-                            "message": f"Player {3 - game.current_player} fired at {col_letter}{row_idx + 1} - {move_result['result'].upper()}! (random fallback)",
-                            "status": "finished" if game.winner else "in_progress",
-                            "winner": game.winner
-                        })
+                        await publish_battleship_shot(game, game_id, current_player, row_idx, col_idx, move_result["result"], fallback=True)
                         
                         if game.winner:
                             game.status = "finished"
-                            await websocket.send_json({
+                            await manager.publish(game_topic(game_id), {
                                 "type": "game_over",
                                 "winner": game.winner,
                                 "message": f"🎉 Player {game.winner} wins!"
                             })
                             
-                            # LETTA INTEGRATION: Handle game completion (random move case)
+                            # LETTA INTEGRATION: Handle game completion (fallback move case)
                             game_data = {
                                 "game_duration": int(time.time() - getattr(game, 'start_time', time.time())),
-                                "winning_move": f"{col_letter}{row_idx + 1} (random)",
+                                "winning_move": f"{move_result['move']} (fallback)",
                                 "total_moves": game.game_state.get('turn_count', 0),
                                 "match_quality": "chaotic"
                             }
                             
-                            asyncio.create_task(handle_game_completion(
+                            await submit_game_completion(
                                 "Battleship", game.winner, game.player1_model, game.player2_model, 
                                 game_data, game_id
-                            ))
+                            )
                             
                             # Remove the game after it's finished
                             if game_id in battleship_games:
                                 del battleship_games[game_id]
                 else:
-                    print(f"No available positions for player {current_player}")
+                    battleship_logger.warning(f"No available positions for player {current_player}", extra=game_fields(game_id))
                     break
                     
     except Exception as e:
-        print(f"Error in game loop for {game_id}: {e}")
-        import traceback
-        traceback.print_exc()
+        battleship_logger.exception(f"Error in game loop for {game_id}: {e}", extra=game_fields(game_id))
 
 # =================
 # TRIVIA ENDPOINTS
@@ -577,25 +858,35 @@ class GameStartRequest(BaseModel):
     player1_model: Optional[str] = None
     player2_model: Optional[str] = None
     question_count: Optional[int] = 20
+    # Play the match on the server and push turns over the game socket, instead of one POST per turn
+    autoplay: bool = False
+    turn_delay: Optional[float] = None
+    # live, fast or turbo: how much of the presentation delays (cooldowns, turn gaps) to keep
+    pacing: Optional[str] = None
 
 @app.post("/api/trivia/start")
-async def start_trivia_game(request: GameStartRequest):
+async def start_trivia_game(request: GameStartRequest, admission_ticket: Optional[str] = Header(None)):
     """Start a new trivia game session"""
+    pacing = requested_pacing(request.pacing)
+    require_admission("trivia", admission_ticket)
     try:
         game_id = str(uuid.uuid4())
+        if not await readiness.wait_for("trivia_questions"):
+            await asyncio.to_thread(get_question_bank)  # load it off the event loop
         questions = get_random_questions(request.question_count)
         
         # Use model IDs directly
         player1_model = request.player1_model or "gpt-4o-mini"
         player2_model = request.player2_model or "claude-3-haiku"
         
-        print(f"Starting trivia game with models: {player1_model} vs {player2_model}")
+        trivia_logger.info(f"Starting trivia game with models: {player1_model} vs {player2_model}", extra=game_fields(game_id))
         
         trivia_game = TriviaGame(
             player1_model=player1_model,
             player2_model=player2_model,
             questions=questions
         )
+        trivia_game.pacing = pacing
         
         trivia_sessions[game_id] = {
             "game": trivia_game,
@@ -607,7 +898,9 @@ async def start_trivia_game(request: GameStartRequest):
             "status": "started",
             "total_questions": len(questions),
             "player1_model": player1_model,
-            "player2_model": player2_model
+            "player2_model": player2_model,
+            "pacing": pacing.name,
+            "autoplay": request.autoplay and start_autoplay("trivia", game_id, request.turn_delay)
         }
         
     except Exception as e:
@@ -616,76 +909,106 @@ async def start_trivia_game(request: GameStartRequest):
 @app.websocket("/api/trivia/ws/{game_id}")
 async def trivia_websocket(websocket: WebSocket, game_id: str):
     """WebSocket endpoint for trivia real-time updates"""
-    await manager.connect(websocket, game_id)
+    await manager.connect(websocket, [game_topic(game_id), interviews_topic(game_id)], since=resume_point(websocket, game_id))
     try:
         while True:
-            data = await websocket.receive_text()
             try:
-                message = json.loads(data)
-                if message.get("type") == "ping":
-                    await websocket.send_text(json.dumps({"type": "pong"}))
-            except:
-                pass
+                message = await manager.receive(websocket)
+            except ValueError:
+                continue
+            if message.get("type") == "ping":
+                await manager.send(websocket, {"type": "pong"})
     except WebSocketDisconnect:
-        manager.disconnect(websocket, game_id)
+        pass
+    finally:
+        manager.disconnect(websocket)
+
+class TriviaActor(MatchActor):
+    """Owns one trivia race: both players' model calls run at once, their answers are recorded in turn"""
+    game_type = "trivia"
+    
+    def __init__(self, game_id: str, session: dict):
+        super().__init__(game_id)
+        self.session = session
+        self.game: TriviaGame = session["game"]
+        self.on(AnswerQuestion, self.answer_question)
+    
+    async def answer_question(self, command: AnswerQuestion):
+        game = self.game
+        if game.game_over:
+            return {"error": "Race is already over"}
+        
+        turn = game.prepare_turn(command.player)
+        if "error" in turn:
+            return turn
+        
+        async def ask():
+            with TURN_DURATION.time("trivia", getattr(turn["model"], "model_id", "unknown")):
+                return await game.ask_model(turn)
+        
+        async def record(answer):
+            finished_before = game.race_finished
+            result = game.record_answer(turn, *answer)
+            
+            await manager.publish(game_topic(self.game_id), {
+                "type": "player_question_result",
+                "data": result
+            })
+            
+            # Only the answer that finished the race ends it; the other player's late answer doesn't
+            if game.race_finished and not finished_before:
+                final_results = game.get_final_results()
+                await manager.publish(game_topic(self.game_id), {
+                    "type": "race_finished",
+                    "data": final_results
+                })
+                self.session["is_active"] = False
+                
+                # LETTA INTEGRATION: Handle trivia game completion
+                game_data = {
+                    "game_duration": final_results.get("race_time", 0),
+                    "winning_move": "completed all questions first",
+                    "final_scores": final_results.get("final_scores", {}),
+                    "questions_completed": final_results.get("questions_completed", {}),
+                    "match_quality": "intellectual battle"
+                }
+                
+                await submit_game_completion(
+                    "Trivia", game.race_winner, 
+                    game.player1.model_id if hasattr(game.player1, 'model_id') else "gpt-4o-mini", 
+                    game.player2.model_id if hasattr(game.player2, 'model_id') else "claude-3-haiku", 
+                    game_data, self.game_id
+                )
+            
+            return result
+        
+        return Effect(ask, record, player=f"player{command.player}")
 
 @app.post("/api/trivia/game/{game_id}/player/{player}/next-question")
-async def player_next_question(game_id: str, player: int):
-    """Process next question for a specific player"""
+async def player_next_question(game_id: str, player: int, response: Response, expected_turn: Optional[int] = None,
+                               idempotency_key: Optional[str] = Header(None)):
+    """Process next question for a specific player (idempotent per turn, see play_turn)"""
     if game_id not in trivia_sessions:
         raise HTTPException(status_code=404, detail="Game not found")
     
     session = trivia_sessions[game_id]
     game = session["game"]
     
-    if game.game_over:
-        return {"error": "Race is already over"}
-    
     if player not in [1, 2]:
         raise HTTPException(status_code=400, detail="Player must be 1 or 2")
     
-    try:
-        result = await game.ask_question_to_player(player)
-        
-        await manager.broadcast_to_game(
-            json.dumps({
-                "type": "player_question_result",
-                "data": result
-            }),
-            game_id
-        )
-        
-        if game.race_finished:
-            final_results = game.get_final_results()
-            await manager.broadcast_to_game(
-                json.dumps({
-                    "type": "race_finished",
-                    "data": final_results
-                }),
-                game_id
-            )
-            session["is_active"] = False
-            
-            # LETTA INTEGRATION: Handle trivia game completion
-            game_data = {
-                "game_duration": final_results.get("race_time", 0),
-                "winning_move": "completed all questions first",
-                "final_scores": final_results.get("final_scores", {}),
-                "questions_completed": final_results.get("questions_completed", {}),
-                "match_quality": "intellectual battle"
-            }
-            
-            asyncio.create_task(handle_game_completion(
-                "Trivia", game.race_winner, 
-                game.player1.model_id if hasattr(game.player1, 'model_id') else "gpt-4o-mini", 
-                game.player2.model_id if hasattr(game.player2, 'model_id') else "claude-3-haiku", 
-                game_data, game_id
-            ))
-        
-        return result
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    async def play():
+        try:
+            return await match_actors.get(game_id, lambda: TriviaActor(game_id, session)).ask(AnswerQuestion(player))
+        except ActorBusy:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+    
+    # Every answer (right or wrong) is one turn; cooldown refusals aren't recorded
+    responses = game.player1_responses if player == 1 else game.player2_responses
+    return await play_turn(response, "trivia", game_id, f"player{player}", lambda: len(responses) + 1, play,
+                           idempotency_key, expected_turn)
 
 @app.get("/api/trivia/game/{game_id}/player/{player}/current-question")
 async def get_player_current_question(game_id: str, player: int):
@@ -709,6 +1032,17 @@ async def get_player_current_question(game_id: str, player: int):
         "finished": question_index >= len(game.questions)
     }
 
+@app.get("/api/trivia/game/{game_id}/questions")
+async def get_trivia_questions(game_id: str):
+    """Get the full question set for a game (binary clients receive question IDs only)"""
+    if game_id not in trivia_sessions:
+        raise HTTPException(status_code=404, detail="Game not found")
+    
+    game = trivia_sessions[game_id]["game"]
+    return {
+        "questions": {q["id"]: q for q in game.questions}
+    }
+
 # =================
 # WORDLE ENDPOINTS
 # =================
@@ -717,14 +1051,17 @@ async def get_player_current_question(game_id: str, player: int):
 current_wordle_game = None
 
 @app.post("/api/wordle/start")
-async def start_wordle_game(request: dict):
+async def start_wordle_game(request: dict, admission_ticket: Optional[str] = Header(None)):
     """Start a new Wordle game"""
     global current_wordle_game
+    reject_if_draining()
     
     secret_word = request.get('secret_word', '').upper()
     
     if len(secret_word) != 5 or not secret_word.isalpha():
         raise HTTPException(status_code=400, detail="Must be a 5-letter word")
+    pacing = requested_pacing(request.get('pacing'))
+    require_admission("wordle", admission_ticket)
     
     # Create game and store as current game
     current_wordle_game = WordleSimpleGame(secret_word)
@@ -733,7 +1070,8 @@ async def start_wordle_game(request: dict):
     game_id = str(uuid.uuid4())
     wordle_games[game_id] = current_wordle_game
     
-    return {"success": True, "game_id": game_id}
+    autoplay = bool(request.get('autoplay')) and start_autoplay("wordle", game_id, request.get('turn_delay'), pacing)
+    return {"success": True, "game_id": game_id, "autoplay": autoplay}
 
 @app.get("/api/wordle/state/{game_id}")
 async def get_wordle_state(game_id: str):
@@ -762,9 +1100,98 @@ async def get_wordle_state_no_id():
         "secret_word": current_wordle_game.secret_word if current_wordle_game.game_over else None
     }
 
+class WordleActor(MatchActor):
+    """Owns one Wordle match: both models think at once, their guesses are scored in turn"""
+    game_type = "wordle"
+    
+    def __init__(self, game_id: str, game: WordleSimpleGame):
+        super().__init__(game_id)
+        self.game = game
+        self.on(GuessWord, self.guess_word)
+    
+    async def guess_word(self, command: GuessWord):
+        game = self.game
+        model = command.model
+        model_data = game.models[model]
+        if game.game_over:
+            # Don't pay for a guess that make_guess would refuse
+            return {"error": "Game already over", "game_over": True, "winner": game.winner}
+        
+        guesses, feedback = list(model_data['guesses']), list(model_data['feedback'])
+        
+        async def think():
+            try:
+                with TURN_DURATION.time("wordle", model):
+                    # get_llm_guess blocks on the provider; keep it off the event loop
+                    return await asyncio.to_thread(get_llm_guess, model, guesses, feedback)
+            except Exception as e:
+                wordle_logger.error(f"❌ Error getting guess from {model}: {e}", extra=game_fields(self.game_id, len(guesses) + 1))
+                fallback_words = ["CRANE", "SLATE", "AUDIO", "HOUSE", "ROUND"]
+                guess = fallback_words[len(guesses) % len(fallback_words)]
+                return guess, f"API error - using fallback word: {guess}"
+        
+        async def score(answer):
+            guess, reasoning = answer
+            result = game.make_guess(model, guess, reasoning)
+            
+            # Check if the game is already over
+            if "error" in result:
+                # Game is already over, return appropriate response
+                return {
+                    "error": result["error"],
+                    "game_over": True,
+                    "winner": game.winner
+                }
+            
+            detailed_reasoning = parse_reasoning_for_ui(model, reasoning, model_data['guesses'], model_data['feedback'])
+            
+            # LETTA INTEGRATION: Handle Wordle game completion
+            if result['game_over'] and result['winner']:
+                # Determine player models for Letta integration
+                player1_model = "gpt-4o-mini"  # Default for openai
+                player2_model = "claude-3-haiku"  # Default for anthropic
+                
+                # Determine winner (1 = openai, 2 = anthropic)
+                winner_num = 1 if result['winner'] == 'openai' else 2
+                
+                # Get game data for interview context
+                game_data = {
+                    "secret_word": game.secret_word,
+                    "winning_guess": guess if result['winner'] == model else "completed first",
+                    "game_duration": len(model_data['guesses']) * 30,  # Rough estimate
+                    "guesses_made": {
+                        "openai": len(game.models['openai']['guesses']),
+                        "anthropic": len(game.models['anthropic']['guesses'])
+                    },
+                    "match_quality": "word puzzle battle"
+                }
+                
+                wordle_logger.info(f"🎮 Wordle game completed! {result['winner']} wins!", extra=game_fields(self.game_id))
+                await submit_game_completion(
+                    "Wordle", winner_num, player1_model, player2_model, 
+                    game_data, self.game_id
+                )
+            
+            response = {
+                "guess": guess,
+                "reasoning": reasoning,
+                "detailed_reasoning": detailed_reasoning,
+                "feedback": result['feedback'],
+                "game_over": result['game_over'],
+                "winner": result['winner']
+            }
+            await manager.publish(game_topic(self.game_id), {
+                "type": "wordle_guess",
+                "data": {"model": model, **response}
+            })
+            return response
+        
+        return Effect(think, score, player=model)
+
 @app.post("/api/wordle/guess/{game_id}")
-async def make_wordle_guess(game_id: str, request: dict):
-    """Make a guess for a Wordle model"""
+async def make_wordle_guess(game_id: str, request: dict, response: Response, expected_turn: Optional[int] = None,
+                            idempotency_key: Optional[str] = Header(None)):
+    """Make a guess for a Wordle model (idempotent per turn, see play_turn)"""
     if game_id not in wordle_games:
         raise HTTPException(status_code=404, detail="No active game")
     
@@ -776,62 +1203,11 @@ async def make_wordle_guess(game_id: str, request: dict):
     game = wordle_games[game_id]
     model_data = game.models[model]
     
-    try:
-        guess, reasoning = get_llm_guess(model, model_data['guesses'], model_data['feedback'])
-    except Exception as e:
-        print(f"❌ Error getting guess from {model}: {e}")
-        fallback_words = ["CRANE", "SLATE", "AUDIO", "HOUSE", "ROUND"]
-        guess = fallback_words[len(model_data['guesses']) % len(fallback_words)]
-        reasoning = f"API error - using fallback word: {guess}"
-    
-    result = game.make_guess(model, guess, reasoning)
-    
-    # Check if the game is already over
-    if "error" in result:
-        # Game is already over, return appropriate response
-        return {
-            "error": result["error"],
-            "game_over": True,
-            "winner": game.winner
-        }
+    async def play():
+        return await match_actors.get(game_id, lambda: WordleActor(game_id, game)).ask(GuessWord(model))
     
-    detailed_reasoning = parse_reasoning_for_ui(model, reasoning, model_data['guesses'], model_data['feedback'])
-    
-    # LETTA INTEGRATION: Handle Wordle game completion
-    if result['game_over'] and result['winner']:
-        # Determine player models for Letta integration
-        player1_model = "gpt-4o-mini"  # Default for openai
-        player2_model = "claude-3-haiku"  # Default for anthropic
-        
-        # Determine winner (1 = openai, 2 = anthropic)
-        winner_num = 1 if result['winner'] == 'openai' else 2
-        
-        # Get game data for interview context
-        game_data = {
-            "secret_word": game.secret_word,
-            "winning_guess": guess if result['winner'] == model else "completed first",
-            "game_duration": len(model_data['guesses']) * 30,  # Rough estimate
-            "guesses_made": {
-                "openai": len(game.models['openai']['guesses']),
-                "anthropic": len(game.models['anthropic']['guesses'])
-            },
-            "match_quality": "word puzzle battle"
-        }
-        
-        print(f"🎮 Wordle game completed! {result['winner']} wins!")
-        asyncio.create_task(handle_game_completion(
-            "Wordle", winner_num, player1_model, player2_model, 
-            game_data, game_id
-        ))
-    
-    return {
-        "guess": guess,
-        "reasoning": reasoning,
-        "detailed_reasoning": detailed_reasoning,
-        "feedback": result['feedback'],
-        "game_over": result['game_over'],
-        "winner": result['winner']
-    }
+    return await play_turn(response, "wordle", game_id, model, lambda: len(model_data['guesses']) + 1, play,
+                           idempotency_key, expected_turn)
 
 @app.post("/api/wordle/guess")
 async def make_wordle_guess_no_id(request: dict):
@@ -847,9 +1223,10 @@ async def make_wordle_guess_no_id(request: dict):
     model_data = current_wordle_game.models[model]
     
     try:
-        guess, reasoning = get_llm_guess(model, model_data['guesses'], model_data['feedback'])
+        with TURN_DURATION.time("wordle", model):
+            guess, reasoning = get_llm_guess(model, model_data['guesses'], model_data['feedback'])
     except Exception as e:
-        print(f"❌ Error getting guess from {model}: {e}")
+        wordle_logger.error(f"❌ Error getting guess from {model}: {e}", extra=game_fields("wordle-legacy", len(model_data['guesses']) + 1))
         fallback_words = ["CRANE", "SLATE", "AUDIO", "HOUSE", "ROUND"]
         guess = fallback_words[len(model_data['guesses']) % len(fallback_words)]
         reasoning = f"API error - using fallback word: {guess}"
@@ -891,11 +1268,12 @@ async def make_wordle_guess_no_id(request: dict):
         # Use a default game_id for backward compatibility
         fallback_game_id = "wordle-legacy"
         
-        print(f"🎮 Wordle game completed! {result['winner']} wins!")
-        asyncio.create_task(handle_game_completion(
+        wordle_logger.info(f"🎮 Wordle game completed! {result['winner']} wins!", extra=game_fields(fallback_game_id))
+        await submit_game_completion(
             "Wordle", winner_num, player1_model, player2_model, 
-            game_data, fallback_game_id
-        ))
+            game_data, fallback_game_id,
+            job_key=f"post_game:{fallback_game_id}:{uuid.uuid4()}"
+        )
     
     return {
         "guess": guess,
@@ -913,10 +1291,15 @@ async def make_wordle_guess_no_id(request: dict):
 class ConnectionsStartRequest(BaseModel):
     player1_model: Optional[str] = None
     player2_model: Optional[str] = None
+    autoplay: bool = False
+    turn_delay: Optional[float] = None
+    pacing: Optional[str] = None
 
 @app.post("/api/connections/start")
-async def start_connections_game(request: ConnectionsStartRequest):
+async def start_connections_game(request: ConnectionsStartRequest, admission_ticket: Optional[str] = Header(None)):
     """Start a new NYT Connections game"""
+    pacing = requested_pacing(request.pacing)
+    require_admission("connections", admission_ticket)
     try:
         game_id = str(uuid.uuid4())
         
@@ -924,6 +1307,9 @@ async def start_connections_game(request: ConnectionsStartRequest):
         player1_model = request.player1_model or "gpt-4o-mini"
         player2_model = request.player2_model or "claude-3-haiku"
         
+        if not await readiness.wait_for("connections_puzzles"):
+            await asyncio.to_thread(load_puzzles)  # load them off the event loop
+        
         # Create two separate games with the same puzzle
         game1 = ConnectionsGame()
         game2 = ConnectionsGame(puzzle_data=game1.puzzle)  # Use same puzzle
@@ -943,7 +1329,8 @@ async def start_connections_game(request: ConnectionsStartRequest):
             "date": game1.date,
             "words": game1.all_words,
             "player1_model": player1_model,
-            "player2_model": player2_model
+            "player2_model": player2_model,
+            "autoplay": request.autoplay and start_autoplay("connections", game_id, request.turn_delay, pacing)
         }
         
     except Exception as e:
@@ -952,59 +1339,51 @@ async def start_connections_game(request: ConnectionsStartRequest):
 @app.websocket("/api/connections/ws/{game_id}")
 async def connections_websocket(websocket: WebSocket, game_id: str):
     """WebSocket endpoint for NYT Connections real-time updates"""
-    await manager.connect(websocket, game_id)
+    await manager.connect(websocket, [game_topic(game_id), interviews_topic(game_id)], since=resume_point(websocket, game_id))
     try:
         while True:
-            data = await websocket.receive_text()
             try:
-                message = json.loads(data)
-                if message.get("type") == "ping":
-                    await websocket.send_text(json.dumps({"type": "pong"}))
-            except:
-                pass
+                message = await manager.receive(websocket)
+            except ValueError:
+                continue
+            if message.get("type") == "ping":
+                await manager.send(websocket, {"type": "pong"})
     except WebSocketDisconnect:
-        manager.disconnect(websocket, game_id)
+        pass
+    finally:
+        manager.disconnect(websocket)
 
-@app.post("/api/connections/game/{game_id}/player/{player}/ai-turn")
-async def connections_ai_turn(game_id: str, player: str, request: dict):
-    """Process an AI turn for NYT Connections"""
-    # Convert player to int
-    try:
-        player_num = int(player)
-        if player_num not in [1, 2]:
-            raise ValueError("Player must be 1 or 2")
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Player must be 1 or 2")
-    
-    if game_id not in connections_games:
-        raise HTTPException(status_code=404, detail="Game not found")
-    
-    session = connections_games[game_id]
-    
-    # Get the appropriate game and model for this player
-    if player_num == 1:
-        game = session["player1_game"]
-        model_id = session["player1_model"]
-    else:
-        game = session["player2_game"]
-        model_id = session["player2_model"]
+class ConnectionsActor(MatchActor):
+    """Owns one Connections match (a board per player): both models think at once, guesses are applied in turn"""
+    game_type = "connections"
     
-    if game.game_over:
-        return {"error": "Game is already over"}
+    def __init__(self, game_id: str, session: dict):
+        super().__init__(game_id)
+        self.session = session
+        self.on(PlayConnectionsTurn, self.play_turn)
     
-    try:
-        # Get AI guess using the model ID
-        guess = game.get_ai_guess(model_id)
-        
-        if not guess:
-            return {"error": "Failed to get AI guess"}
+    async def play_turn(self, command: PlayConnectionsTurn):
+        game_id, session, player_num = self.game_id, self.session, command.player
+        game = session[f"player{player_num}_game"]
+        model_id = session[f"player{player_num}_model"]
+        if game.game_over:
+            return {"error": "Game is already over"}
         
-        # Make the guess
-        result = game.make_guess(model_id, guess)
+        async def think():
+            # Get AI guess using the model ID; it blocks on the provider, so keep it off the event loop.
+            # Only this player's board is read, and nothing changes it until the guess is applied
+            with TURN_DURATION.time("connections", model_id):
+                return await asyncio.to_thread(game.get_ai_guess, model_id)
         
-        # Broadcast update
-        await manager.broadcast_to_game(
-            json.dumps({
+        async def apply(guess):
+            if not guess:
+                return {"error": "Failed to get AI guess"}
+            
+            # Make the guess
+            result = game.make_guess(model_id, guess)
+            
+            # Broadcast update
+            await manager.publish(game_topic(game_id), {
                 "type": "game_update",
                 "data": {
                     "player": player_num,
@@ -1013,57 +1392,85 @@ async def connections_ai_turn(game_id: str, player: str, request: dict):
                     "result": result,
                     "game_state": game.get_game_state()
                 }
-            }),
-            game_id
-        )
-        
-        # LETTA INTEGRATION: Handle Connections game completion
-        if game.game_over:
-            # Determine winner based on score
-            player1_game = session["player1_game"]
-            player2_game = session["player2_game"]
-            
-            player1_score = player1_game.score if hasattr(player1_game, 'score') else 0
-            player2_score = player2_game.score if hasattr(player2_game, 'score') else 0
+            })
             
-            if player1_score > player2_score:
-                winner_num = 1
-            elif player2_score > player1_score:
-                winner_num = 2
-            else:
-                winner_num = player_num  # Current player wins in case of tie
+            # LETTA INTEGRATION: Handle Connections game completion
+            if game.game_over:
+                # Determine winner based on score
+                player1_game = session["player1_game"]
+                player2_game = session["player2_game"]
+                
+                player1_score = player1_game.score if hasattr(player1_game, 'score') else 0
+                player2_score = player2_game.score if hasattr(player2_game, 'score') else 0
+                
+                if player1_score > player2_score:
+                    winner_num = 1
+                elif player2_score > player1_score:
+                    winner_num = 2
+                else:
+                    winner_num = player_num  # Current player wins in case of tie
+                
+                # Get game data for interview context
+                game_data = {
+                    "final_scores": {
+                        "player1": player1_score,
+                        "player2": player2_score
+                    },
+                    "winning_move": guess,
+                    "game_duration": 300,  # Rough estimate for connections
+                    "categories_found": {
+                        "player1": len(getattr(player1_game, 'found_categories', [])),
+                        "player2": len(getattr(player2_game, 'found_categories', []))
+                    },
+                    "match_quality": "pattern recognition challenge"
+                }
+                
+                connections_logger.info(f"🎮 Connections game completed! Player {winner_num} wins!", extra=game_fields(game_id))
+                await submit_game_completion(
+                    "Connections", winner_num, session["player1_model"], session["player2_model"], 
+                    game_data, game_id
+                )
             
-            # Get game data for interview context
-            game_data = {
-                "final_scores": {
-                    "player1": player1_score,
-                    "player2": player2_score
-                },
-                "winning_move": guess,
-                "game_duration": 300,  # Rough estimate for connections
-                "categories_found": {
-                    "player1": len(getattr(player1_game, 'found_categories', [])),
-                    "player2": len(getattr(player2_game, 'found_categories', []))
-                },
-                "match_quality": "pattern recognition challenge"
+            return {
+                "player": player_num,
+                "model": model_id,
+                "guess": guess,
+                "result": result,
+                "game_state": game.get_game_state()
             }
-            
-            print(f"🎮 Connections game completed! Player {winner_num} wins!")
-            asyncio.create_task(handle_game_completion(
-                "Connections", winner_num, session["player1_model"], session["player2_model"], 
-                game_data, game_id
-            ))
         
-        return {
-            "player": player_num,
-            "model": model_id,
-            "guess": guess,
-            "result": result,
-            "game_state": game.get_game_state()
-        }
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        return Effect(think, apply, player=f"player{player_num}")
+
+@app.post("/api/connections/game/{game_id}/player/{player}/ai-turn")
+async def connections_ai_turn(game_id: str, player: str, request: dict, response: Response,
+                              expected_turn: Optional[int] = None, idempotency_key: Optional[str] = Header(None)):
+    """Process an AI turn for NYT Connections (idempotent per turn, see play_turn)"""
+    # Convert player to int
+    try:
+        player_num = int(player)
+        if player_num not in [1, 2]:
+            raise ValueError("Player must be 1 or 2")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Player must be 1 or 2")
+    
+    if game_id not in connections_games:
+        raise HTTPException(status_code=404, detail="Game not found")
+    
+    session = connections_games[game_id]
+    
+    game = session["player1_game"] if player_num == 1 else session["player2_game"]
+    
+    async def play():
+        try:
+            return await match_actors.get(game_id, lambda: ConnectionsActor(game_id, session)).ask(PlayConnectionsTurn(player_num))
+        except ActorBusy:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+    
+    return await play_turn(response, "connections", game_id, f"player{player_num}",
+                           lambda: len(game.correct_guesses) + len(game.incorrect_guesses) + 1, play,
+                           idempotency_key, expected_turn)
 
 @app.get("/api/connections/game/{game_id}/state")
 async def get_connections_state(game_id: str):
@@ -1086,77 +1493,89 @@ async def get_connections_state(game_id: str):
 @app.websocket("/games/debate/{game_id}")
 async def debate_websocket(websocket: WebSocket, game_id: str):
     """WebSocket endpoint for Debate games"""
-    await websocket.accept()
-    print(f"Client connected to debate game {game_id}")
+    await manager.connect(websocket, [game_topic(game_id), interviews_topic(game_id)], since=resume_point(websocket, game_id))
+    debate_logger.info(f"Client connected to debate game {game_id}", extra=game_fields(game_id))
     
     try:
         while True:
-            data = await websocket.receive_json()
+            data = await manager.receive(websocket)
             
             if data.get("type") == "start_debate":
                 # Check if game already exists
                 if game_id in debate_games:
                     game = debate_games[game_id]
-                    print(f"Debate {game_id} already exists, sending current state")
+                    debate_logger.info(f"Debate {game_id} already exists, sending current state", extra=game_fields(game_id))
                     
                     # Send current game state
-                    await websocket.send_json({
+                    await manager.send(websocket, {
                         "type": "game_state",
                         "state": game.get_state()
                     })
                     continue
                 
-                # Create new debate
+                if readiness.draining:
+                    await manager.send(websocket, {"type": "error", "message": "Server is restarting, try again shortly"})
+                    continue
+                
+                # Create new debate; the request is validated before admission, as for battleship
                 topic = data.get("topic", "")
                 player1_model = data.get("player1Model", "gpt-4o-mini")
                 player2_model = data.get("player2Model", "claude-3-haiku")
                 judge_model = data.get("judgeModel", "gpt-4o")
                 
                 if not topic:
-                    await websocket.send_json({
+                    await manager.send(websocket, {
                         "type": "error",
                         "message": "Topic is required"
                     })
                     continue
                 
-                print(f"Creating new debate {game_id} - Topic: {topic}")
-                print(f"Models: {player1_model} (PRO) vs {player2_model} (CON), Judge: {judge_model}")
+                try:
+                    pacing = get_pacing(data.get("pacing"))
+                except ValueError as e:
+                    await manager.send(websocket, {"type": "error", "message": str(e)})
+                    continue
+                
+                decision = admit_match("debate", data.get("ticket"))
+                if not decision.admitted:
+                    await send_admission_denied(websocket, decision)
+                    continue
+                
+                debate_logger.info(
+                    f"Creating new debate {game_id} - Topic: {topic} - {player1_model} (PRO) vs {player2_model} (CON), Judge: {judge_model}",
+                    extra=game_fields(game_id)
+                )
                 
                 # Create debate game
                 game = DebateGame(game_id, player1_model, player2_model)
+                game.pacing = pacing
                 debate_games[game_id] = game
+                attach_debate_callbacks(game, game_id)
                 
-                # Set WebSocket for broadcasting
-                game.websocket = websocket
-                
-                # Initialize debate with topic
+                # Initialize debate with topic, then start its single driver task
                 await game.initialize(topic, judge_model)
+                match_loops.ensure(game_id, game.run_debate)
                 
             elif data.get("type") == "get_state":
                 # Handle request for current game state
                 if game_id in debate_games:
                     game = debate_games[game_id]
-                    await websocket.send_json({
+                    await manager.send(websocket, {
                         "type": "game_state",
                         "state": game.get_state()
                     })
                 else:
-                    await websocket.send_json({
+                    await manager.send(websocket, {
                         "type": "error",
                         "message": "Debate not found"
                     })
             
     except WebSocketDisconnect:
-        print(f"Client disconnected from debate game {game_id}")
-        # Clean up game if needed
-        if game_id in debate_games:
-            game = debate_games[game_id]
-            if hasattr(game, 'websocket'):
-                game.websocket = None
+        debate_logger.info(f"Client disconnected from debate game {game_id}", extra=game_fields(game_id))
     except Exception as e:
-        print(f"WebSocket error in debate {game_id}: {e}")
-        import traceback
-        traceback.print_exc()
+        debate_logger.exception(f"WebSocket error in debate {game_id}: {e}", extra=game_fields(game_id))
+    finally:
+        manager.disconnect(websocket)
 
 # ===================
 # VOTING ENDPOINTS
@@ -1169,6 +1588,23 @@ class Vote(BaseModel):
     gameId: str
     model: str  # "gpt-4o" or "claude"
 
+def build_vote_update(game_id: str) -> dict:
+    """Build the vote_update message for a game's current tally"""
+    votes = vote_storage[game_id]
+    total = votes["gpt-4o"] + votes["claude"]
+    return {
+        "type": "vote_update",
+        "data": {
+            "gameId": game_id,
+            "votes": votes,
+            "total": total,
+            "percentages": {
+                "gpt_4o": round((votes["gpt-4o"] / total * 100) if total > 0 else 0, 1),
+                "claude": round((votes["claude"] / total * 100) if total > 0 else 0, 1)
+            }
+        }
+    }
+
 @app.post("/api/vote")
 async def submit_vote(vote: Vote):
     """Submit a vote for a model in a specific game"""
@@ -1183,27 +1619,10 @@ async def submit_vote(vote: Vote):
     # Increment vote count
     model_key = vote.model.lower()
     vote_storage[vote.gameId][model_key] += 1
-    
-    # Calculate updated stats
-    votes = vote_storage[vote.gameId]
-    total = votes["gpt-4o"] + votes["claude"]
+    VOTES.inc(model_key)
     
     # Broadcast vote update via WebSocket with complete data
-    await manager.broadcast_to_game(
-        json.dumps({
-            "type": "vote_update",
-            "data": {
-                "gameId": vote.gameId,
-                "votes": votes,
-                "total": total,
-                "percentages": {
-                    "gpt_4o": round((votes["gpt-4o"] / total * 100) if total > 0 else 0, 1),
-                    "claude": round((votes["claude"] / total * 100) if total > 0 else 0, 1)
-                }
-            }
-        }),
-        f"votes-{vote.gameId}"
-    )
+    await manager.publish(votes_topic(vote.gameId), build_vote_update(vote.gameId))
     
     return {"message": "Vote recorded", "gameId": vote.gameId}
 
@@ -1231,35 +1650,102 @@ async def get_vote_stats(gameId: str):
 @app.websocket("/api/vote/ws/{game_id}")
 async def vote_websocket(websocket: WebSocket, game_id: str):
     """WebSocket endpoint for real-time vote updates"""
-    await manager.connect(websocket, f"votes-{game_id}")
+    await manager.connect(websocket, [votes_topic(game_id), interviews_topic(game_id)])
     try:
         # Send current vote stats on connection
         if game_id in vote_storage:
-            votes = vote_storage[game_id]
-            total = votes["gpt-4o"] + votes["claude"]
-            await websocket.send_text(json.dumps({
-                "type": "vote_update",
-                "data": {
-                    "gameId": game_id,
-                    "votes": votes,
-                    "total": total,
-                    "percentages": {
-                        "gpt_4o": round((votes["gpt-4o"] / total * 100) if total > 0 else 0, 1),
-                        "claude": round((votes["claude"] / total * 100) if total > 0 else 0, 1)
-                    }
-                }
-            }))
+            await manager.send(websocket, build_vote_update(game_id))
         
         while True:
-            data = await websocket.receive_text()
             try:
-                message = json.loads(data)
-                if message.get("type") == "ping":
-                    await websocket.send_text(json.dumps({"type": "pong"}))
-            except:
-                pass
+                message = await manager.receive(websocket)
+            except ValueError:
+                continue
+            if message.get("type") == "ping":
+                await manager.send(websocket, {"type": "pong"})
     except WebSocketDisconnect:
-        manager.disconnect(websocket, f"votes-{game_id}")
+        pass
+    finally:
+        manager.disconnect(websocket)
+
+# ============================
+# MULTIPLEXED WEBSOCKET
+# ============================
+
+async def send_topic_snapshot(subscriber, topic: str):
+    """Send the current state for a topic right after a client subscribes"""
+    kind, game_id = parse_topic(topic)
+    if kind == "votes" and game_id in vote_storage:
+        await subscriber.send(topic, build_vote_update(game_id))
+
+@app.websocket("/ws")
+async def multiplexed_websocket(websocket: WebSocket):
+    """Single WebSocket per client that carries any number of topic subscriptions
+    
+    Clients send {"type": "subscribe", "topics": ["game:<id>", "votes:<id>", "interviews:<id>"]}
+    and {"type": "unsubscribe", "topics": [...]}. Every message pushed to the client
+    carries a "topic" field naming the subscription it came from. Adding
+    "since": <seq> to a subscribe frame replays the game events missed since then.
+    """
+    initial_topics = [t for t in websocket.query_params.get("topics", "").split(",") if parse_topic(t)]
+    subscriber = await manager.connect(websocket, initial_topics, tagged=True)
+    try:
+        for topic in initial_topics:
+            await send_topic_snapshot(subscriber, topic)
+        
+        while True:
+            try:
+                message = await manager.receive(websocket)
+            except ValueError:
+                await subscriber.send(None, {"type": "error", "message": "Invalid frame"})
+                continue
+            
+            message_type = message.get("type")
+            topics = message.get("topics", [])
+            if isinstance(topics, str):
+                topics = [topics]
+            
+            if message_type == "ping":
+                await subscriber.send(None, {"type": "pong"})
+            elif message_type in ("subscribe", "unsubscribe"):
+                invalid = [t for t in topics if not parse_topic(t)]
+                if invalid:
+                    await subscriber.send(None, {
+                        "type": "error",
+                        "message": f"Unknown topics: {', '.join(invalid)}"
+                    })
+                    continue
+                
+                # "since" resumes topics from a sequence number: either one number
+                # for every topic in the frame or a {topic: seq} mapping
+                since = message.get("since")
+                if isinstance(since, int):
+                    since = {topic: since for topic in topics}
+                elif not isinstance(since, dict):
+                    since = {}
+                
+                for topic in topics:
+                    if message_type == "unsubscribe":
+                        manager.unsubscribe(websocket, topic)
+                    elif isinstance(since.get(topic), int):
+                        await manager.catch_up(websocket, topic, since[topic])
+                    else:
+                        manager.subscribe(websocket, topic)
+                        await send_topic_snapshot(subscriber, topic)
+                
+                await subscriber.send(None, {
+                    "type": f"{message_type}d",
+                    "topics": manager.topics_for(websocket)
+                })
+            else:
+                await subscriber.send(None, {
+                    "type": "error",
+                    "message": f"Unknown message type: {message_type}"
+                })
+    except WebSocketDisconnect:
+        pass
+    finally:
+        manager.disconnect(websocket)
 
 # ====================
 # COMMON ENDPOINTS
@@ -1272,7 +1758,7 @@ async def root():
         "server": "VERSUS Unified Game Server",
         "version": "2.0.0",
         "games": {
-            "battleship": {"active": len([g for g in active_games.items() if g[1].get("type") == "battleship"])},
+            "battleship": {"active": len(battleship_games)},
             "trivia": {"active": len(trivia_sessions)},
             "wordle": {"active": len(wordle_games)},
             "connections": {"active": len(connections_games)},
@@ -1283,10 +1769,37 @@ async def root():
             "trivia": "/api/trivia/*",
             "wordle": "/api/wordle/*",
             "connections": "/api/connections/*",
-            "debate": "/games/debate/{game_id}"
+            "debate": "/games/debate/{game_id}",
+            "multiplexed": "/ws"
         }
     }
 
+def count_active_games() -> Dict[tuple, int]:
+    """Unfinished matches per game type (the games dicts also keep finished ones)"""
+    return {(game_type,): len(games) for game_type, games in live_games().items()}
+
+def count_websocket_connections() -> Dict[tuple, int]:
+    """Subscribed sockets per channel (topic kind)"""
+    counts = {(kind,): 0 for kind in ("game", "votes", "interviews")}
+    for topic, subscribers in manager.topics.items():
+        parsed = parse_topic(topic)
+        if parsed:
+            counts[(parsed[0],)] += len(subscribers)
+    return counts
+
+async def count_queued_jobs() -> Dict[tuple, int]:
+    stats = await job_queue.stats()
+    return {(job_type, state): n for job_type, states in stats.items() for state, n in states.items()}
+
+GAMES_ACTIVE.set_function(count_active_games)
+WEBSOCKET_CONNECTIONS.set_function(count_websocket_connections)
+JOB_QUEUE_DEPTH.set_function(count_queued_jobs)
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Prometheus text exposition of game, LLM, socket and job metrics"""
+    return PlainTextResponse(await metrics.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -1302,11 +1815,163 @@ async def health_check():
         "letta_personalities": letta_service.initialized
     }
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness probe: 200 once games can be served, plus which background subsystems are warm"""
+    report = readiness.report()
+    return JSONResponse(report, status_code=200 if report["ready"] else 503)
+
+@app.get("/api/admission")
+async def get_admission_stats():
+    """Live matches against their limits, waiting rooms, LLM calls in flight and recent loop lag"""
+    return admission.report({game_type: len(by_id) for game_type, by_id in live_games().items()})
+
+class AutoplayRequest(BaseModel):
+    turn_delay: Optional[float] = None
+    pacing: Optional[str] = None
+
+@app.post("/api/matches/{game_id}/autoplay")
+async def start_match_autoplay(game_id: str, request: AutoplayRequest):
+    """Have the server play a trivia/wordle/connections match, pushing each turn over its game socket"""
+    reject_if_draining()
+    game_type = client_paced_game_type(game_id)
+    if game_type is None:
+        raise HTTPException(status_code=404, detail="Game not found")
+    pacing = requested_pacing(request.pacing) if request.pacing else None
+    if not start_autoplay(game_type, game_id, request.turn_delay, pacing):
+        raise HTTPException(status_code=409, detail="Match is already being played by the server")
+    return {"game_id": game_id, "game_type": game_type, "autoplay": True}
+
+@app.delete("/api/matches/{game_id}/autoplay")
+async def stop_match_autoplay(game_id: str):
+    """Hand a match back to manual (per-turn POST) play"""
+    if not await orchestrator.stop(game_id):
+        raise HTTPException(status_code=404, detail="Match is not being played by the server")
+    return {"game_id": game_id, "autoplay": False}
+
+@app.get("/api/autoplay")
+async def get_autoplay_matches():
+    """Matches currently played by the server-side orchestrator"""
+    return orchestrator.report()
+
+class TournamentRequest(BaseModel):
+    models: List[str]
+    game_types: List[str]
+    format: str = "round_robin"
+    matches_per_pair: int = 2
+    rounds: int = 3
+    concurrency: int = TOURNAMENT_CONCURRENCY
+    seed: int = 0
+    options: Dict[str, Dict] = {}
+    name: Optional[str] = None
+
+@app.post("/api/tournaments")
+async def start_tournament(request: TournamentRequest):
+    """Start a headless tournament; matches run in the background and are checkpointed as they finish"""
+    reject_if_draining()
+    config = TournamentConfig(models=request.models, game_types=request.game_types, format=request.format,
+                              matches_per_pair=request.matches_per_pair, rounds=request.rounds,
+                              concurrency=request.concurrency, seed=request.seed, options=request.options)
+    try:
+        tournament_id = await tournaments.create(config, request.name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"tournament_id": tournament_id, "running": True}
+
+@app.get("/api/tournaments")
+async def list_tournaments():
+    """Recent tournaments and the provider rate limits they share"""
+    recent = await asyncio.to_thread(tournaments.store.recent)
+    for tournament in recent:
+        tournament["running"] = tournaments.is_running(tournament["id"])
+    return {"tournaments": recent, "provider_limits": provider_limiter.report()}
+
+@app.get("/api/tournaments/{tournament_id}")
+async def get_tournament(tournament_id: str):
+    """Progress and standings (overall and per game type)"""
+    report = await tournaments.report(tournament_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Tournament not found")
+    return report
+
+@app.get("/api/tournaments/{tournament_id}/matches")
+async def get_tournament_matches(tournament_id: str, state: Optional[str] = None):
+    """Every scheduled match with its result (winner, turns, latency, tokens)"""
+    if await asyncio.to_thread(tournaments.store.get, tournament_id) is None:
+        raise HTTPException(status_code=404, detail="Tournament not found")
+    return {"matches": await asyncio.to_thread(tournaments.store.matches, tournament_id, state)}
+
+@app.post("/api/tournaments/{tournament_id}/resume")
+async def resume_tournament(tournament_id: str, retry_failed: bool = False):
+    """Play a paused tournament's remaining matches (and its failed ones with retry_failed)"""
+    reject_if_draining()
+    tournament = await asyncio.to_thread(tournaments.store.get, tournament_id)
+    if tournament is None:
+        raise HTTPException(status_code=404, detail="Tournament not found")
+    if not tournaments.resume(tournament_id, TournamentConfig(**tournament["config"]), retry_failed):
+        raise HTTPException(status_code=409, detail="Tournament is already running")
+    return {"tournament_id": tournament_id, "running": True}
+
+@app.delete("/api/tournaments/{tournament_id}")
+async def pause_tournament(tournament_id: str):
+    """Pause a running tournament; matches in progress go back in the queue"""
+    if not await tournaments.pause(tournament_id):
+        raise HTTPException(status_code=404, detail="Tournament is not running")
+    return {"tournament_id": tournament_id, "running": False}
+
+@app.get("/api/actors")
+async def get_actor_stats():
+    """Per-match actors with a running mailbox: queue depth, turns in flight and throughput"""
+    return match_actors.report()
+
+@app.get("/api/tasks")
+async def get_task_stats(game_id: Optional[str] = None):
+    """Post-game job counts per type and dead letters, or one game's jobs
+
+    Startup warm-up tasks are reported separately under /ready.
+    """
+    if game_id:
+        return {"game_id": game_id, "jobs": await job_queue.jobs_for(game_id)}
+    return {
+        "jobs": await job_queue.stats(),
+        "dead_letters": await job_queue.dead_letters()
+    }
+
+@app.post("/api/tasks/dead-letters/requeue")
+async def requeue_dead_letters(game_id: Optional[str] = None):
+    """Retry dead-lettered post-game jobs (all, or one game's)"""
+    return {"requeued": await job_queue.requeue_dead(game_id)}
+
+@app.get("/api/diagnostics/loop")
+async def get_loop_diagnostics(reset: bool = False):
+    """Event loop lag and the call sites that blocked it, heaviest first"""
+    report = loop_monitor.report()
+    if reset:
+        loop_monitor.reset()
+    return report
+
+@app.get("/api/leaderboard")
+async def get_leaderboard(game_type: str = OVERALL_RATINGS):
+    """Elo and Glicko rankings, overall or for one game type, as materialized by the last rated match"""
+    board = await asyncio.to_thread(ratings.leaderboard, game_type)
+    return dict(board, scopes=sorted(ratings.boards))
+
 @app.get("/api/personalities")
 async def get_personality_stats():
     """Get AI personality statistics and rivalry data"""
+    personalities = letta_service.get_personality_stats()
+    # Ratings and records persist across restarts; the personality counters only cover this run
+    board = await asyncio.to_thread(ratings.leaderboard)
+    glicko = {entry["model"]: entry for entry in board["glicko"]}
+    for entry in board["elo"]:
+        if entry["model"] in personalities:
+            personalities[entry["model"]]["rating"] = {
+                "elo": entry["rating"], "elo_rank": entry["rank"],
+                "glicko": glicko[entry["model"]]["rating"], "glicko_rd": glicko[entry["model"]]["rd"],
+                "wins": entry["wins"], "draws": entry["draws"], "losses": entry["losses"]
+            }
     return {
-        "personalities": letta_service.get_personality_stats(),
+        "personalities": personalities,
         "initialized": letta_service.initialized
     }
 
@@ -1317,7 +1982,7 @@ async def test_roast():
         return {"error": "Letta service not available"}
     
     try:
-        print("🧪 TEST: Manually generating roast...")
+        logger.info("🧪 TEST: Manually generating roast...")
         
         # Test roast generation
         interviews = await letta_service.generate_post_game_interviews(
@@ -1335,12 +2000,12 @@ async def test_roast():
         )
         
         if interviews:
-            print(f"✅ TEST: Generated interviews: {interviews}")
+            logger.info(f"✅ TEST: Generated interviews: {interviews}")
             
             # Convert to voice if we have a winner
             if interviews.get('winner'):
                 winner_data = interviews['winner']
-                print(f"🎙️ TEST: Converting to voice...")
+                logger.info(f"🎙️ TEST: Converting to voice...")
                 
                 audio_bytes = await letta_service.convert_to_voice_with_vapi(
                     winner_data['response'], 
@@ -1354,23 +2019,20 @@ async def test_roast():
                     audio_path = os.path.join("static", "interviews", test_filename)
                     
                     os.makedirs(os.path.dirname(audio_path), exist_ok=True)
-                    with open(audio_path, "wb") as f:
-                        f.write(audio_bytes)
+                    await asyncio.to_thread(write_file, audio_path, audio_bytes)
                     
                     interviews['winner']['audio_url'] = f"/static/interviews/{test_filename}"
-                    print(f"🎵 TEST: Audio saved to {audio_path}")
+                    logger.info(f"🎵 TEST: Audio saved to {audio_path}")
                 else:
-                    print("❌ TEST: Audio generation failed")
+                    logger.error("❌ TEST: Audio generation failed")
             
             return {"success": True, "interviews": interviews}
         else:
-            print(f"❌ TEST: No interviews generated - this should not happen with fallback!")
+            logger.error(f"❌ TEST: No interviews generated - this should not happen with fallback!")
             return {"error": "Failed to generate interviews", "interviews": interviews}
             
     except Exception as e:
-        print(f"❌ TEST: Error generating roast: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"❌ TEST: Error generating roast: {e}")
         return {"error": str(e)}
 
 # Serve static audio files
@@ -1440,25 +2102,17 @@ async def test_send_roast(game_id: str):
         }
     }
     
-    print(f"🧪 Sending test roast to game {game_id}")
-    print(f"🎵 Test audio URL: {latest_audio}")
+    logger.info(f"🧪 Sending test roast to game {game_id}")
+    logger.info(f"🎵 Test audio URL: {latest_audio}")
     
-    # Broadcast to both channels
-    await manager.broadcast_to_game(
-        json.dumps(test_roast),
-        game_id
-    )
-    
-    await manager.broadcast_to_game(
-        json.dumps(test_roast),
-        f"votes-{game_id}"
-    )
+    # Game and vote sockets all listen on the interviews topic
+    await manager.publish(interviews_topic(game_id), test_roast)
     
     return {
         "message": "Test roast sent",
         "game_id": game_id,
         "audio_url": latest_audio,
-        "channels": [game_id, f"votes-{game_id}"]
+        "channels": [interviews_topic(game_id)]
     }
 
 if __name__ == "__main__":
@@ -1475,4 +2129,5 @@ if __name__ == "__main__":
     print("  - Debate: WebSocket at /games/debate/{game_id}")
     print("-" * 50)
     
+    import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
@@ -1,5 +1,8 @@
 import random
+import re
 import json
+from functools import lru_cache
+from itertools import islice
 from typing import Dict, List, Tuple, Optional
 import asyncio
 import sys
@@ -8,29 +11,79 @@ import os
 # Add the backend directory to path to import from src
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
 
+from src.games.battleship.bitboard import get_geometry
+from src.games.battleship.coordinates import (DEFAULT_BOARD_SIZE, MAX_BOARD_SIZE, column_label, coordinate_range,
+                                              format_coordinate, parse_coordinate)
+from src.games.battleship.placement import sample_layout, ship_origin
+from src.games.battleship.targeting import best_target
 from src.utils.common import BaseGame, LLMClient
+from src.utils.log import get_logger
+
+logger = get_logger("battleship")
+
+MIN_BOARD_SIZE = 4
+DEFAULT_SHIPS = {
+    "carrier": 4,
+    "battleship": 3,
+    "destroyer": 3,
+    "submarine": 2,
+    "patrol": 2
+}
+MAX_SHIPS = 20
+SHIP_ID = re.compile(r'^[a-z][a-z0-9_]{0,19}$')
+
+
+def validate_config(board_size: Optional[int] = None, ships: Optional[Dict[str, int]] = None,
+                    no_touch: bool = False) -> Tuple[int, Dict[str, int]]:
+    """Board size and fleet for a match (defaults for anything not given); ValueError if they can't be played"""
+    board_size = DEFAULT_BOARD_SIZE if board_size is None else board_size
+    ships = dict(DEFAULT_SHIPS if ships is None else ships)
+    if isinstance(board_size, bool) or not isinstance(board_size, int) or not MIN_BOARD_SIZE <= board_size <= MAX_BOARD_SIZE:
+        raise ValueError(f"Board size must be a whole number from {MIN_BOARD_SIZE} to {MAX_BOARD_SIZE}")
+    if not 1 <= len(ships) <= MAX_SHIPS:
+        raise ValueError(f"A fleet needs 1 to {MAX_SHIPS} ships")
+    for ship_id, size in ships.items():
+        if not isinstance(ship_id, str) or not SHIP_ID.match(ship_id):
+            raise ValueError(f"Ship names must be lowercase letters, digits or _ (got {ship_id!r})")
+        # bool is an int subclass, but true is not a ship length
+        if isinstance(size, bool) or not isinstance(size, int) or not 1 <= size <= board_size:
+            raise ValueError(f"Ship '{ship_id}' must be 1 to {board_size} cells long")
+    # Leave at least half the board as water
+    if 2 * sum(ships.values()) > board_size * board_size:
+        raise ValueError(f"A fleet of {sum(ships.values())} cells doesn't fit a {board_size}x{board_size} board")
+    if no_touch:
+        _check_no_touch_fit(board_size, tuple(ships.items()))
+    return board_size, ships
+
+
+@lru_cache(maxsize=256)
+def _check_no_touch_fit(board_size: int, fleet: Tuple[Tuple[str, int], ...]):
+    """Whether ships that may not touch fit depends on their shapes; placing them once tells (ValueError if not)"""
+    sample_layout(get_geometry(board_size, board_size), dict(fleet), random.Random(0), no_touch=True)
+
 
 class BattleshipGame(BaseGame):
-    def __init__(self, player1_model: str, player2_model: str):
+    # Whether ships may touch, even diagonally (a class default, so games restored from older snapshots have it too)
+    no_touch = False
+    
+    def __init__(self, player1_model: str, player2_model: str, board_size: Optional[int] = None,
+                 ships: Optional[Dict[str, int]] = None, no_touch: bool = False):
         # Set all attributes BEFORE calling parent init
-        self.board_size = 8
-        self.ships = {
-            "carrier": 4,
-            "battleship": 3,
-            "destroyer": 3,
-            "submarine": 2,
-            "patrol": 2
-        }
+        self.board_size, self.ships = validate_config(board_size, ships, no_touch)
+        self.no_touch = no_touch
+        self.geometry = get_geometry(self.board_size, self.board_size)
         
-        # Create boards BEFORE calling parent init
-        self.player1_board = [[None for _ in range(self.board_size)] for _ in range(self.board_size)]
-        self.player2_board = [[None for _ in range(self.board_size)] for _ in range(self.board_size)]
-        self.player1_shots = [[None for _ in range(self.board_size)] for _ in range(self.board_size)]
-        self.player2_shots = [[None for _ in range(self.board_size)] for _ in range(self.board_size)]
+        # Bitboards per player: cells covered by their ships, and cells they have fired at / hit
+        self.fleet = {1: 0, 2: 0}
+        self.ship_masks: Dict[int, Dict[str, int]] = {1: {}, 2: {}}
+        self.ship_at: Dict[int, Dict[int, str]] = {1: {}, 2: {}}  # cell index -> ship ID
+        self.shots = {1: 0, 2: 0}
+        self.hits = {1: 0, 2: 0}
         self.player1_ships_remaining = dict(self.ships)
         self.player2_ships_remaining = dict(self.ships)
         
-        self.ships_remaining = {1: 14, 2: 14}  # Total ship cells: 4+3+3+2+2 = 14 (updated for 8x8)
+        fleet_cells = sum(self.ships.values())
+        self.ships_remaining = {1: fleet_cells, 2: fleet_cells}
         self.ships_placed = {1: False, 2: False}
         self.placement_updates = []  # Track placement updates to send to frontend
         self.player1_model = player1_model
@@ -40,16 +93,41 @@ class BattleshipGame(BaseGame):
         
         # Now call parent constructor which will use our attributes
         super().__init__(player1_model, player2_model)
+    
+    def __getstate__(self):
+        # Geometries are shared per board shape; rebuild the link instead of pickling a copy
+        state = self.__dict__.copy()
+        state.pop("geometry", None)
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.geometry = get_geometry(self.board_size, self.board_size)
+        if "fleet" not in state:
+            self._load_grids()
+    
+    def _load_grids(self):
+        """Rebuild the bitboards of a game snapshotted before they existed (boards and shots as lists)"""
+        game_state = self.game_state
+        self.fleet, self.ship_masks, self.ship_at = {}, {}, {}
+        self.shots, self.hits = {}, {}
+        for player in (1, 2):
+            board = game_state.pop(f'player{player}_board')
+            shots = game_state.pop(f'player{player}_shots')
+            ship_ids = {cell for row in board for cell in row if cell is not None}
+            self.ship_masks[player] = {ship_id: self.geometry.from_grid(board, ship_id) for ship_id in ship_ids}
+            self.fleet[player] = self.geometry.from_grid(board)
+            self.ship_at[player] = {index: ship_id for ship_id, mask in self.ship_masks[player].items()
+                                    for index in self.geometry.indices(mask)}
+            self.shots[player] = self.geometry.from_grid(shots)
+            self.hits[player] = self.geometry.from_grid(shots, 'hit')
         
     def initialize_game(self) -> Dict:
-        """Initialize game boards and place ships"""
+        """Initialize game state (boards and shots live in the bitboards)"""
         return {
-            'player1_board': self.player1_board,
-            'player2_board': self.player2_board,
-            'player1_shots': self.player1_shots,
-            'player2_shots': self.player2_shots,
             'player1_ships_placed': False,
             'player2_ships_placed': False,
+            'board_size': self.board_size,
             'turn_count': 0,
             'last_moves': [],
             'ships_remaining': self.ships_remaining,
@@ -57,61 +135,62 @@ class BattleshipGame(BaseGame):
             'placement_updates': self.placement_updates
         }
     
-    def _create_empty_board(self):
-        return [[None for _ in range(self.board_size)] for _ in range(self.board_size)]
+    def board_grid(self, player: int) -> List[List[Optional[str]]]:
+        """A player's ships as rows of ship IDs (None for water), for the JSON protocol"""
+        return self.geometry.grid(self.ship_masks[player])
     
-    def place_ships_for_player(self, player: int, ships_data: List[Dict] = None):
-        """Place ships on the board for a player"""
-        board_key = f'player{player}_board'
-        board = self.game_state[board_key]
-        
+    def shots_grid(self, player: int) -> List[List[Optional[str]]]:
+        """A player's shots as rows of 'hit', 'miss' or None, for the JSON protocol"""
+        return self.geometry.grid({'hit': self.hits[player], 'miss': self.shots[player] & ~self.hits[player]})
+    
+    def open_cells(self, player: int) -> int:
+        """Mask of the cells `player` hasn't fired at yet"""
+        return self.geometry.full & ~self.shots[player]
+    
+    def sunk_ships(self, player: int) -> Dict[str, int]:
+        """Masks of the opponent ships `player` has sunk, by ship ID"""
+        hits = self.hits[player]
+        return {ship_id: mask for ship_id, mask in self.ship_masks[3 - player].items() if mask and not mask & ~hits}
+    
+    def recommend_target(self, player: int, rng: Optional[random.Random] = None) -> Optional[Tuple[int, int]]:
+        """(row, col) where an opponent ship most likely is, from `player`'s hits, misses and sinkings"""
+        sunk = self.sunk_ships(player)
+        afloat = [size for ship_id, size in self.ships.items() if ship_id not in sunk]
+        resolved = sum(sunk.values())
+        if self.no_touch:
+            # Nothing can lie next to a sunk ship either
+            resolved = self.geometry.halo(resolved)
+        return best_target(self.geometry, self.shots[player], self.hits[player], afloat, resolved, rng)
+    
+    def place_ships_for_player(self, player: int, ships_data: List[Dict] = None, layout: Optional[Dict[str, int]] = None):
+        """Place ships on the board for a player (from ships_data, a sampled layout, or a fresh random one)"""
         if ships_data:
             # Use provided ship placement
             for ship in ships_data:
-                self._place_ship_on_board(board, ship)
+                self._place_ship_on_board(player, ship)
         else:
-            # AI places ships randomly
-            for ship_name, ship_size in self.ships.items():
-                placed = False
-                attempts = 0
+            # AI places ships: each one drawn from the placements still legal, so none is ever left out
+            layout = layout or sample_layout(self.geometry, self.ships, no_touch=self.no_touch)
+            for ship_name, mask in layout.items():
+                row, col, orientation = ship_origin(self.geometry, mask)
+                self._add_ship(player, ship_name, mask)
                 
-                while not placed and attempts < 100:
-                    row = random.randint(0, self.board_size - 1)
-                    col = random.randint(0, self.board_size - 1)
-                    orientation = random.choice(['horizontal', 'vertical'])
-                    
-                    if self._can_place_ship(board, row, col, ship_size, orientation):
-                        ship_data = {
-                            'id': ship_name,
-                            'row': row,
-                            'col': col,
-                            'size': ship_size,
-                            'orientation': orientation
-                        }
-                        self._place_ship_on_board(board, ship_data)
-                        placed = True
-                        
-                        # Track placement update
-                        self.placement_updates.append({
-                            'player': player,
-                            'ship': ship_name,
-                            'size': ship_size,
-                            'position': {'row': row, 'col': col},
-                            'orientation': orientation
-                        })
-                    
-                    attempts += 1
+                # Track placement update
+                self.placement_updates.append({
+                    'player': player,
+                    'ship': ship_name,
+                    'size': self.ships[ship_name],
+                    'position': {'row': row, 'col': col},
+                    'orientation': orientation
+                })
         
         self.game_state[f'player{player}_ships_placed'] = True
         self.ships_placed[player] = True
     
     def place_ship(self, player: int, ship_data: Dict):
         """Place a single ship on the board"""
-        board_key = f'player{player}_board'
-        board = self.game_state[board_key]
-        
         # Place the ship on the board
-        self._place_ship_on_board(board, ship_data)
+        self._place_ship_on_board(player, ship_data)
         
         # Update placement tracking
         self.placement_updates.append({
@@ -122,78 +201,61 @@ class BattleshipGame(BaseGame):
             'orientation': ship_data['orientation']
         })
         
-        # Check if all ships are placed for this player
-        ships_on_board = 0
-        for row in board:
-            for cell in row:
-                if cell is not None:
-                    ships_on_board += 1
-        
-        # If we have placed all 14 ship cells (4+3+3+2+2), mark as complete
-        if ships_on_board == 14:
+        # If every ship cell of the fleet is on the board, mark as complete
+        if self.fleet[player].bit_count() == sum(self.ships.values()):
             self.game_state[f'player{player}_ships_placed'] = True
             self.ships_placed[player] = True
     
-    def _can_place_ship(self, board, row, col, size, orientation):
-        """Check if ship can be placed at position"""
-        if orientation == 'horizontal':
-            if col + size > self.board_size:
-                return False
-            for i in range(size):
-                if board[row][col + i] is not None:
-                    return False
-        else:
-            if row + size > self.board_size:
-                return False
-            for i in range(size):
-                if board[row + i][col] is not None:
-                    return False
-        return True
-    
-    def _place_ship_on_board(self, board, ship_data):
+    def _place_ship_on_board(self, player, ship_data):
         """Place a ship on the board"""
-        row, col = ship_data['row'], ship_data['col']
-        size = ship_data['size']
-        ship_id = ship_data['id']
-        
-        if ship_data['orientation'] == 'horizontal':
-            for i in range(size):
-                board[row][col + i] = ship_id
-        else:
-            for i in range(size):
-                board[row + i][col] = ship_id
+        mask = self.geometry.ship_mask(ship_data['row'], ship_data['col'], ship_data['size'], ship_data['orientation'])
+        if mask is None:
+            raise ValueError(f"Ship {ship_data['id']} does not fit on the board")
+        self._add_ship(player, ship_data['id'], mask)
+    
+    def _add_ship(self, player, ship_id, mask):
+        """Put a ship's cells on a player's bitboards"""
+        # A ship placed over another takes those cells from it, as writing it onto a grid would
+        for other_id, other_mask in self.ship_masks[player].items():
+            if other_mask & mask:
+                self.ship_masks[player][other_id] = other_mask & ~mask
+        self.ship_masks[player][ship_id] = self.ship_masks[player].get(ship_id, 0) | mask
+        self.fleet[player] |= mask
+        for index in self.geometry.indices(mask):
+            self.ship_at[player][index] = ship_id
     
     def make_move(self, row: int, col: int) -> Dict:
         """Process a shot at coordinates"""
         try:
-            if not (0 <= row < self.board_size and 0 <= col < self.board_size):
+            if not self.geometry.contains(row, col):
                 return {"success": False, "result": "invalid", "reason": "Coordinates out of bounds"}
-                
-            # Get boards
-            shots_key = f'player{self.current_player}_shots'
-            opponent_board_key = f'player{3-self.current_player}_board'
+            
+            player = self.current_player
+            opponent = 3 - player
+            bit = self.geometry.bit(row, col)
             
             # Check if already shot here
-            if self.game_state[shots_key][row][col] is not None:
-                return {"success": False, "result": "already_shot", "reason": f"Already shot at {chr(col + ord('A'))}{row + 1}"}
+            if self.shots[player] & bit:
+                return {"success": False, "result": "already_shot", "reason": f"Already shot at {format_coordinate(row, col)}"}
             
             # Check if hit or miss
-            target_cell = self.game_state[opponent_board_key][row][col]
-            if target_cell:
-                self.game_state[shots_key][row][col] = 'hit'
+            self.shots[player] |= bit
+            sunk = None
+            if self.fleet[opponent] & bit:
+                self.hits[player] |= bit
                 result = 'hit'
                 # Update remaining ships for the opponent
-                opponent = 3 - self.current_player
                 self.ships_remaining[opponent] -= 1
+                ship_id = self.ship_at[opponent][self.geometry.index(row, col)]
+                if not self.ship_masks[opponent][ship_id] & ~self.hits[player]:
+                    sunk = ship_id
             else:
-                self.game_state[shots_key][row][col] = 'miss'
                 result = 'miss'
             
             # Add to move history
-            col_letter = chr(col + ord('A'))
-            move_str = f"{col_letter}{row + 1}"
+            move_str = format_coordinate(row, col)
             self.game_state['last_moves'].append({
-                'player': self.current_player,
+                'player': player,
                 'move': move_str,
                 'result': result
             })
@@ -207,131 +269,95 @@ class BattleshipGame(BaseGame):
             if not self.winner:
                 self.switch_player()
             
-            return {"success": True, "result": result, "move": move_str}
+            move = {"success": True, "result": result, "move": move_str}
+            if sunk:
+                move["sunk"] = sunk
+            return move
             
         except Exception as e:
-            print(f"Error in make_move: {e}")
+            logger.error(f"Error in make_move: {e}")
             return {"success": False, "result": "error", "reason": str(e)}
     
     def check_winner(self) -> Optional[int]:
         """Check if someone has won"""
-        if self.ships_remaining[1] == 0:
-            return 2  # Player 2 wins if Player 1 has no ships left
-        elif self.ships_remaining[2] == 0:
-            return 1  # Player 1 wins if Player 2 has no ships left
+        if self.fleet[1] and not self.fleet[1] & ~self.hits[2]:
+            return 2  # Player 2 wins once every Player 1 ship cell is hit
+        elif self.fleet[2] and not self.fleet[2] & ~self.hits[1]:
+            return 1  # Player 1 wins once every Player 2 ship cell is hit
         return None
     
     def get_prompt_for_player(self, player: int) -> str:
         """Generate prompt for LLM to make a move"""
-        shots = self.game_state[f'player{player}_shots']
+        geometry = self.geometry
+        open_cells = self.open_cells(player)
         
-        # Find all available positions
-        available_positions = []
-        for i in range(self.board_size):
-            for j in range(self.board_size):
-                if shots[i][j] is None:
-                    col_letter = chr(j + ord('A'))
-                    available_positions.append(f"{col_letter}{i + 1}")
+        # The first few available positions (listing all of them would flood the prompt on big boards)
+        available_positions = [format_coordinate(*geometry.position(index)) for index in islice(geometry.indices(open_cells), 10)]
         
         # If no positions available, something is wrong
         if not available_positions:
             return "No positions available. Game should be over."
         
         # Create a simple board visualization
+        marks = {'hit': "X ", 'miss': "O ", None: ". "}
         board_str = "Your shots so far:\n"
-        board_str += "   A B C D E F G H\n"
-        for i in range(self.board_size):
-            board_str += f"{i+1:2} "
-            for j in range(self.board_size):
-                if shots[i][j] == 'hit':
-                    board_str += "X "
-                elif shots[i][j] == 'miss':
-                    board_str += "O "
-                else:
-                    board_str += ". "
-            board_str += "\n"
-        
-        # Find hits with unexplored adjacent cells for strategic targeting
-        strategic_targets = []
-        for i in range(self.board_size):
-            for j in range(self.board_size):
-                if shots[i][j] == 'hit':
-                    # Check adjacent cells
-                    for di, dj in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-                        ni, nj = i + di, j + dj
-                        if 0 <= ni < self.board_size and 0 <= nj < self.board_size:
-                            if shots[ni][nj] is None:
-                                col_letter = chr(nj + ord('A'))
-                                strategic_targets.append(f"{col_letter}{ni + 1}")
+        board_str += "   " + " ".join(column_label(col) for col in range(self.board_size)) + "\n"
+        for i, row in enumerate(self.shots_grid(player)):
+            board_str += f"{i+1:2} " + "".join(marks[cell] for cell in row) + "\n"
         
-        # Remove duplicates from strategic targets
-        strategic_targets = list(set(strategic_targets))
-        
-        # Pick a position to suggest
-        if strategic_targets:
-            suggested = strategic_targets[0]  # Suggest first strategic target
+        # Suggest the cell most likely to hold a ship given the hits, misses and sunk ships so far
+        row, col = self.recommend_target(player)
+        suggested = format_coordinate(row, col)
+        if self.geometry.bit(row, col) & geometry.neighbours(self.hits[player] & ~sum(self.sunk_ships(player).values())):
             strategy_hint = f"\nRECOMMENDED: Target {suggested} (adjacent to a hit)"
         else:
-            # No strategic targets, pick from center area first
-            center_positions = []
-            for pos in available_positions:
-                col = ord(pos[0]) - ord('A')
-                row = int(pos[1:]) - 1
-                if 2 <= row <= 5 and 2 <= col <= 5:
-                    center_positions.append(pos)
-            
-            if center_positions:
-                suggested = center_positions[0]
-                strategy_hint = f"\nRECOMMENDED: Target {suggested} (center area)"
-            else:
-                suggested = available_positions[0]
-                strategy_hint = f"\nRECOMMENDED: Target {suggested}"
+            strategy_hint = f"\nRECOMMENDED: Target {suggested} (most likely ship position)"
         
-        prompt = f"""You are playing Battleship on an 8x8 grid (A-H, 1-8).
+        size = self.board_size
+        fleet = ", ".join(f"{ship_id} ({length})" for ship_id, length in self.ships.items())
+        rules = "\nShips never touch each other, not even diagonally." if self.no_touch else ""
+        prompt = f"""You are playing Battleship on a {size}x{size} grid ({coordinate_range(size)}).
+Enemy fleet: {fleet}{rules}
 
 {board_str}
 
 Legend: X = hit, O = miss, . = not yet shot
 
-Available positions: {', '.join(available_positions[:10])}... ({len(available_positions)} total)
+Available positions: {', '.join(available_positions)}... ({open_cells.bit_count()} total)
 {strategy_hint}
 
-IMPORTANT: Reply with ONLY ONE coordinate (e.g., "A5" or "H8"). Nothing else!
+IMPORTANT: Reply with ONLY ONE coordinate (e.g., "A1" or "{format_coordinate(size - 1, size - 1)}"). Nothing else!
 Your move:"""
         
         return prompt
     
     def is_valid_move(self, move: str) -> bool:
-        """Check if move format is valid"""
-        if not move or len(move) < 2:
-            return False
-        
-        # Check format (letter + number)
-        if not move[0].isalpha() or not move[1:].isdigit():
-            return False
-            
-        col = ord(move[0].upper()) - ord('A')
-        row = int(move[1:]) - 1
-        
-        # Check bounds
-        if not (0 <= row < self.board_size and 0 <= col < self.board_size):
+        """Check if move is a coordinate on this board that hasn't been shot yet"""
+        coordinate = parse_coordinate(move, self.board_size)
+        # The whole move must be the coordinate ("C7", not "fire at C7")
+        if not coordinate or format_coordinate(*coordinate) != (move or "").strip().upper():
             return False
             
         # Check if already shot here
-        shots = self.game_state[f'player{self.current_player}_shots']
-        if shots[row][col] is not None:
+        if self.shots[self.current_player] & self.geometry.bit(*coordinate):
             return False
             
         return True
     
+    def parse_coordinate(self, text: Optional[str]) -> Optional[Tuple[int, int]]:
+        """(row, col) of the first coordinate like "C7" in a model's reply, or None if it has none on this board"""
+        return parse_coordinate(text, self.board_size)
+    
     def get_state(self) -> dict:
         """Return current game state"""
         state = {
             "board_size": self.board_size,
+            "ships": self.ships,
+            "no_touch": self.no_touch,
             "current_player": self.current_player,
             "winner": self.winner,
-            "player1_shots": self.game_state['player1_shots'],
-            "player2_shots": self.game_state['player2_shots'],
+            "player1_shots": self.shots_grid(1),
+            "player2_shots": self.shots_grid(2),
             "ships_remaining": self.ships_remaining,
             "status": self.status,
             "placement_updates": self.placement_updates,  # Include placement updates
@@ -340,7 +366,7 @@ Your move:"""
         
         # Include ship positions only during placement phase or if game is over
         if self.status == "placement" or self.winner:
-            state["player1_ships"] = self.game_state['player1_board']
-            state["player2_ships"] = self.game_state['player2_board']
+            state["player1_ships"] = self.board_grid(1)
+            state["player2_ships"] = self.board_grid(2)
         
         return state 
\ No newline at end of file
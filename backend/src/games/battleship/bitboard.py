@@ -0,0 +1,114 @@
+"""
+Battleship bitboards
+A board is one Python int per layer (ships, shots, hits), with cell (row, col) at bit
+row * cols + col. Set operations on whole boards are single integer ops: open cells are
+`full & ~shots`, a player is sunk when `ships & ~hits == 0`, and the cells next to any hit are
+four shifts. Grids of lists are only built for the JSON protocol.
+"""
+
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class Geometry:
+    """Bit layout and precomputed edge masks for one board shape"""
+
+    def __init__(self, rows: int, cols: int):
+        self.rows = rows
+        self.cols = cols
+        self.cells = rows * cols
+        self.full = (1 << self.cells) - 1
+        first_col = sum(1 << (row * cols) for row in range(rows))
+        self.first_col = first_col
+        self.last_col = first_col << (cols - 1)
+        # Cells whose row + col is even; every ship of length 2+ covers at least one of each colour
+        self.even = sum(1 << (row * cols + col) for row in range(rows) for col in range(cols) if (row + col) % 2 == 0)
+        self._placements: Dict[int, List[int]] = {}
+
+    def index(self, row: int, col: int) -> int:
+        return row * self.cols + col
+
+    def position(self, index: int) -> Tuple[int, int]:
+        return divmod(index, self.cols)
+
+    def bit(self, row: int, col: int) -> int:
+        return 1 << (row * self.cols + col)
+
+    def contains(self, row: int, col: int) -> bool:
+        return 0 <= row < self.rows and 0 <= col < self.cols
+
+    def shift(self, mask: int, dr: int, dc: int) -> int:
+        """`mask` moved one cell by (dr, dc), dropping the cells pushed off the board"""
+        if dc == 1:
+            mask = (mask << 1) & ~self.first_col
+        elif dc == -1:
+            mask = (mask >> 1) & ~self.last_col
+        if dr == 1:
+            mask <<= self.cols
+        elif dr == -1:
+            mask >>= self.cols
+        return mask & self.full
+
+    def neighbours(self, mask: int) -> int:
+        """Cells orthogonally next to any cell of `mask` (not including `mask` itself)"""
+        spread = (self.shift(mask, 0, 1) | self.shift(mask, 0, -1) | self.shift(mask, 1, 0) | self.shift(mask, -1, 0))
+        return spread & ~mask
+
+    def halo(self, mask: int) -> int:
+        """`mask` plus every cell touching it, diagonals included"""
+        wide = mask | self.shift(mask, 0, 1) | self.shift(mask, 0, -1)
+        return wide | self.shift(wide, 1, 0) | self.shift(wide, -1, 0)
+
+    def ship_mask(self, row: int, col: int, size: int, orientation: str) -> Optional[int]:
+        """Cells a ship covers from (row, col) going right ("horizontal") or down, or None if it leaves the board"""
+        if orientation == "horizontal":
+            if not (0 <= row < self.rows and 0 <= col and col + size <= self.cols):
+                return None
+            return ((1 << size) - 1) << self.index(row, col)
+        if not (0 <= col < self.cols and 0 <= row and row + size <= self.rows):
+            return None
+        start = self.index(row, col)
+        return sum(1 << (start + i * self.cols) for i in range(size))
+
+    def placements(self, size: int) -> List[int]:
+        """Masks of every way a ship of `size` fits on the empty board, built once per size"""
+        if size not in self._placements:
+            self._placements[size] = [
+                mask for row in range(self.rows) for col in range(self.cols)
+                for orientation in (("horizontal", "vertical") if size > 1 else ("horizontal",))
+                if (mask := self.ship_mask(row, col, size, orientation)) is not None
+            ]
+        return self._placements[size]
+
+    @staticmethod
+    def indices(mask: int) -> Iterator[int]:
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def positions(self, mask: int) -> List[Tuple[int, int]]:
+        return [divmod(index, self.cols) for index in self.indices(mask)]
+
+    def grid(self, layers: Dict[object, int]) -> List[List[Optional[object]]]:
+        """List-of-rows view: each cell holds the value of the first layer whose mask covers it, else None"""
+        cells: List[Optional[object]] = [None] * self.cells
+        for value, mask in layers.items():
+            for index in self.indices(mask):
+                if cells[index] is None:
+                    cells[index] = value
+        return [cells[row * self.cols:(row + 1) * self.cols] for row in range(self.rows)]
+
+    def from_grid(self, grid: List[List[Optional[object]]], value: object = None) -> int:
+        """Mask of the cells equal to `value` (or, with no value, of every non-empty cell)"""
+        mask = 0
+        for row, cells in enumerate(grid):
+            for col, cell in enumerate(cells):
+                if (cell == value) if value is not None else (cell is not None):
+                    mask |= self.bit(row, col)
+        return mask
+
+
+@lru_cache(maxsize=None)
+def get_geometry(rows: int, cols: int) -> Geometry:
+    return Geometry(rows, cols)
@@ -0,0 +1,83 @@
+"""
+Battleship strategy bots
+Built-in opponents for simulations: each bot sees only its own shots and which of them hit (as
+bitboards, see bitboard.py), exactly what a model is shown, and picks the next cell to fire at.
+"""
+
+import random
+from typing import Dict, Optional, Tuple
+
+from src.games.battleship.bitboard import get_geometry
+from src.games.battleship.targeting import best_target
+
+Cell = Tuple[int, int]
+
+NEIGHBOURS = ((0, 1), (0, -1), (1, 0), (-1, 0))
+
+
+class BattleshipBot:
+    name = "base"
+
+    def __init__(self, board_size: int, ships: Dict[str, int], rng: Optional[random.Random] = None):
+        self.board_size = board_size
+        self.geometry = get_geometry(board_size, board_size)
+        self.ship_sizes = sorted(ships.values(), reverse=True)
+        self.rng = rng or random.Random()
+
+    def choose(self, shots: int, hits: int) -> Cell:
+        raise NotImplementedError
+
+    def open_cells(self, shots: int) -> int:
+        return self.geometry.full & ~shots
+
+    def targets(self, shots: int, hits: int) -> int:
+        """Unshot cells next to a hit, those in line with two hits first"""
+        geometry = self.geometry
+        open_cells = self.open_cells(shots)
+        inline = 0
+        for dr, dc in NEIGHBOURS:
+            # Cells whose next cell and the one after it in this direction are both hits
+            behind_one = geometry.shift(hits, -dr, -dc)
+            inline |= behind_one & geometry.shift(behind_one, -dr, -dc)
+        return (inline & open_cells) or (geometry.neighbours(hits) & open_cells)
+
+    def pick(self, mask: int) -> Cell:
+        return self.rng.choice(self.geometry.positions(mask))
+
+
+class RandomBot(BattleshipBot):
+    """Fires at a random unshot cell"""
+    name = "random"
+
+    def choose(self, shots: int, hits: int) -> Cell:
+        return self.pick(self.open_cells(shots))
+
+
+class HuntTargetBot(BattleshipBot):
+    """Hunts on a checkerboard (every ship covers one of its cells) and finishes off hits"""
+    name = "hunt_target"
+
+    def choose(self, shots: int, hits: int) -> Cell:
+        targets = self.targets(shots, hits)
+        if targets:
+            return self.pick(targets)
+        open_cells = self.open_cells(shots)
+        return self.pick((open_cells & self.geometry.even) or open_cells)
+
+
+class ProbabilityBot(BattleshipBot):
+    """Fires where the most ship placements consistent with the misses (and through the hits) overlap"""
+    name = "probability"
+
+    def choose(self, shots: int, hits: int) -> Cell:
+        # Sinkings aren't part of what a bot is shown, so every ship counts as afloat
+        return best_target(self.geometry, shots, hits, self.ship_sizes, rng=self.rng)
+
+
+BOTS = {bot.name: bot for bot in (RandomBot, HuntTargetBot, ProbabilityBot)}
+
+
+def create_bot(name: str, board_size: int, ships: Dict[str, int], rng: Optional[random.Random] = None) -> BattleshipBot:
+    if name not in BOTS:
+        raise ValueError(f"Unknown battleship bot '{name}' (expected one of: {', '.join(BOTS)})")
+    return BOTS[name](board_size, ships, rng)
@@ -0,0 +1,47 @@
+"""
+Battleship coordinates
+A cell is named by its column letter and 1-based row ("C7", "Z26"), so boards go up to 26
+columns. The pattern that finds a coordinate in a model's reply is generated per board size and
+only matches cells on that board.
+"""
+
+import random
+import re
+from functools import lru_cache
+from typing import Optional, Tuple
+
+DEFAULT_BOARD_SIZE = 8
+MAX_BOARD_SIZE = 26
+
+
+def column_label(col: int) -> str:
+    return chr(ord('A') + col)
+
+
+def format_coordinate(row: int, col: int) -> str:
+    return f"{column_label(col)}{row + 1}"
+
+
+def coordinate_range(board_size: int) -> str:
+    """e.g. "A-H, 1-8" """
+    return f"A-{column_label(board_size - 1)}, 1-{board_size}"
+
+
+@lru_cache(maxsize=None)
+def coordinate_pattern(board_size: int) -> re.Pattern:
+    """A coordinate on a `board_size` board, not part of a longer word or number ("B12" never reads as "B1")"""
+    rows = "|".join(str(row) for row in range(board_size, 0, -1))
+    return re.compile(rf"(?<![A-Z0-9])([A-{column_label(board_size - 1)}])({rows})(?![0-9])", re.IGNORECASE)
+
+
+def parse_coordinate(text: Optional[str], board_size: int) -> Optional[Tuple[int, int]]:
+    """(row, col) of the first coordinate on the board in `text`, or None"""
+    match = coordinate_pattern(board_size).search(text or "")
+    if not match:
+        return None
+    return int(match.group(2)) - 1, ord(match.group(1).upper()) - ord('A')
+
+
+def random_coordinate(board_size: int, rng: Optional[random.Random] = None) -> str:
+    rng = rng or random
+    return format_coordinate(rng.randrange(board_size), rng.randrange(board_size))
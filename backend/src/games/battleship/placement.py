@@ -0,0 +1,73 @@
+"""
+Battleship fleet placement
+Every way a ship can lie on the board is precomputed as a bitboard (Geometry.placements), so
+placing a fleet never guesses: each ship, largest first, is drawn uniformly from the placements
+that are still legal (not overlapping, and with the no-touch rule not even diagonally next to, a
+ship already placed). That is one filter and one draw per ship. If a draw leaves a later ship no
+room, the draw is undone and another placement tried, and a fleet that can't be placed at all is
+an error rather than a ship silently missing.
+"""
+
+import random
+from typing import Dict, List, Optional, Tuple
+
+from src.games.battleship.bitboard import Geometry
+
+# Draws undone before a fleet is declared impossible to place
+MAX_BACKTRACKS = 1000
+
+
+def blocked_by(geometry: Geometry, mask: int, no_touch: bool = False) -> int:
+    """Cells a placed ship takes away from the ships placed after it"""
+    return geometry.halo(mask) if no_touch else mask
+
+
+def sample_layout(geometry: Geometry, ships: Dict[str, int], rng: Optional[random.Random] = None,
+                  no_touch: bool = False) -> Dict[str, int]:
+    """Ship ID -> placement mask for the whole fleet; ValueError if the fleet can't be placed"""
+    rng = rng or random
+    # Largest first: they have the fewest options, and placing them last is what causes dead ends
+    order = sorted(ships, key=lambda ship_id: -ships[ship_id])
+    # Per ship placed so far: (its placements not tried yet, cells blocked before it)
+    stack: List[Tuple[List[int], int]] = []
+    layout: Dict[str, int] = {}
+    blocked = 0
+    options: Optional[List[int]] = None
+    backtracks = 0
+    while len(layout) < len(order):
+        ship_id = order[len(layout)]
+        if options is None:
+            options = [mask for mask in geometry.placements(ships[ship_id]) if not mask & blocked]
+        if not options:
+            if not stack or backtracks >= MAX_BACKTRACKS:
+                raise ValueError(f"The fleet doesn't fit a {geometry.rows}x{geometry.cols} board"
+                                 + (" with ships not touching" if no_touch else ""))
+            backtracks += 1
+            options, blocked = stack.pop()
+            layout.popitem()
+            continue
+        # Draw without replacement, so a retry after backtracking picks a different placement
+        index = rng.randrange(len(options))
+        mask = options[index]
+        options[index] = options[-1]
+        options.pop()
+        stack.append((options, blocked))
+        layout[ship_id] = mask
+        blocked |= blocked_by(geometry, mask, no_touch)
+        options = None
+    return {ship_id: layout[ship_id] for ship_id in ships}
+
+
+def sample_layouts(geometry: Geometry, ships: Dict[str, int], count: int, rng: Optional[random.Random] = None,
+                   no_touch: bool = False) -> List[Dict[str, int]]:
+    """`count` independent fleet layouts, e.g. both boards of a game or a batch of simulated games"""
+    rng = rng or random
+    return [sample_layout(geometry, ships, rng, no_touch) for _ in range(count)]
+
+
+def ship_origin(geometry: Geometry, mask: int) -> Tuple[int, int, str]:
+    """(row, col, orientation) of the top-left end of a placed ship"""
+    start = (mask & -mask).bit_length() - 1
+    row, col = geometry.position(start)
+    horizontal = mask.bit_count() == 1 or bool(mask >> (start + 1) & 1)
+    return row, col, "horizontal" if horizontal else "vertical"
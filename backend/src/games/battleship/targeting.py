@@ -0,0 +1,76 @@
+"""
+Battleship targeting
+Probability density over an opponent's board from what the shooter has seen: every placement of
+every ship still afloat that doesn't cross a miss or a sunk ship adds its weight to the cells it
+covers, weighted up for each unresolved hit it runs through. The densest unshot cell is where a
+ship most likely is. Placements are kept as a table of cell indices per ship size, so a whole
+density is a gather and a bincount per size. numpy is imported on first use to keep server startup fast.
+"""
+
+import random
+from collections import Counter
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterable, Optional, Tuple
+
+from src.games.battleship.bitboard import Geometry
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Extra weight per unresolved hit a placement covers; high enough that finishing a damaged ship
+# always beats hunting for a new one
+HIT_WEIGHT = 20
+
+
+def to_vector(geometry: Geometry, mask: int) -> "np.ndarray":
+    """0/1 vector over the board's cells for a bitboard"""
+    import numpy as np
+    raw = np.frombuffer(mask.to_bytes((geometry.cells + 7) // 8, "little"), dtype=np.uint8)
+    return np.unpackbits(raw, bitorder="little")[:geometry.cells]
+
+
+@lru_cache(maxsize=None)
+def placement_cells(geometry: Geometry, size: int) -> "np.ndarray":
+    """One row per placement of a ship of `size` on the empty board, holding the indices of its cells"""
+    import numpy as np
+    cells = np.array([list(geometry.indices(mask)) for mask in geometry.placements(size)], dtype=np.intp)
+    cells = cells.reshape(-1, size)
+    cells.setflags(write=False)
+    return cells
+
+
+def density(geometry: Geometry, shots: int, hits: int, ship_sizes: Iterable[int], resolved: int = 0) -> "np.ndarray":
+    """Weight of each cell (zero for cells already shot); `resolved` holds cells no ship afloat can use (sunk ships)"""
+    import numpy as np
+    blocked = to_vector(geometry, (shots & ~hits) | resolved).astype(bool)
+    unresolved = to_vector(geometry, hits & ~resolved)
+    total = np.zeros(geometry.cells, dtype=np.float64)
+    for size, count in Counter(ship_sizes).items():
+        cells = placement_cells(geometry, size)
+        if not len(cells):
+            continue
+        weights = np.power(float(HIT_WEIGHT), unresolved[cells].sum(axis=1))
+        weights[blocked[cells].any(axis=1)] = 0.0
+        total += count * np.bincount(cells.ravel(), weights=np.repeat(weights, size), minlength=geometry.cells)
+    total[to_vector(geometry, shots).astype(bool)] = 0.0
+    return total
+
+
+def best_target(geometry: Geometry, shots: int, hits: int, ship_sizes: Iterable[int], resolved: int = 0,
+                rng: Optional[random.Random] = None) -> Optional[Tuple[int, int]]:
+    """(row, col) of the densest unshot cell, or None once every cell has been shot
+
+    Ties go to the first cell, or to a random one of them with `rng`. If no placement is left
+    (a fleet that doesn't match the board), any unshot cell will do.
+    """
+    open_cells = geometry.full & ~shots
+    if not open_cells:
+        return None
+    weights = density(geometry, shots, hits, ship_sizes, resolved)
+    best = weights.max()
+    if best > 0:
+        candidates = (weights == best).nonzero()[0].tolist()
+    else:
+        candidates = list(geometry.indices(open_cells))
+    index = rng.choice(candidates) if rng else candidates[0]
+    return geometry.position(index)
@@ -5,14 +5,14 @@ Integrates with the main server for AI debates
 
 import asyncio
 import json
-import logging
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 from enum import Enum
 
 from ...utils.common import BaseGame, LLMClient
+from ...utils.log import get_logger
 
-logger = logging.getLogger(__name__)
+logger = get_logger("debate")
 
 # Define GameStatus enum since it's not in common.py
 class GameStatus(Enum):
@@ -50,11 +50,21 @@ class DebateGame(BaseGame):
         self.current_position = "PRO"  # PRO starts first
         self.judgment = None
         self.debate_finished = False
-        self.websocket = None  # Will be set by server
+        self.publish = None  # Async callable set by server; fans events out to every viewer
+        self.should_pause = None  # Callable set by server; True when the loop should stop at the next turn
+        self.on_judged = None  # Async callable set by server; called with the winning player (1, 2, or None for a tie)
         self.status = GameStatus.WAITING
         
         logger.info(f"Created debate game {game_id}")
     
+    def __getstate__(self):
+        # The server's callbacks are re-attached after a snapshot is restored
+        state = self.__dict__.copy()
+        state["publish"] = None
+        state["should_pause"] = None
+        state["on_judged"] = None
+        return state
+    
     def initialize_game(self) -> Dict[str, Any]:
         """Initialize the game state (required by BaseGame)"""
         return {
@@ -99,32 +109,32 @@ class DebateGame(BaseGame):
             "judge_model": self.judge_model
         })
         
-        # Start the debate loop
-        asyncio.create_task(self.run_debate())
+        # The caller starts run_debate() as the match's single loop task
     
     async def run_debate(self):
         """Run the automatic debate"""
+        # Resume after the last recorded argument, so a restored debate never regenerates one
+        self.current_round = len(self.arguments) // 2
+        self.current_position = "PRO" if len(self.arguments) % 2 == 0 else "CON"
         try:
             while self.current_round < self.max_rounds and self.status == GameStatus.IN_PROGRESS:
-                # Generate argument for current position
-                await self.generate_argument()
-                
-                # Wait longer between arguments to allow speech to complete
-                await asyncio.sleep(5)  # Increased from 2 to 5 seconds
+                if self.should_pause and self.should_pause():
+                    logger.info(f"Pausing debate {self.game_id} at round {self.current_round + 1}")
+                    return
                 
-                # Switch positions
-                self.current_position = "CON" if self.current_position == "PRO" else "PRO"
+                await self.take_turn()
                 
-                # Increment round after both have spoken
-                if self.current_position == "PRO":
-                    self.current_round += 1
+                # Wait longer between arguments to allow speech to complete
+                await self.pacing.pause(5)
             
             # Debate finished
             self.debate_finished = True
             await self.broadcast_state({"type": "debate_finished"})
             
             # Judge the debate
-            await asyncio.sleep(3)
+            await self.pacing.pause(3)
+            if self.should_pause and self.should_pause():
+                return  # judged once the restored debate resumes
             await self.judge_debate()
             
         except Exception as e:
@@ -134,6 +144,17 @@ class DebateGame(BaseGame):
                 "message": str(e)
             })
     
+    async def take_turn(self):
+        """Generate the current side's argument, then hand the floor to the other side"""
+        await self.generate_argument()
+        
+        # Switch positions
+        self.current_position = "CON" if self.current_position == "PRO" else "PRO"
+        
+        # Increment round after both have spoken
+        if self.current_position == "PRO":
+            self.current_round += 1
+    
     async def generate_argument(self):
         """Generate an argument for the current position"""
         try:
@@ -143,9 +164,8 @@ class DebateGame(BaseGame):
             # Build prompt
             prompt = self._build_argument_prompt(self.current_position)
             
-            # Get LLM response
-            llm_client = LLMClient(current_model)
-            response = llm_client.get_response(prompt, max_tokens=80)
+            # Get LLM response (the client blocks on the provider, so keep it off the event loop)
+            response = await asyncio.to_thread(lambda: LLMClient(current_model).get_response(prompt, max_tokens=80))
             
             if not response:
                 raise Exception("Failed to get response from LLM")
@@ -252,8 +272,7 @@ Respond with this JSON format:
 }}"""
             
             # Get judgment
-            judge_client = LLMClient(self.judge_model)
-            response = judge_client.get_response(judge_prompt, max_tokens=500)
+            response = await asyncio.to_thread(lambda: LLMClient(self.judge_model).get_response(judge_prompt, max_tokens=500))
             
             if not response:
                 raise Exception("Failed to get judgment from LLM")
@@ -290,6 +309,8 @@ Respond with this JSON format:
                 })
                 
                 logger.info(f"Debate judged: {judgment_data['winner']} wins")
+                if self.on_judged:
+                    await self.on_judged({"PRO": 1, "CON": 2}.get(judgment_data.get("winner")))
                 
             except json.JSONDecodeError as e:
                 logger.error(f"Failed to parse judgment: {e}")
@@ -348,9 +369,9 @@ Respond with this JSON format:
         }
 
     async def broadcast_state(self, data: Dict[str, Any]):
-        """Broadcast state update via WebSocket"""
-        if self.websocket:
+        """Broadcast state update to every subscribed viewer"""
+        if self.publish:
             try:
-                await self.websocket.send_json(data)
+                await self.publish(data)
             except Exception as e:
                 logger.error(f"Error broadcasting state: {e}") 
\ No newline at end of file
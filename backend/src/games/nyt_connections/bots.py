@@ -0,0 +1,91 @@
+"""
+Connections solver bots
+Built-in players for simulations. A bot is handed the words still on its board and the guesses
+it already got wrong, and returns four words.
+"""
+
+import random
+from collections import Counter
+from itertools import combinations
+from typing import Dict, List, Optional, Tuple
+
+from src.games.nyt_connections.connections_game import load_puzzles
+
+_pairs: Optional[Counter] = None
+
+
+def pair_counts() -> Counter:
+    """How often each pair of words shares a group across the whole puzzle archive, built once"""
+    global _pairs
+    if _pairs is None:
+        _pairs = Counter()
+        for puzzle in load_puzzles():
+            for group in puzzle["answers"]:
+                members = sorted(word.upper() for word in group["members"])
+                _pairs.update(combinations(members, 2))
+    return _pairs
+
+
+class ConnectionsBot:
+    name = "base"
+
+    def __init__(self, puzzle: Dict, rng: Optional[random.Random] = None):
+        self.puzzle = puzzle
+        self.rng = rng or random.Random()
+
+    def choose(self, remaining: List[str], incorrect: List[List[str]]) -> List[str]:
+        raise NotImplementedError
+
+    @staticmethod
+    def untried(guesses, incorrect: List[List[str]]) -> List[Tuple[str, ...]]:
+        tried = {frozenset(word.upper() for word in guess) for guess in incorrect}
+        return [tuple(guess) for guess in guesses if frozenset(guess) not in tried]
+
+
+class RandomBot(ConnectionsBot):
+    """Guesses four random words it hasn't already tried together"""
+    name = "random"
+
+    def choose(self, remaining: List[str], incorrect: List[List[str]]) -> List[str]:
+        for _ in range(100):
+            guess = self.rng.sample(remaining, 4)
+            if self.untried([guess], incorrect):
+                return guess
+        return self.rng.sample(remaining, 4)
+
+
+class SolverBot(ConnectionsBot):
+    """Guesses the four words that most often shared a group in other puzzles
+
+    The puzzle being played is left out of the counts, so the bot never knows its answers.
+    """
+    name = "solver"
+
+    def __init__(self, puzzle: Dict, rng: Optional[random.Random] = None):
+        super().__init__(puzzle, rng)
+        self.own_pairs = Counter()
+        for group in puzzle["answers"]:
+            self.own_pairs.update(combinations(sorted(word.upper() for word in group["members"]), 2))
+
+    def affinity(self, first: str, second: str) -> int:
+        pair = (first, second) if first < second else (second, first)
+        return pair_counts()[pair] - self.own_pairs[pair]
+
+    def choose(self, remaining: List[str], incorrect: List[List[str]]) -> List[str]:
+        words = sorted(word.upper() for word in remaining)
+        options = self.untried(combinations(words, 4), incorrect)
+        if not options:
+            return self.rng.sample(remaining, 4)
+        affinities = {(a, b): self.affinity(a, b) for a, b in combinations(words, 2)}
+        scores = {option: sum(affinities[pair] for pair in combinations(option, 2)) for option in options}
+        best = max(scores.values())
+        return list(self.rng.choice([option for option, score in scores.items() if score == best]))
+
+
+BOTS = {bot.name: bot for bot in (RandomBot, SolverBot)}
+
+
+def create_bot(name: str, puzzle: Dict, rng: Optional[random.Random] = None) -> ConnectionsBot:
+    if name not in BOTS:
+        raise ValueError(f"Unknown Connections bot '{name}' (expected one of: {', '.join(BOTS)})")
+    return BOTS[name](puzzle, rng)
@@ -7,11 +7,25 @@ import random
 import os
 from typing import Dict, List, Optional, Set
 from src.utils.common import LLMClient
+from src.utils.log import get_logger
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+logger = get_logger("connections")
+
+_puzzles: Optional[List[Dict]] = None
+
+def load_puzzles() -> List[Dict]:
+    """Every puzzle from connections_all.json, read once and kept in memory"""
+    global _puzzles
+    if _puzzles is None:
+        json_path = os.path.join(os.path.dirname(__file__), 'connections_all.json')
+        with open(json_path, 'r') as f:
+            _puzzles = json.load(f)
+    return _puzzles
+
 class ConnectionsGame:
     def __init__(self, puzzle_data: Optional[Dict] = None):
         """Initialize a new Connections game"""
@@ -19,11 +33,7 @@ class ConnectionsGame:
         if puzzle_data:
             self.puzzle = puzzle_data
         else:
-            # Load from JSON file
-            json_path = os.path.join(os.path.dirname(__file__), 'connections_all.json')
-            with open(json_path, 'r') as f:
-                connections_data = json.load(f)
-            self.puzzle = random.choice(connections_data)
+            self.puzzle = random.choice(load_puzzles())
         
         # Initialize game state
         self.id = self.puzzle['id']
@@ -312,13 +322,13 @@ WORD1, WORD2, WORD3, WORD4"""
                 return valid_parts
             else:
                 # If we don't have enough valid words, try a fallback strategy
-                print(f"[Warning] {model_id} gave incomplete guess: {parts}")
+                logger.warning(f"{model_id} gave incomplete guess: {parts}")
                 
                 # Fallback: use smart guessing strategy
                 return self._get_smart_guess()
                 
         except Exception as e:
-            print(f"Error getting AI guess from {model_id}: {e}")
+            logger.error(f"Error getting AI guess from {model_id}: {e}")
             # Fallback strategy on error
             return self._get_smart_guess()
     
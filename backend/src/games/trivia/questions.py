@@ -6,7 +6,11 @@ Loads questions from JSON file and provides random selection
 import json
 import random
 import os
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+from src.utils.log import get_logger
+
+logger = get_logger("trivia")
 
 def load_trivia_questions() -> List[Dict]:
     """Load trivia questions from JSON file"""
@@ -45,37 +49,56 @@ def load_trivia_questions() -> List[Dict]:
         return converted_questions
         
     except FileNotFoundError:
-        print(f"Warning: trivia_questions.json not found at {json_file_path}")
+        logger.warning(f"trivia_questions.json not found at {json_file_path}")
         return []
     except Exception as e:
-        print(f"Error loading trivia questions: {e}")
+        logger.error(f"Error loading trivia questions: {e}")
         return []
 
-# Load all questions from JSON
-ALL_TRIVIA_QUESTIONS = load_trivia_questions()
+_question_bank: Optional[List[Dict]] = None
+
+def get_question_bank() -> List[Dict]:
+    """The full question bank, read from JSON the first time it is needed"""
+    global _question_bank
+    if not _question_bank:
+        # An empty result (missing or bad file) isn't cached, so the next caller tries again
+        _question_bank = load_trivia_questions()
+    return _question_bank
 
 def get_random_questions(count: int = 20) -> List[Dict]:
     """Get a random selection of questions from the full question bank"""
-    if not ALL_TRIVIA_QUESTIONS:
-        print("Warning: No questions loaded, returning empty list")
+    questions = get_question_bank()
+    if not questions:
+        logger.warning("No questions loaded, returning empty list")
         return []
     
-    if count >= len(ALL_TRIVIA_QUESTIONS):
+    if count >= len(questions):
         # If asking for more questions than available, return all questions shuffled
-        questions = ALL_TRIVIA_QUESTIONS.copy()
+        questions = questions.copy()
         random.shuffle(questions)
         return questions
     
     # Return random sample of requested count
-    return random.sample(ALL_TRIVIA_QUESTIONS, count)
+    return random.sample(questions, count)
 
 def get_questions_by_category(category: str) -> List[Dict]:
     """Get questions filtered by category"""
-    return [q for q in ALL_TRIVIA_QUESTIONS if q["category"].lower() == category.lower()]
+    return [q for q in get_question_bank() if q["category"].lower() == category.lower()]
 
 def get_all_categories() -> List[str]:
     """Get all available categories"""
-    return list(set(q["category"] for q in ALL_TRIVIA_QUESTIONS))
+    return list(set(q["category"] for q in get_question_bank()))
+
+_default_questions: Optional[List[Dict]] = None
 
-# For backwards compatibility, expose the questions
-TRIVIA_QUESTIONS = get_random_questions(20)  # Default 20 random questions 
\ No newline at end of file
+def __getattr__(name: str):
+    """Build the old module-level constants on first access instead of at import"""
+    global _default_questions
+    if name == "ALL_TRIVIA_QUESTIONS":
+        return get_question_bank()
+    if name == "TRIVIA_QUESTIONS":
+        # For backwards compatibility, expose a default set of 20 random questions
+        if _default_questions is None:
+            _default_questions = get_random_questions(20)
+        return _default_questions
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -10,7 +10,14 @@ from typing import Dict, Any, List, Optional, Set
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.utils.common import BaseGame, LLMClient
+from src.utils.common import BaseGame, LLMClient, response_tokens
+from src.utils.log import get_logger
+from src.utils.metrics import LLMCall, track_llm_call
+
+logger = get_logger("trivia")
+
+# Seconds a player sits out after a wrong answer, at live pacing
+WRONG_ANSWER_COOLDOWN = 1.0
 
 class TriviaGame(BaseGame):
     """Trivia game where two LLMs compete answering questions"""
@@ -75,6 +82,17 @@ class TriviaGame(BaseGame):
     
     async def ask_question_to_player(self, player: int) -> Dict[str, Any]:
         """Ask current question to a specific player"""
+        turn = self.prepare_turn(player)
+        if "error" in turn:
+            return turn
+        response, response_time = await self.ask_model(turn)
+        return self.record_answer(turn, response, response_time)
+    
+    def prepare_turn(self, player: int) -> Dict[str, Any]:
+        """Read what `player` should be asked now, or {"error": ...} if they can't answer yet
+        
+        Split from the model call so a caller can ask the model without holding the game state.
+        """
         current_time = time.time()
         
         # Check if player is still in cooldown
@@ -110,9 +128,25 @@ class TriviaGame(BaseGame):
         # Get the appropriate model
         model = self.player1 if player == 1 else self.player2
         
-        # Time and get response from the model
-        start_time = time.time()
-        response, response_time = await self._get_model_response(model, prompt)
+        return {
+            "player": player,
+            "question": current_question,
+            "question_index": question_index,
+            "wrong_answers": set(wrong_answers),
+            "prompt": prompt,
+            "model": model
+        }
+    
+    async def ask_model(self, turn: Dict[str, Any]) -> tuple:
+        """Ask a prepared turn's model its question; returns (response, seconds taken)"""
+        return await self._get_model_response(turn["model"], turn["prompt"])
+    
+    def record_answer(self, turn: Dict[str, Any], response: str, response_time: float) -> Dict[str, Any]:
+        """Score a prepared turn's answer and advance the player's state"""
+        player = turn["player"]
+        current_question = turn["question"]
+        question_index = turn["question_index"]
+        wrong_answers = turn["wrong_answers"]
         
         # Evaluate answer
         correct_answer = current_question["correct_answer"].lower().strip()
@@ -159,7 +193,7 @@ class TriviaGame(BaseGame):
                     self.player1_wrong_answers[question_index] = set()
                 self.player1_wrong_answers[question_index].add(self._normalize_choice(response))
                 # Apply 1 second cooldown
-                self.player1_cooldown_until = time.time() + 1.0
+                self.player1_cooldown_until = time.time() + self.pacing.seconds(WRONG_ANSWER_COOLDOWN)
                 response_data["cooldown_applied"] = True
                 response_data["cooldown_until"] = self.player1_cooldown_until
             else:
@@ -169,7 +203,7 @@ class TriviaGame(BaseGame):
                     self.player2_wrong_answers[question_index] = set()
                 self.player2_wrong_answers[question_index].add(self._normalize_choice(response))
                 # Apply 1 second cooldown
-                self.player2_cooldown_until = time.time() + 1.0
+                self.player2_cooldown_until = time.time() + self.pacing.seconds(WRONG_ANSWER_COOLDOWN)
                 response_data["cooldown_applied"] = True
                 response_data["cooldown_until"] = self.player2_cooldown_until
         
@@ -193,15 +227,19 @@ class TriviaGame(BaseGame):
         """Get response from a model with timing"""
         start_time = time.time()
         try:
-            response = await self._query_model(model, prompt)
+            with track_llm_call(model.model_type) as call:
+                response = await self._query_model(model, prompt, call)
+                # _query_model reports API failures as text rather than raising
+                if response.startswith(("Error", "API Error", "OpenAI Error", "Unsupported")):
+                    call.fail()
             end_time = time.time()
             return response, end_time - start_time
         except Exception as e:
             end_time = time.time()
             return f"Error: {str(e)}", end_time - start_time
     
-    async def _query_model(self, model: LLMClient, prompt: str) -> str:
-        """Query a specific model based on its type"""
+    async def _query_model(self, model: LLMClient, prompt: str, call: Optional[LLMCall] = None) -> str:
+        """Query a specific model based on its type (token usage is reported to `call`)"""
         try:
             if model.model_type == "OPENAI":
                 # Use asyncio.to_thread to run sync method in thread pool
@@ -217,11 +255,11 @@ class TriviaGame(BaseGame):
                             max_tokens=50,
                             temperature=0.1
                         )
+                        if call:
+                            call.tokens(*response_tokens(response))
                         return response.choices[0].message.content.strip()
                     except Exception as e:
-                        import traceback
-                        print(f"OpenAI call error: {e}")
-                        traceback.print_exc()
+                        logger.exception(f"OpenAI call error: {e}")
                         return f"OpenAI Error: {str(e)}"
                 
                 return await asyncio.to_thread(openai_call)
@@ -251,6 +289,8 @@ class TriviaGame(BaseGame):
                             }
                         )
                         result = response.json()
+                        if call:
+                            call.tokens(*response_tokens(result))
                         if "content" in result and result["content"]:
                             return result["content"][0]["text"]
                         else:
@@ -267,6 +307,8 @@ class TriviaGame(BaseGame):
                     response = model_instance.generate_content(
                         f"System: You are competing in a trivia contest. Give short, direct answers only. Do not explain your reasoning.\n\nUser: {prompt}"
                     )
+                    if call:
+                        call.tokens(*response_tokens(response))
                     return response.text.strip()
                 
                 return await asyncio.to_thread(gemini_call)
@@ -284,6 +326,8 @@ class TriviaGame(BaseGame):
                         max_tokens=50,
                         temperature=0.1
                     )
+                    if call:
+                        call.tokens(*response_tokens(response))
                     return response.choices[0].message.content.strip()
                 
                 return await asyncio.to_thread(groq_call)
@@ -292,9 +336,7 @@ class TriviaGame(BaseGame):
                 return "Unsupported model type"
                 
         except Exception as e:
-            import traceback
-            print(f"_query_model error for {model.model_type}: {e}")
-            traceback.print_exc()
+            logger.exception(f"_query_model error for {model.model_type}: {e}")
             return f"API Error: {str(e)}"
     
     def _format_question_prompt(self, question: Dict[str, Any], wrong_answers: Set[str] = None) -> str:
@@ -432,8 +474,8 @@ class TriviaGame(BaseGame):
             "penalty_stats": {
                 "player1_total_wrong_attempts": total_wrong_attempts_p1,
                 "player2_total_wrong_attempts": total_wrong_attempts_p2,
-                "player1_total_cooldown_time": total_wrong_attempts_p1 * 1.0,  # 1 second per wrong attempt
-                "player2_total_cooldown_time": total_wrong_attempts_p2 * 1.0,
+                "player1_total_cooldown_time": total_wrong_attempts_p1 * self.pacing.seconds(WRONG_ANSWER_COOLDOWN),
+                "player2_total_cooldown_time": total_wrong_attempts_p2 * self.pacing.seconds(WRONG_ANSWER_COOLDOWN),
                 "player1_questions_with_errors": len(self.player1_wrong_answers),
                 "player2_questions_with_errors": len(self.player2_wrong_answers)
             },
@@ -0,0 +1,102 @@
+"""
+Wordle solver bots
+Built-in players for simulations. Each bot keeps the words still consistent with the feedback
+it has been given (same green/yellow/black rules as the engine) and picks its next guess.
+"""
+
+import os
+import random
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+_words: Optional[List[str]] = None
+# Best opening guess per vocabulary; it only depends on the word list
+_openings: Dict[Tuple[str, ...], str] = {}
+
+
+def load_words() -> List[str]:
+    """Five-letter answer list from words.txt, read once"""
+    global _words
+    if _words is None:
+        with open(os.path.join(os.path.dirname(__file__), "words.txt")) as f:
+            _words = [line.strip().upper() for line in f if len(line.strip()) == 5]
+    return _words
+
+
+def feedback(guess: str, secret: str) -> Tuple[str, ...]:
+    """Colours for `guess` against `secret`, as WordleGame.check_guess scores them"""
+    colours: List[Optional[str]] = [None] * 5
+    unmatched = list(secret)
+    for i in range(5):
+        if guess[i] == secret[i]:
+            colours[i] = "green"
+            unmatched[i] = None
+    for i in range(5):
+        if colours[i] is None:
+            if guess[i] in unmatched:
+                colours[i] = "yellow"
+                unmatched[unmatched.index(guess[i])] = None
+            else:
+                colours[i] = "black"
+    return tuple(colours)
+
+
+class WordleBot:
+    name = "base"
+
+    def __init__(self, words: Optional[Sequence[str]] = None, rng: Optional[random.Random] = None):
+        self.words = list(words or load_words())
+        self.rng = rng or random.Random()
+
+    def candidates(self, guesses: List[str], feedbacks: List[List[str]]) -> List[str]:
+        remaining = self.words
+        for guess, colours in zip(guesses, feedbacks):
+            colours = tuple(colours)
+            remaining = [word for word in remaining if feedback(guess, word) == colours]
+        return remaining
+
+    def choose(self, guesses: List[str], feedbacks: List[List[str]]) -> str:
+        raise NotImplementedError
+
+
+class RandomBot(WordleBot):
+    """Guesses a random word that fits everything seen so far"""
+    name = "random"
+
+    def choose(self, guesses: List[str], feedbacks: List[List[str]]) -> str:
+        remaining = self.candidates(guesses, feedbacks) or self.words
+        return self.rng.choice(remaining)
+
+
+class SolverBot(WordleBot):
+    """Guesses the word that splits the remaining candidates into the most feedback patterns"""
+    name = "solver"
+
+    def choose(self, guesses: List[str], feedbacks: List[List[str]]) -> str:
+        if not guesses:
+            key = tuple(self.words)
+            if key not in _openings:
+                _openings[key] = self.best_split(self.words, self.words)
+            return _openings[key]
+        remaining = self.candidates(guesses, feedbacks) or self.words
+        if len(remaining) <= 2:
+            return remaining[0]
+        return self.best_split(self.words, remaining)
+
+    def best_split(self, pool: List[str], remaining: List[str]) -> str:
+        # Ties go to a word that could be the answer
+        possible = set(remaining)
+        return max(pool, key=lambda guess: (self.partitions(guess, remaining), guess in possible))
+
+    @staticmethod
+    def partitions(guess: str, remaining: List[str]) -> int:
+        return len(Counter(feedback(guess, word) for word in remaining))
+
+
+BOTS = {bot.name: bot for bot in (RandomBot, SolverBot)}
+
+
+def create_bot(name: str, words: Optional[Sequence[str]] = None, rng: Optional[random.Random] = None) -> WordleBot:
+    if name not in BOTS:
+        raise ValueError(f"Unknown Wordle bot '{name}' (expected one of: {', '.join(BOTS)})")
+    return BOTS[name](words, rng)
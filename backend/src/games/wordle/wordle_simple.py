@@ -2,33 +2,45 @@
 Real AI vs AI Wordle - Testing OpenAI GPT-4o vs Anthropic Claude
 """
 
-from flask import Flask, jsonify, request
-from flask_cors import CORS
 import os
 import json
-from typing import Dict, List
-import openai
-import anthropic
+from typing import Dict, List, Optional
 
-app = Flask(__name__)
-CORS(app)
+from src.utils.common import LLMClient, response_tokens
+from src.utils.log import get_logger, move_fields
+from src.utils.metrics import track_llm_call
+
+logger = get_logger("wordle")
 
 # Initialize API clients
 openai_api_key = os.getenv('OPENAI_API_KEY')
 anthropic_api_key = os.getenv('ANTHROPIC_API_KEY')
 
 if not openai_api_key:
-    print("⚠️  OPENAI_API_KEY not found! Set it with: export OPENAI_API_KEY='your_key_here'")
+    logger.warning("⚠️  OPENAI_API_KEY not found! Set it with: export OPENAI_API_KEY='your_key_here'")
 if not anthropic_api_key:
-    print("⚠️  ANTHROPIC_API_KEY not found! Set it with: export ANTHROPIC_API_KEY='your_key_here'")
+    logger.warning("⚠️  ANTHROPIC_API_KEY not found! Set it with: export ANTHROPIC_API_KEY='your_key_here'")
+
+# Provider SDKs are imported and clients built on the first guess, not at import
+_clients: Dict[str, Optional[object]] = {}
+
 
-# Only initialize clients if keys are provided
-openai_client = openai.OpenAI(api_key=openai_api_key) if openai_api_key else None
-anthropic_client = anthropic.Anthropic(api_key=anthropic_api_key) if anthropic_api_key else None
+def get_client(model: str):
+    """API client for "openai" or "anthropic", or None if its key is not set"""
+    if model not in _clients:
+        if model == "openai":
+            import openai
+            _clients[model] = openai.OpenAI(api_key=openai_api_key) if openai_api_key else None
+        else:
+            import anthropic
+            _clients[model] = anthropic.Anthropic(api_key=anthropic_api_key) if anthropic_api_key else None
+    return _clients[model]
 
 # Current game state
 current_game = None
 
+SYSTEM_PROMPT = "You are an expert Wordle player. You always respond with exactly one 5-letter word in ALL CAPS, nothing else."
+
 
 class WordleGame:
     def __init__(self, secret_word: str):
@@ -39,8 +51,8 @@ class WordleGame:
         }
         self.game_over = False
         self.winner = None
-        print(f"\n=== NEW GAME STARTED ===")
-        print(f"Secret word: {self.secret_word}")
+        logger.info("=== NEW GAME STARTED ===")
+        logger.debug(f"Secret word: {self.secret_word}")
     
     def check_guess(self, guess: str) -> List[str]:
         """Return feedback for a guess"""
@@ -89,20 +101,20 @@ class WordleGame:
             if not self.game_over:  # First to solve wins
                 self.game_over = True
                 self.winner = model
-                print(f"\n🎉 {model.upper()} WINS! Found '{self.secret_word}' in {current_guesses} guesses")
+                logger.info(f"🎉 {model.upper()} WINS! Found '{self.secret_word}' in {current_guesses} guesses")
             else:  # Both solved in same round - compare guess counts
                 other_model = 'anthropic' if model == 'openai' else 'openai'
                 other_guesses = len(self.models[other_model]['guesses'])
                 
                 if current_guesses < other_guesses:
                     self.winner = model
-                    print(f"\n🎉 {model.upper()} WINS! Both found '{self.secret_word}' but {model.upper()} used fewer guesses ({current_guesses} vs {other_guesses})")
+                    logger.info(f"🎉 {model.upper()} WINS! Both found '{self.secret_word}' but {model.upper()} used fewer guesses ({current_guesses} vs {other_guesses})")
                 elif current_guesses > other_guesses:
                     # Other model already won with fewer guesses
-                    print(f"\n{model.upper()} found '{self.secret_word}' in {current_guesses} guesses but {other_model.upper()} already won with {other_guesses}")
+                    logger.info(f"{model.upper()} found '{self.secret_word}' in {current_guesses} guesses but {other_model.upper()} already won with {other_guesses}")
                 else:
                     self.winner = "TIE"
-                    print(f"\n🤝 TIE! Both found '{self.secret_word}' in {current_guesses} guesses")
+                    logger.info(f"🤝 TIE! Both found '{self.secret_word}' in {current_guesses} guesses")
         
         return {
             "guess": guess,
@@ -112,85 +124,6 @@ class WordleGame:
         }
 
 
-@app.route('/api/wordle/start', methods=['POST'])
-def start_game():
-    """Start a new game"""
-    global current_game
-    
-    data = request.json
-    secret_word = data.get('secret_word', '').upper()
-    
-    if len(secret_word) != 5 or not secret_word.isalpha():
-        return jsonify({"error": "Must be a 5-letter word"}), 400
-    
-    current_game = WordleGame(secret_word)
-    return jsonify({"success": True})
-
-
-@app.route('/api/wordle/state', methods=['GET'])
-def get_state():
-    """Get current game state"""
-    if not current_game:
-        return jsonify({"error": "No active game"}), 404
-    
-    return jsonify({
-        "models": current_game.models,
-        "game_over": current_game.game_over,
-        "winner": current_game.winner,
-        "secret_word": current_game.secret_word if current_game.game_over else None
-    })
-
-
-@app.route('/api/wordle/guess', methods=['POST'])
-def make_guess():
-    """Make a guess for a model"""
-    if not current_game:
-        return jsonify({"error": "No active game"}), 404
-    
-    data = request.json
-    model = data.get('model')
-    
-    if model not in ['openai', 'anthropic']:
-        return jsonify({"error": "Invalid model"}), 400
-    
-    # Get AI's guess from the actual LLM
-    model_data = current_game.models[model]
-    try:
-        guess, reasoning = get_llm_guess(model, model_data['guesses'], model_data['feedback'])
-    except Exception as e:
-        print(f"❌ Error getting guess from {model}: {e}")
-        # Fallback to prevent crashes
-        fallback_words = ["CRANE", "SLATE", "AUDIO", "HOUSE", "ROUND", "LIGHT", "PRINT", "WORLD", "PARTY", "KNIFE"]
-        guess = fallback_words[len(model_data['guesses']) % len(fallback_words)]
-        
-        if "API key not configured" in str(e):
-            reasoning = f"🔑 API key missing for {model.upper()} - using fallback word: {guess}"
-        else:
-            reasoning = f"⚠️ {model.upper()} API error - using fallback word: {guess}"
-    
-    # Make the guess
-    result = current_game.make_guess(model, guess, reasoning)
-    
-    # Log the turn
-    turn = len(model_data['guesses'])
-    print(f"\n{model.upper()} - Turn {turn}")
-    print(f"Guess: {guess}")
-    print(f"Reasoning: {reasoning}")
-    print(f"Feedback: {result['feedback']}")
-    
-    # Get detailed reasoning for UI
-    detailed_reasoning = parse_reasoning_for_ui(model, reasoning, model_data['guesses'], model_data['feedback'])
-    
-    return jsonify({
-        "guess": guess,
-        "reasoning": reasoning,
-        "detailed_reasoning": detailed_reasoning,
-        "feedback": result['feedback'],
-        "game_over": result['game_over'],
-        "winner": result['winner']
-    })
-
-
 def build_wordle_prompt(model: str, previous_guesses: List[str], previous_feedback: List[List[str]]) -> str:
     """Build a strategic prompt for the LLM"""
     
@@ -301,40 +234,56 @@ Your guess:"""
     return prompt
 
 
-def get_llm_guess(model: str, previous_guesses: List[str], previous_feedback: List[List[str]]) -> tuple:
-    """Get guess from the actual LLM API"""
+def get_llm_guess(model: str, previous_guesses: List[str], previous_feedback: List[List[str]],
+                  model_id: Optional[str] = None) -> tuple:
+    """Get guess from the actual LLM API
+    
+    `model` is the player ("openai" or "anthropic") and also picks the API model, unless
+    `model_id` names another model to play as that player (any provider LLMClient supports)
+    """
     
     # Check if API client is available
-    if model == "openai" and not openai_client:
+    client = get_client(model) if model_id is None else None
+    if model_id is None and model == "openai" and not client:
         raise Exception("OpenAI API key not configured. Please set OPENAI_API_KEY environment variable.")
-    elif model == "anthropic" and not anthropic_client:
+    elif model_id is None and model == "anthropic" and not client:
         raise Exception("Anthropic API key not configured. Please set ANTHROPIC_API_KEY environment variable.")
     
     prompt = build_wordle_prompt(model, previous_guesses, previous_feedback)
     
     try:
-        if model == "openai":
-            response = openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "You are an expert Wordle player. You always respond with exactly one 5-letter word in ALL CAPS, nothing else."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=10,
-                temperature=0.7
-            )
-            guess = response.choices[0].message.content.strip().upper()
+        if model_id is not None:
+            # LLMClient tracks the call itself and returns None when the API call fails
+            response = LLMClient(model_id).get_response(f"{SYSTEM_PROMPT}\n\n{prompt}", max_tokens=10, temperature=0.7)
+            if response is None:
+                raise Exception(f"No response from {model_id}")
+            guess = response.strip().upper()
+        else:
+            with track_llm_call(model) as call:
+                if model == "openai":
+                    response = client.chat.completions.create(
+                        model="gpt-4o",
+                        messages=[
+                            {"role": "system", "content": SYSTEM_PROMPT},
+                            {"role": "user", "content": prompt}
+                        ],
+                        max_tokens=10,
+                        temperature=0.7
+                    )
+                    call.tokens(*response_tokens(response))
+                    guess = response.choices[0].message.content.strip().upper()
             
-        else:  # anthropic
-            response = anthropic_client.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=10,
-                temperature=0.7,
-                messages=[
-                    {"role": "user", "content": f"You are an expert Wordle player. You always respond with exactly one 5-letter word in ALL CAPS, nothing else.\n\n{prompt}"}
-                ]
-            )
-            guess = response.content[0].text.strip().upper()
+                else:  # anthropic
+                    response = client.messages.create(
+                        model="claude-3-5-sonnet-20241022",
+                        max_tokens=10,
+                        temperature=0.7,
+                        messages=[
+                            {"role": "user", "content": f"{SYSTEM_PROMPT}\n\n{prompt}"}
+                        ]
+                    )
+                    call.tokens(*response_tokens(response))
+                    guess = response.content[0].text.strip().upper()
         
         # Clean up the response - extract just the 5-letter word
         words = [word for word in guess.split() if len(word) == 5 and word.isalpha()]
@@ -351,11 +300,11 @@ def get_llm_guess(model: str, previous_guesses: List[str], previous_feedback: Li
         
         reasoning = f"Turn {len(previous_guesses) + 1} - {model.upper()}'s strategic choice"
         
-        print(f"🤖 {model.upper()} chose: {guess}")
+        logger.debug(f"🤖 {model.upper()} chose: {guess}", extra=move_fields(turn=len(previous_guesses) + 1, model=model))
         return guess, reasoning
         
     except Exception as e:
-        print(f"❌ Error calling {model} API: {e}")
+        logger.error(f"❌ Error calling {model} API: {e}")
         # Fallback
         fallback_words = ["CRANE", "SLATE", "AUDIO", "HOUSE", "ROUND", "LIGHT", "PRINT", "WORLD"]
         guess = fallback_words[len(previous_guesses) % len(fallback_words)]
@@ -427,6 +376,91 @@ def parse_reasoning_for_ui(model: str, reasoning: str, previous_guesses: List[st
     }
 
 
+def create_app():
+    """Standalone Flask app for this game (the unified server serves Wordle itself)"""
+    from flask import Flask, jsonify, request
+    from flask_cors import CORS
+        
+    app = Flask(__name__)
+    CORS(app)
+        
+    @app.route('/api/wordle/start', methods=['POST'])
+    def start_game():
+        """Start a new game"""
+        global current_game
+        
+        data = request.json
+        secret_word = data.get('secret_word', '').upper()
+        
+        if len(secret_word) != 5 or not secret_word.isalpha():
+            return jsonify({"error": "Must be a 5-letter word"}), 400
+        
+        current_game = WordleGame(secret_word)
+        return jsonify({"success": True})
+
+    @app.route('/api/wordle/state', methods=['GET'])
+    def get_state():
+        """Get current game state"""
+        if not current_game:
+            return jsonify({"error": "No active game"}), 404
+        
+        return jsonify({
+            "models": current_game.models,
+            "game_over": current_game.game_over,
+            "winner": current_game.winner,
+            "secret_word": current_game.secret_word if current_game.game_over else None
+        })
+
+    @app.route('/api/wordle/guess', methods=['POST'])
+    def make_guess():
+        """Make a guess for a model"""
+        if not current_game:
+            return jsonify({"error": "No active game"}), 404
+        
+        data = request.json
+        model = data.get('model')
+        
+        if model not in ['openai', 'anthropic']:
+            return jsonify({"error": "Invalid model"}), 400
+        
+        # Get AI's guess from the actual LLM
+        model_data = current_game.models[model]
+        try:
+            guess, reasoning = get_llm_guess(model, model_data['guesses'], model_data['feedback'])
+        except Exception as e:
+            logger.error(f"❌ Error getting guess from {model}: {e}")
+            # Fallback to prevent crashes
+            fallback_words = ["CRANE", "SLATE", "AUDIO", "HOUSE", "ROUND", "LIGHT", "PRINT", "WORLD", "PARTY", "KNIFE"]
+            guess = fallback_words[len(model_data['guesses']) % len(fallback_words)]
+        
+            if "API key not configured" in str(e):
+                reasoning = f"🔑 API key missing for {model.upper()} - using fallback word: {guess}"
+            else:
+                reasoning = f"⚠️ {model.upper()} API error - using fallback word: {guess}"
+        
+        # Make the guess
+        result = current_game.make_guess(model, guess, reasoning)
+        
+        # Log the turn
+        turn = len(model_data['guesses'])
+        logger.debug(f"{model.upper()} guessed {guess} ({reasoning}): {result['feedback']}",
+                     extra=move_fields(turn=turn, model=model))
+        
+        # Get detailed reasoning for UI
+        detailed_reasoning = parse_reasoning_for_ui(model, reasoning, model_data['guesses'], model_data['feedback'])
+        
+        return jsonify({
+            "guess": guess,
+            "reasoning": reasoning,
+            "detailed_reasoning": detailed_reasoning,
+            "feedback": result['feedback'],
+            "game_over": result['game_over'],
+            "winner": result['winner']
+        })
+        
+    return app
+
+
 if __name__ == '__main__':
     print("🎮 Starting AI vs AI Wordle server on port 5001...")
     print("📋 Testing GPT-4o vs Claude-3.5-Sonnet")
@@ -449,4 +483,4 @@ if __name__ == '__main__':
     else:
         print("✅ API keys configured - ready to test real LLM intelligence!")
     
-    app.run(debug=True, port=5002, threaded=True) 
\ No newline at end of file
+    create_app().run(debug=True, port=5002, threaded=True) 
\ No newline at end of file
@@ -0,0 +1,190 @@
+"""
+Admission control for new matches
+Before a match is created, current load (live matches of its type, LLM calls in flight,
+event loop lag) is checked against configurable limits. Over a limit the new match is shed,
+never the ones already running: the caller gets a Retry-After and a place in a per-type
+waiting room, and keeps that place by retrying with its ticket
+"""
+
+import os
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from src.utils.log import get_logger
+from src.utils.loop_monitor import loop_monitor
+from src.utils.metrics import ADMISSION_REJECTED, WAITING_ROOM, llm_calls_in_flight
+
+logger = get_logger("admission")
+
+ADMISSION_ENABLED = os.getenv("VERSUS_ADMISSION", "1") != "0"
+# VERSUS_MAX_MATCHES is the default per game type; VERSUS_MAX_MATCHES_BY_TYPE="debate=5,trivia=100" overrides.
+# Any limit of 0 turns that check off
+DEFAULT_MAX_MATCHES = int(os.getenv("VERSUS_MAX_MATCHES", "50"))
+MAX_MATCHES_BY_TYPE = os.getenv("VERSUS_MAX_MATCHES_BY_TYPE", "")
+MAX_LLM_IN_FLIGHT = int(os.getenv("VERSUS_MAX_LLM_IN_FLIGHT", "32"))
+MAX_LOOP_LAG = float(os.getenv("VERSUS_ADMISSION_MAX_LAG_MS", "500")) / 1000
+RETRY_AFTER = int(os.getenv("VERSUS_ADMISSION_RETRY_SECONDS", "5"))
+# A ticket that isn't retried within this long gives up its place
+TICKET_TTL = float(os.getenv("VERSUS_WAITING_ROOM_TTL_SECONDS", "30"))
+MAX_WAITING = int(os.getenv("VERSUS_WAITING_ROOM_SIZE", "100"))
+
+REASON_MESSAGES = {
+    "match_limit": "Too many matches of this type in progress",
+    "waiting_room": "Other players are waiting for a match slot",
+    "llm_saturated": "Model providers are busy",
+    "loop_lagging": "Server is under heavy load"
+}
+
+
+def parse_limits(spec: str) -> Dict[str, int]:
+    """Parse "name=N,name=N" into {name: N}; malformed entries are skipped"""
+    limits = {}
+    for item in spec.split(","):
+        name, sep, value = item.partition("=")
+        if sep and name.strip() and value.strip().isdigit():
+            limits[name.strip()] = int(value.strip())
+    return limits
+
+
+@dataclass
+class Admission:
+    admitted: bool
+    reason: Optional[str] = None
+    retry_after: int = 0
+    ticket: Optional[str] = None
+    position: Optional[int] = None  # 1-based place in the waiting room
+
+    def to_dict(self) -> Dict:
+        return {
+            "message": REASON_MESSAGES.get(self.reason, "Match admitted"),
+            "reason": self.reason,
+            "retry_after": self.retry_after,
+            "ticket": self.ticket,
+            "position": self.position
+        }
+
+
+class WaitingRoom:
+    """FIFO of tickets for one game type; a ticket expires unless its holder keeps retrying"""
+
+    def __init__(self, ttl: float = TICKET_TTL):
+        self.ttl = ttl
+        self.tickets: "OrderedDict[str, float]" = OrderedDict()  # ticket -> expires at
+
+    def __len__(self) -> int:
+        return len(self.tickets)
+
+    def prune(self, now: float):
+        for ticket, expires_at in list(self.tickets.items()):
+            if expires_at <= now:
+                del self.tickets[ticket]
+
+    def position(self, ticket: Optional[str]) -> Optional[int]:
+        if ticket not in self.tickets:
+            return None
+        for position, held in enumerate(self.tickets, start=1):
+            if held == ticket:
+                return position
+        return None
+
+    def hold(self, ticket: Optional[str], now: float) -> str:
+        """Keep a known ticket's place (refreshing its expiry), or issue a new one at the back"""
+        if ticket not in self.tickets:
+            ticket = uuid.uuid4().hex
+        self.tickets[ticket] = now + self.ttl
+        return ticket
+
+    def leave(self, ticket: Optional[str]):
+        self.tickets.pop(ticket, None)
+
+
+class AdmissionController:
+    def __init__(self, enabled: bool = ADMISSION_ENABLED, default_limit: int = DEFAULT_MAX_MATCHES,
+                 limits: Optional[Dict[str, int]] = None, max_llm_in_flight: int = MAX_LLM_IN_FLIGHT,
+                 max_loop_lag: float = MAX_LOOP_LAG, retry_after: int = RETRY_AFTER, max_waiting: int = MAX_WAITING):
+        self.enabled = enabled
+        self.default_limit = default_limit
+        self.limits = limits if limits is not None else parse_limits(MAX_MATCHES_BY_TYPE)
+        self.max_llm_in_flight = max_llm_in_flight
+        self.max_loop_lag = max_loop_lag
+        self.retry_after = retry_after
+        self.max_waiting = max_waiting
+        self.rooms: Dict[str, WaitingRoom] = {}
+
+    def limit_for(self, game_type: str) -> int:
+        return self.limits.get(game_type, self.default_limit)
+
+    def pressure(self) -> Optional[str]:
+        """Why the server as a whole can't take on another match right now, if it can't"""
+        if self.max_llm_in_flight > 0 and sum(llm_calls_in_flight().values()) >= self.max_llm_in_flight:
+            return "llm_saturated"
+        if self.max_loop_lag > 0 and loop_monitor.recent_lag >= self.max_loop_lag:
+            return "loop_lagging"
+        return None
+
+    def admit(self, game_type: str, active: int, ticket: Optional[str] = None) -> Admission:
+        """Decide whether a new `game_type` match may start while `active` of them are live
+
+        Callers already in the waiting room are let in first; everyone else queues behind them.
+        """
+        if not self.enabled:
+            return Admission(True)
+
+        now = time.monotonic()
+        room = self.rooms.setdefault(game_type, WaitingRoom())
+        room.prune(now)
+
+        limit = self.limit_for(game_type)
+        reason = self.pressure()
+        if reason is None and limit > 0 and active >= limit:
+            reason = "match_limit"
+        if reason is None:
+            free = limit - active if limit > 0 else float("inf")
+            position = room.position(ticket)
+            ahead = position - 1 if position else len(room)
+            if ahead < free:
+                room.leave(ticket)
+                return Admission(True)
+            reason = "waiting_room"
+
+        # Shed: hold a place in line unless the room is full
+        if ticket in room.tickets or len(room) < self.max_waiting:
+            ticket = room.hold(ticket, now)
+        else:
+            ticket = None
+        ADMISSION_REJECTED.inc(game_type, reason)
+        decision = Admission(False, reason, self.retry_after, ticket, room.position(ticket))
+        logger.info(f"🚦 Shedding new {game_type} match ({reason}, {active} live, "
+                    f"place {decision.position or 'none'} of {len(room)})")
+        return decision
+
+    def waiting(self) -> Dict[str, int]:
+        now = time.monotonic()
+        for room in self.rooms.values():
+            room.prune(now)
+        return {game_type: len(room) for game_type, room in self.rooms.items()}
+
+    def report(self, active: Dict[str, int]) -> Dict:
+        waiting = self.waiting()
+        in_flight = llm_calls_in_flight()
+        return {
+            "enabled": self.enabled,
+            "pressure": self.pressure(),
+            "llm_in_flight": sum(in_flight.values()),
+            "max_llm_in_flight": self.max_llm_in_flight,
+            "recent_loop_lag_ms": round(loop_monitor.recent_lag * 1000, 1),
+            "max_loop_lag_ms": round(self.max_loop_lag * 1000),
+            "matches": {
+                game_type: {"active": count, "limit": self.limit_for(game_type), "waiting": waiting.get(game_type, 0)}
+                for game_type, count in active.items()
+            }
+        }
+
+
+# Global instance
+admission = AdmissionController()
+
+WAITING_ROOM.set_function(lambda: {(game_type,): count for game_type, count in admission.waiting().items()})
@@ -0,0 +1,102 @@
+"""
+Game state snapshots
+On shutdown, live matches are written to disk; the next boot restores them and resumes their
+loops from the last completed turn, so a rolling restart loses no games and repeats no paid
+LLM calls. Each game is pickled on its own, so one that can't be restored doesn't sink the rest.
+Only the server itself writes this file; never point VERSUS_SNAPSHOT_PATH at untrusted data.
+"""
+
+import os
+import pickle
+import time
+from typing import Any, Dict, Optional
+
+from src.utils.log import game_fields, get_logger
+
+logger = get_logger("snapshots")
+
+SNAPSHOTS_ENABLED = os.getenv("VERSUS_SNAPSHOTS", "1") != "0"
+DEFAULT_PATH = os.getenv("VERSUS_SNAPSHOT_PATH", os.path.join("data", "snapshot.pickle"))
+# Snapshots older than this are from a crash or a long outage, not a restart; don't resume them
+MAX_AGE_SECONDS = float(os.getenv("VERSUS_SNAPSHOT_MAX_AGE_SECONDS", "900"))
+SNAPSHOT_VERSION = 1
+
+
+class SnapshotStore:
+    def __init__(self, path: str = DEFAULT_PATH, max_age: float = MAX_AGE_SECONDS):
+        self.path = path
+        self.max_age = max_age
+
+    def save(self, games: Dict[str, Dict[str, Any]], extra: Optional[Dict] = None) -> int:
+        """Write {game_type: {game_id: game}} (plus picklable `extra` state) atomically; returns games saved
+
+        Blocking; run it in a thread.
+        """
+        pickled: Dict[str, Dict[str, bytes]] = {}
+        saved = 0
+        for game_type, by_id in games.items():
+            for game_id, game in by_id.items():
+                try:
+                    pickled.setdefault(game_type, {})[game_id] = pickle.dumps(game, protocol=pickle.HIGHEST_PROTOCOL)
+                    saved += 1
+                except Exception as e:
+                    logger.error(f"❌ Could not snapshot {game_type} game: {e}", extra=game_fields(game_id))
+
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "saved_at": time.time(),
+            "games": pickled,
+            "extra": extra or {}
+        }
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "wb") as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        return saved
+
+    def load(self) -> Optional[Dict]:
+        """Read and consume the snapshot left by the previous run
+
+        Returns {"games": {game_type: {game_id: game}}, "extra": {...}, "age": seconds},
+        or None if there is nothing (recent enough) to restore. Blocking; run it in a thread.
+        """
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, "rb") as f:
+                snapshot = pickle.load(f)
+        except Exception as e:
+            logger.error(f"❌ Could not read game snapshot {self.path}: {e}")
+            return None
+        finally:
+            # Consume it either way: a snapshot that crashes the boot must not be retried forever
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+        age = time.time() - snapshot.get("saved_at", 0)
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            logger.warning(f"⚠️  Ignoring game snapshot with version {snapshot.get('version')}")
+            return None
+        if age > self.max_age:
+            logger.warning(f"⚠️  Ignoring game snapshot from {age:.0f}s ago (older than {self.max_age:g}s)")
+            return None
+
+        games: Dict[str, Dict[str, Any]] = {}
+        for game_type, by_id in snapshot["games"].items():
+            for game_id, data in by_id.items():
+                try:
+                    games.setdefault(game_type, {})[game_id] = pickle.loads(data)
+                except Exception as e:
+                    logger.error(f"❌ Could not restore {game_type} game: {e}", extra=game_fields(game_id))
+        return {"games": games, "extra": snapshot.get("extra", {}), "age": age}
+
+
+# Global instance
+snapshot_store = SnapshotStore()
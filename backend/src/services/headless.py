@@ -0,0 +1,273 @@
+"""
+Headless matches
+Plays one whole model-vs-model match straight through a game engine: no websockets, no
+viewers, no presentation delays and no post-game interviews. Each player's model calls go
+through the provider rate limiter and are counted against that player, so a result says who
+won, in how many turns, and what each side spent in calls, latency and tokens.
+"""
+
+import asyncio
+import inspect
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from src.games.battleship.battleship import BattleshipGame
+from src.games.battleship.placement import sample_layouts
+from src.games.debate.debate_game import DebateGame
+from src.games.nyt_connections.connections_game import ConnectionsGame, load_puzzles
+from src.games.trivia.questions import get_question_bank
+from src.games.trivia.trivia_game import TriviaGame
+from src.games.wordle.wordle_simple import WordleGame, get_llm_guess
+from src.services.provider_limits import ProviderLimiter, provider_limiter
+from src.utils.log import game_fields, get_logger
+from src.utils.metrics import LLMUsage, llm_usage
+from src.utils.pacing import get_pacing
+
+logger = get_logger("headless")
+
+GAME_TYPES = ("battleship", "trivia", "wordle", "connections", "debate")
+
+# Attempts at a legal shot before a battleship player's turn is played at the recommended target, as in live matches
+BATTLESHIP_MOVE_ATTEMPTS = 5
+TRIVIA_QUESTIONS = 10
+# Answers per trivia player (wrong answers included) before the race is called on score
+TRIVIA_MAX_ANSWERS = 40
+WORDLE_MAX_GUESSES = 6
+# Guesses per Connections board before the match is called on groups found
+CONNECTIONS_MAX_GUESSES = 16
+DEBATE_JUDGE = "gpt-4o"
+
+WORDLE_WORDS = [
+    "CRANE", "SLATE", "HOUSE", "LIGHT", "PRINT", "WORLD", "PARTY", "KNIFE", "BRAVE", "CHAIR",
+    "DREAM", "EARTH", "FLAME", "GRAPE", "HEART", "JUICE", "LEMON", "MONEY", "NIGHT", "OCEAN",
+    "PIANO", "QUEEN", "RIVER", "SMILE", "TIGER", "UNCLE", "VOICE", "WATER", "YOUTH", "ZEBRA",
+    "BLEND", "CLOUD", "DANCE", "FROST", "GHOST", "HONEY", "IVORY", "JOKER", "LATCH", "MOUSE"
+]
+
+DEBATE_TOPICS = [
+    "Remote work is better than working in an office",
+    "Social media does more harm than good",
+    "Artificial intelligence should be regulated like medicine",
+    "Cities should ban private cars from their centers",
+    "Homework should be abolished in primary schools",
+    "Space exploration is worth its cost"
+]
+
+
+class MatchError(Exception):
+    """A match that ended without a result (e.g. the debate judge never answered)"""
+
+
+@dataclass
+class MatchResult:
+    game_type: str
+    player1_model: str
+    player2_model: str
+    winner: Optional[int]  # 1, 2, or None for a draw
+    turns: int
+    duration: float
+    usage: Dict[int, LLMUsage]
+    details: Dict = field(default_factory=dict)
+
+    @property
+    def winner_model(self) -> Optional[str]:
+        return {1: self.player1_model, 2: self.player2_model}.get(self.winner)
+
+    def to_dict(self) -> Dict:
+        return {
+            "game_type": self.game_type,
+            "player1_model": self.player1_model,
+            "player2_model": self.player2_model,
+            "winner": self.winner,
+            "winner_model": self.winner_model,
+            "turns": self.turns,
+            "duration": round(self.duration, 2),
+            "usage": {f"player{player}": usage.to_dict() for player, usage in self.usage.items()},
+            "details": self.details
+        }
+
+
+class HeadlessMatch:
+    def __init__(self, game_type: str, player1_model: str, player2_model: str, seed: Optional[int] = None,
+                 limiter: Optional[ProviderLimiter] = None, options: Optional[Dict] = None):
+        if game_type not in GAME_TYPES:
+            raise ValueError(f"Unknown game type '{game_type}' (expected one of: {', '.join(GAME_TYPES)})")
+        self.game_type = game_type
+        self.models = {1: player1_model, 2: player2_model}
+        self.rng = random.Random(seed)
+        self.limiter = limiter or provider_limiter
+        self.options = options or {}
+        self.usage = {1: LLMUsage(), 2: LLMUsage()}
+        self.match_id = f"{game_type}-{seed}" if seed is not None else game_type
+
+    async def ask(self, player: int, fn: Callable, *args, **kwargs) -> Any:
+        """Make one model call for `player` under its provider's rate limit; blocking functions run in a thread"""
+        async with self.limiter.slot(self.models[player]):
+            with llm_usage(self.usage[player]):
+                if inspect.iscoroutinefunction(fn):
+                    return await fn(*args, **kwargs)
+                return await asyncio.to_thread(fn, *args, **kwargs)
+
+    async def play(self) -> MatchResult:
+        start = time.monotonic()
+        winner, turns, details = await getattr(self, f"_play_{self.game_type}")()
+        result = MatchResult(self.game_type, self.models[1], self.models[2], winner, turns,
+                             time.monotonic() - start, self.usage, details)
+        logger.info(f"🏁 {self.game_type}: {self.models[1]} vs {self.models[2]} -> "
+                    f"{result.winner_model or 'draw'} in {turns} turns ({result.duration:.1f}s)",
+                    extra=game_fields(self.match_id))
+        return result
+
+    # ---- game drivers: each returns (winner, turns, details) ----------
+
+    async def _play_battleship(self):
+        game = await asyncio.to_thread(BattleshipGame, self.models[1], self.models[2],
+                                       self.options.get("board_size"), self.options.get("ships"),
+                                       bool(self.options.get("no_touch")))
+        game.pacing = get_pacing("turbo")
+        # Boards come from the match RNG so a seeded match (and both seatings of a pairing) is reproducible
+        for player, layout in zip((1, 2), sample_layouts(game.geometry, game.ships, 2, self.rng, game.no_touch)):
+            game.place_ships_for_player(player, layout=layout)
+        game.status = "active"
+
+        fallbacks = {1: 0, 2: 0}
+        max_turns = 2 * game.board_size * game.board_size
+        while not game.winner and game.game_state["turn_count"] < max_turns:
+            player = game.current_player
+            client = game.player1 if player == 1 else game.player2
+            for _ in range(BATTLESHIP_MOVE_ATTEMPTS):
+                reply = await self.ask(player, client.get_move, game.get_prompt_for_player(player), game.game_state)
+                coordinate = game.parse_coordinate(reply)
+                if coordinate and game.make_move(*coordinate)["success"]:
+                    break
+            else:
+                target = game.recommend_target(player, self.rng)
+                if not target:
+                    break
+                game.make_move(*target)
+                fallbacks[player] += 1
+
+        game.status = "finished"
+        return game.winner, game.game_state["turn_count"], {
+            "fallback_moves": {f"player{player}": count for player, count in fallbacks.items()},
+            "ship_cells_left": {f"player{player}": game.ships_remaining[player] for player in (1, 2)}
+        }
+
+    async def _play_trivia(self):
+        bank = await asyncio.to_thread(get_question_bank)
+        if not bank:
+            raise MatchError("Trivia question bank is empty")
+        questions = self.rng.sample(bank, min(self.options.get("questions", TRIVIA_QUESTIONS), len(bank)))
+        game = await asyncio.to_thread(TriviaGame, self.models[1], self.models[2], questions)
+        game.pacing = get_pacing("turbo")
+
+        async def race(player: int):
+            for _ in range(TRIVIA_MAX_ANSWERS):
+                if game.race_finished:
+                    return
+                turn = game.prepare_turn(player)
+                if "error" in turn:
+                    if not turn.get("cooldown_remaining"):
+                        return  # no questions left
+                    await asyncio.sleep(turn["cooldown_remaining"])
+                    continue
+                response, response_time = await self.ask(player, game.ask_model, turn)
+                game.record_answer(turn, response, response_time)
+
+        await asyncio.gather(race(1), race(2))
+
+        winner = game.race_winner
+        if winner is None and game.player1_score != game.player2_score:
+            winner = 1 if game.player1_score > game.player2_score else 2
+        return winner, len(game.player1_responses) + len(game.player2_responses), {
+            "questions": len(questions),
+            "scores": {"player1": game.player1_score, "player2": game.player2_score}
+        }
+
+    async def _play_wordle(self):
+        secret = self.options.get("secret_word") or self.rng.choice(WORDLE_WORDS)
+        game = WordleGame(secret)
+        # The engine knows its two players by these names
+        slots = {1: "openai", 2: "anthropic"}
+
+        rounds = 0
+        while not game.game_over and rounds < WORDLE_MAX_GUESSES:
+            rounds += 1
+            # Both players guess at once from the same round's feedback
+            guesses = await asyncio.gather(*(
+                self.ask(player, get_llm_guess, slots[player], list(game.models[slots[player]]["guesses"]),
+                         list(game.models[slots[player]]["feedback"]), model_id=self.models[player])
+                for player in (1, 2)
+            ))
+            for player, (guess, reasoning) in zip((1, 2), guesses):
+                game.make_guess(slots[player], guess, reasoning)
+
+        winner = {"openai": 1, "anthropic": 2}.get(game.winner)
+        # The engine ends the game on the first solve; a solve by the other player in the same round is a tie
+        if winner is not None and guesses[2 - winner][0].upper() == game.secret_word:
+            winner = None
+        return winner, rounds, {
+            "secret_word": game.secret_word,
+            "guesses": {f"player{player}": game.models[slots[player]]["guesses"] for player in (1, 2)}
+        }
+
+    async def _play_connections(self):
+        puzzle = self.rng.choice(await asyncio.to_thread(load_puzzles))
+        boards = {1: ConnectionsGame(puzzle), 2: ConnectionsGame(puzzle)}
+
+        rounds = 0
+        while rounds < self.options.get("max_guesses", CONNECTIONS_MAX_GUESSES):
+            rounds += 1
+            # Each player works their own board; both guess once per round
+            guesses = await asyncio.gather(*(self.ask(player, boards[player].get_ai_guess, self.models[player])
+                                             for player in (1, 2)))
+            for player, guess in zip((1, 2), guesses):
+                if guess:
+                    boards[player].make_guess(self.models[player], guess)
+            if any(board.game_over for board in boards.values()):
+                break
+
+        solved = [player for player in (1, 2) if boards[player].game_over]
+        if len(solved) == 1:
+            winner = solved[0]
+        elif not solved and len(boards[1].found_groups) != len(boards[2].found_groups):
+            winner = 1 if len(boards[1].found_groups) > len(boards[2].found_groups) else 2
+        else:
+            winner = None
+        return winner, rounds, {
+            "puzzle_id": puzzle["id"],
+            "groups_found": {f"player{player}": len(boards[player].found_groups) for player in (1, 2)},
+            "mistakes": {f"player{player}": len(boards[player].incorrect_guesses) for player in (1, 2)}
+        }
+
+    async def _play_debate(self):
+        game = await asyncio.to_thread(DebateGame, self.match_id, self.models[1], self.models[2])
+        game.pacing = get_pacing("turbo")
+        topic = self.options.get("topic") or self.rng.choice(DEBATE_TOPICS)
+        judge = self.options.get("judge_model", DEBATE_JUDGE)
+        await game.initialize(topic, judge)
+
+        while game.current_round < game.max_rounds:
+            player = 1 if game.current_position == "PRO" else 2
+            await self.ask(player, game.take_turn)
+        game.debate_finished = True
+
+        # The verdict is nobody's turn: count the judge's call outside both players' usage
+        async with self.limiter.slot(judge):
+            await game.judge_debate()
+        if not game.judgment:
+            raise MatchError(f"Judge {judge} returned no verdict")
+        winner = {"PRO": 1, "CON": 2}.get(game.judgment.get("winner"))
+        return winner, len(game.arguments), {
+            "topic": topic,
+            "judge_model": judge,
+            "scores": {"player1": game.judgment.get("pro_total"), "player2": game.judgment.get("con_total")}
+        }
+
+
+async def play_match(game_type: str, player1_model: str, player2_model: str, seed: Optional[int] = None,
+                     limiter: Optional[ProviderLimiter] = None, options: Optional[Dict] = None) -> MatchResult:
+    """Play one match to the end and return its result"""
+    return await HeadlessMatch(game_type, player1_model, player2_model, seed, limiter, options).play()
@@ -0,0 +1,320 @@
+"""
+Durable background job queue
+SQLite-backed queue drained by a small pool of async workers, so post-game work
+survives restarts and never runs inline with live move handling. Each job type can be
+capped to a number of concurrently running jobs
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from src.utils.log import game_fields, get_logger
+
+logger = get_logger("jobs")
+
+DEFAULT_DB_PATH = os.getenv("VERSUS_JOB_DB", os.path.join("data", "jobs.sqlite3"))
+DEFAULT_WORKERS = int(os.getenv("VERSUS_JOB_WORKERS", "2"))
+DEFAULT_MAX_ATTEMPTS = int(os.getenv("VERSUS_JOB_MAX_ATTEMPTS", "3"))
+# Per job type concurrency, e.g. VERSUS_JOB_LIMITS="post_game=1"; unlisted types may use every worker
+JOB_LIMITS = os.getenv("VERSUS_JOB_LIMITS", "")
+
+# Lower runs first: games people are watching get their roasts before backfill
+PRIORITY_LIVE = 0
+PRIORITY_BACKFILL = 10
+
+# Backoff after the queue database itself fails (e.g. "database is locked"), doubling up to the max
+DB_ERROR_BACKOFF_SECONDS = 0.5
+DB_ERROR_BACKOFF_MAX_SECONDS = 30.0
+
+# Finished jobs are kept this long so a repeated completion for the same game is ignored
+DONE_RETENTION_SECONDS = 7 * 24 * 3600
+
+# handler(payload, progress) -> awaitable; `progress` is persisted between attempts
+JobHandler = Callable[[dict, dict], Awaitable]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_key TEXT NOT NULL UNIQUE,
+    job_type TEXT NOT NULL,
+    game_id TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    progress TEXT NOT NULL DEFAULT '{}',
+    priority INTEGER NOT NULL DEFAULT 10,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (state, priority, available_at, id);
+"""
+
+
+def _parse_limits(spec: str) -> Dict[str, int]:
+    limits = {}
+    for item in spec.split(","):
+        name, sep, limit = item.partition("=")
+        if sep and name.strip() and limit.strip().isdigit():
+            limits[name.strip()] = max(1, int(limit))
+    return limits
+
+
+class JobQueue:
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, workers: int = DEFAULT_WORKERS,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS, backoff: float = 2.0,
+                 limits: Optional[Dict[str, int]] = None):
+        self.db_path = db_path
+        self.worker_count = workers
+        self.limits = _parse_limits(JOB_LIMITS) if limits is None else dict(limits)
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.handlers: Dict[str, JobHandler] = {}
+        self.workers: List[asyncio.Task] = []
+        self.running_jobs: Dict[int, asyncio.Task] = {}
+        self.wakeup: Optional[asyncio.Event] = None
+        self.accepting = True
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    # ---- storage -------------------------------------------------------
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if os.path.dirname(self.db_path):
+                os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def _execute(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._connection().execute(sql, params).fetchall()
+
+    async def _db(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        """Run a statement off the event loop"""
+        return await asyncio.to_thread(self._execute, sql, params)
+
+    def _claim_next(self) -> Optional[sqlite3.Row]:
+        """Atomically move the highest-priority ready job whose type is under its limit to 'running'"""
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                sql, params = "SELECT * FROM jobs WHERE state = 'pending' AND available_at <= ?", (now,)
+                if self.limits:
+                    running = dict(conn.execute(
+                        "SELECT job_type, COUNT(*) FROM jobs WHERE state = 'running' GROUP BY job_type"
+                    ).fetchall())
+                    full = [job_type for job_type, limit in self.limits.items() if running.get(job_type, 0) >= limit]
+                    if full:
+                        sql += f" AND job_type NOT IN ({', '.join('?' * len(full))})"
+                        params += tuple(full)
+                row = conn.execute(sql + " ORDER BY priority, available_at, id LIMIT 1", params).fetchone()
+                if row is not None:
+                    conn.execute(
+                        "UPDATE jobs SET state = 'running', attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                        (now, row["id"])
+                    )
+                conn.execute("COMMIT")
+                return row
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    # ---- public API ----------------------------------------------------
+
+    def register(self, job_type: str, handler: JobHandler):
+        """Set the coroutine function that runs jobs of a given type"""
+        self.handlers[job_type] = handler
+
+    async def enqueue(self, job_type: str, game_id: str, payload: dict,
+                      priority: int = PRIORITY_BACKFILL, job_key: Optional[str] = None) -> bool:
+        """Queue a job; one job per (type, game) unless a distinct `job_key` is given
+
+        Returns False if an identical job was already queued or has run.
+        """
+        if not self.accepting:
+            logger.warning(f"⚠️  Job queue shutting down, not accepting {job_type} for {game_id}", extra=game_fields(game_id))
+            return False
+
+        now = time.time()
+        job_key = job_key or f"{job_type}:{game_id}"
+        rows = await self._db(
+            "INSERT OR IGNORE INTO jobs (job_key, job_type, game_id, payload, priority, max_attempts, "
+            "available_at, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) RETURNING id",
+            (job_key, job_type, game_id, json.dumps(payload), priority, self.max_attempts, now, now, now)
+        )
+        if not rows:
+            logger.info(f"♻️  {job_type} job for {game_id} already queued, ignoring duplicate", extra=game_fields(game_id))
+            return False
+
+        logger.info(f"📥 Queued {job_type} job for {game_id} (priority {priority})", extra=game_fields(game_id))
+        if self.wakeup is not None:
+            self.wakeup.set()
+        return True
+
+    async def start(self):
+        """Recover jobs interrupted by a restart and start the worker pool"""
+        if self.workers:
+            return
+        self.accepting = True
+        self.wakeup = asyncio.Event()
+        recovered = await self._db(
+            "UPDATE jobs SET state = 'pending', updated_at = ? WHERE state = 'running' RETURNING id",
+            (time.time(),)
+        )
+        await self._db(
+            "DELETE FROM jobs WHERE state = 'done' AND updated_at < ?",
+            (time.time() - DONE_RETENTION_SECONDS,)
+        )
+        if recovered:
+            logger.info(f"🔄 Re-queued {len(recovered)} jobs interrupted by the last shutdown")
+
+        self.workers = [
+            asyncio.create_task(self._worker(i), name=f"job-worker-{i}")
+            for i in range(self.worker_count)
+        ]
+        logger.info(f"👷 Job queue started with {self.worker_count} workers ({self.db_path})")
+
+    async def _worker(self, index: int):
+        backoff = DB_ERROR_BACKOFF_SECONDS
+        while True:
+            try:
+                job = await asyncio.to_thread(self._claim_next)
+            except Exception as e:
+                # Never let a database hiccup end the worker: queued jobs would silently stall
+                logger.exception(f"💥 Job worker {index} could not claim a job, retrying in {backoff:g}s: {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, DB_ERROR_BACKOFF_MAX_SECONDS)
+                continue
+            backoff = DB_ERROR_BACKOFF_SECONDS
+            if job is None:
+                self.wakeup.clear()
+                try:
+                    # Poll as well so delayed retries are picked up
+                    await asyncio.wait_for(self.wakeup.wait(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            task = asyncio.current_task()
+            self.running_jobs[job["id"]] = task
+            try:
+                await self._run(job)
+            except Exception as e:
+                # Recording the outcome failed; the job stays 'running' and is re-queued on the next boot
+                logger.exception(f"💥 Job worker {index} could not record {job['job_type']} job {job['id']}: {e}")
+            finally:
+                self.running_jobs.pop(job["id"], None)
+                # A slot of this type is free again for jobs the limit held back
+                self.wakeup.set()
+
+    async def _run(self, job: sqlite3.Row):
+        handler = self.handlers.get(job["job_type"])
+        progress = json.loads(job["progress"] or "{}")
+        attempts = job["attempts"] + 1  # the row was read just before it was claimed
+        try:
+            if handler is None:
+                raise RuntimeError(f"No handler registered for {job['job_type']}")
+            await handler(json.loads(job["payload"]), progress)
+        except asyncio.CancelledError:
+            # Interrupted by shutdown: leave it pending for the next boot
+            await self._db(
+                "UPDATE jobs SET state = 'pending', progress = ?, updated_at = ? WHERE id = ?",
+                (json.dumps(progress), time.time(), job["id"])
+            )
+            raise
+        except Exception as e:
+            if attempts >= job["max_attempts"]:
+                logger.exception(f"☠️  {job['job_type']} job for {job['game_id']} dead-lettered after {attempts} attempts: {e}",
+                                 extra=game_fields(job["game_id"]))
+                await self._db(
+                    "UPDATE jobs SET state = 'dead', progress = ?, last_error = ?, updated_at = ? WHERE id = ?",
+                    (json.dumps(progress), str(e), time.time(), job["id"])
+                )
+            else:
+                delay = self.backoff * (2 ** (attempts - 1))
+                logger.warning(f"🔁 {job['job_type']} job for {job['game_id']} failed ({e}), retrying in {delay:g}s",
+                               extra=game_fields(job["game_id"]))
+                await self._db(
+                    "UPDATE jobs SET state = 'pending', progress = ?, last_error = ?, available_at = ?, "
+                    "updated_at = ? WHERE id = ?",
+                    (json.dumps(progress), str(e), time.time() + delay, time.time(), job["id"])
+                )
+            return
+
+        await self._db(
+            "UPDATE jobs SET state = 'done', progress = ?, updated_at = ? WHERE id = ?",
+            (json.dumps(progress), time.time(), job["id"])
+        )
+
+    async def stop(self, timeout: float = 10.0):
+        """Stop taking work, give running jobs `timeout` seconds, then cancel everything"""
+        self.accepting = False
+        if not self.workers:
+            return
+
+        idle = [task for task in self.workers if task not in self.running_jobs.values()]
+        for task in idle:
+            task.cancel()
+        busy = list(self.running_jobs.values())
+        if busy:
+            logger.info(f"⏳ Waiting up to {timeout:g}s for {len(busy)} running jobs...")
+            done, still_running = await asyncio.wait(busy, timeout=timeout)
+            for task in still_running:
+                task.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+    async def requeue_dead(self, game_id: Optional[str] = None) -> int:
+        """Move dead-lettered jobs back to pending (all, or one game's)"""
+        sql = ("UPDATE jobs SET state = 'pending', attempts = 0, available_at = ?, updated_at = ? "
+               "WHERE state = 'dead'")
+        params = (time.time(), time.time())
+        if game_id:
+            sql += " AND game_id = ?"
+            params += (game_id,)
+        rows = await self._db(sql + " RETURNING id", params)
+        if rows and self.wakeup is not None:
+            self.wakeup.set()
+        return len(rows)
+
+    async def dead_letters(self, limit: int = 50) -> List[Dict]:
+        rows = await self._db(
+            "SELECT id, job_type, game_id, attempts, last_error, updated_at FROM jobs "
+            "WHERE state = 'dead' ORDER BY updated_at DESC LIMIT ?", (limit,)
+        )
+        return [dict(row) for row in rows]
+
+    async def stats(self) -> Dict[str, Dict[str, int]]:
+        """Job counts per type and state, with each type's concurrency limit"""
+        rows = await self._db("SELECT job_type, state, COUNT(*) AS n FROM jobs GROUP BY job_type, state")
+        stats: Dict[str, Dict[str, int]] = {}
+        for row in rows:
+            counts = stats.setdefault(row["job_type"], {"limit": self.limits.get(row["job_type"], self.worker_count),
+                                                         "pending": 0, "running": 0, "done": 0, "dead": 0})
+            counts[row["state"]] = row["n"]
+        return stats
+
+    async def jobs_for(self, game_id: str) -> List[Dict]:
+        """Every job queued for one game, newest first"""
+        rows = await self._db(
+            "SELECT id, job_type, state, attempts, last_error, updated_at FROM jobs "
+            "WHERE game_id = ? ORDER BY id DESC", (game_id,)
+        )
+        return [dict(row) for row in rows]
+
+
+# Global instance
+job_queue = JobQueue()
@@ -11,19 +11,16 @@ import asyncio
 from typing import Dict, Optional, List, Any
 from dotenv import load_dotenv
 
+from src.utils.log import get_logger
+from src.utils.metrics import track_llm_call
+
+logger = get_logger("letta")
+
 # Load environment variables from backend/.env
 backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))  # Go up 3 levels from src/services/letta_service.py
 env_path = os.path.join(backend_dir, '.env')
 load_dotenv(env_path)
 
-try:
-    from letta_client import Letta
-except ImportError:
-    print("⚠️  letta-client not installed. Run: pip install letta-client")
-    Letta = None
-
-import httpx
-
 class LettaPersonalityService:
     def __init__(self):
         """Initialize Letta client and personality management"""
@@ -32,13 +29,19 @@ class LettaPersonalityService:
         self.game_stats = {}  # Track wins/losses for rivalries
         self.initialized = False
         
-        # Initialize Letta client
-        self._init_letta_client()
+        # The Letta SDK is imported on first use (initialize_personalities), not at server import
+        self._client_checked = False
     
     def _init_letta_client(self):
         """Initialize Letta client with proper error handling"""
-        if not Letta:
-            print("⚠️  Letta client not available - install letta-client")
+        if self._client_checked:
+            return
+        self._client_checked = True
+        
+        try:
+            from letta_client import Letta
+        except ImportError:
+            logger.warning("⚠️  letta-client not installed. Run: pip install letta-client")
             return
         
         try:
@@ -46,30 +49,32 @@ class LettaPersonalityService:
             letta_base_url = os.getenv("LETTA_BASE_URL", "https://api.letta.com")
             
             if not letta_api_key:
-                print("⚠️  LETTA_API_KEY not found - personality features disabled")
+                logger.warning("⚠️  LETTA_API_KEY not found - personality features disabled")
                 return
             
             if "heree" in letta_api_key:
-                print("⚠️  Please fix the typo in LETTA_API_KEY and add your real key")
+                logger.warning("⚠️  Please fix the typo in LETTA_API_KEY and add your real key")
                 return
             
             self.letta_client = Letta(token=letta_api_key)
-            print("✅ Letta client initialized successfully")
+            logger.info("✅ Letta client initialized successfully")
             
         except Exception as e:
-            print(f"❌ Failed to initialize Letta client: {e}")
+            logger.error(f"❌ Failed to initialize Letta client: {e}")
     
     async def initialize_personalities(self):
         """Create Letta agents for each AI model with unique personalities"""
+        # Importing the SDK and creating agents are blocking calls, so both run in a thread
+        await asyncio.to_thread(self._init_letta_client)
         if not self.letta_client:
-            print("❌ Letta client is None - cannot initialize personalities")
+            logger.warning("⚠️  Letta client is None - cannot initialize personalities")
             return
             
         if self.initialized:
-            print("✅ Letta personas already initialized")
+            logger.info("✅ Letta personas already initialized")
             return
             
-        print("🎭 Starting personality initialization...")
+        logger.info("🎭 Starting personality initialization...")
         
         personalities = {
             "gpt-4o-mini": {
@@ -96,10 +101,11 @@ class LettaPersonalityService:
         
         try:
             for model_id, personality in personalities.items():
-                print(f"🔄 Creating personality for {model_id}: {personality['name']}...")
+                logger.info(f"🔄 Creating personality for {model_id}: {personality['name']}...")
                 
                 try:
-                    agent = self.letta_client.agents.create(
+                    agent = await asyncio.to_thread(
+                        self.letta_client.agents.create,
                         memory_blocks=[
                             {
                                 "label": "persona",
@@ -134,23 +140,30 @@ class LettaPersonalityService:
                         "win_streaks": {"current": 0, "best": 0}
                     }
                     
-                    print(f"✅ Created {personality['name']} (Agent ID: {agent.id})")
+                    logger.info(f"✅ Created {personality['name']} (Agent ID: {agent.id})")
                 
                 except Exception as e:
-                    print(f"❌ Failed to create personality for {model_id}: {e}")
+                    logger.error(f"❌ Failed to create personality for {model_id}: {e}")
                     # Continue with other personalities instead of failing completely
                     continue
             
             if len(self.model_personalities) > 0:
                 self.initialized = True
-                print(f"🎭 Successfully initialized {len(self.model_personalities)}/{len(personalities)} AI personalities!")
+                logger.info(f"🎭 Successfully initialized {len(self.model_personalities)}/{len(personalities)} AI personalities!")
             else:
-                print(f"❌ Failed to initialize any personalities!")
+                logger.error(f"❌ Failed to initialize any personalities!")
             
         except Exception as e:
-            print(f"❌ Failed to initialize personalities: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"❌ Failed to initialize personalities: {e}")
+    
+    async def _message_agent(self, agent_id: str, content: str):
+        """Send one user message to a Letta agent without blocking the event loop"""
+        with track_llm_call("letta"):
+            return await asyncio.to_thread(
+                self.letta_client.agents.messages.create,
+                agent_id=agent_id,
+                messages=[{"role": "user", "content": content}]
+            )
     
     async def update_match_memories(self, game_type: str, winner_model: str, loser_model: str, game_data: dict):
         """Update both winner and loser personalities with detailed match data"""
@@ -166,7 +179,7 @@ class LettaPersonalityService:
             loser_info = self.model_personalities.get(loser_model, {})
             
             if not winner_info or not loser_info:
-                print(f"⚠️  Missing personality info for {winner_model} or {loser_model}")
+                logger.warning(f"⚠️  Missing personality info for {winner_model} or {loser_model}")
                 return
             
             # Update winner's memory
@@ -178,12 +191,9 @@ Current win streak: {self.game_stats[winner_model]['win_streaks']['current']} ga
 Total wins: {self.game_stats[winner_model]['total_wins']}
             """
             
-            self.letta_client.agents.messages.create(
-                agent_id=winner_info["agent_id"],
-                messages=[{
-                    "role": "user", 
-                    "content": f"Update your competition history with this victory: {winner_update}"
-                }]
+            await self._message_agent(
+                winner_info["agent_id"],
+                f"Update your competition history with this victory: {winner_update}"
             )
             
             # Update loser's memory
@@ -194,18 +204,15 @@ Win streak broken. Total losses: {self.game_stats[loser_model]['total_losses']}
 Need to study this loss and come back stronger.
             """
             
-            self.letta_client.agents.messages.create(
-                agent_id=loser_info["agent_id"],
-                messages=[{
-                    "role": "user",
-                    "content": f"Update your competition history with this loss: {loser_update}"
-                }]
+            await self._message_agent(
+                loser_info["agent_id"],
+                f"Update your competition history with this loss: {loser_update}"
             )
             
-            print(f"🧠 Updated memories: {winner_info['name']} (winner) and {loser_info['name']} (loser)")
+            logger.info(f"🧠 Updated memories: {winner_info['name']} (winner) and {loser_info['name']} (loser)")
             
         except Exception as e:
-            print(f"❌ Failed to update match memories: {e}")
+            logger.error(f"❌ Failed to update match memories: {e}")
     
     async def _update_game_stats(self, winner_model: str, loser_model: str, game_type: str):
         """Update internal game statistics"""
@@ -236,30 +243,24 @@ Need to study this loss and come back stronger.
                                           winner: int, game_type: str, game_data: dict):
         """Generate personality-driven post-game interview responses"""
         if not self.letta_client or not self.initialized:
-            print(f"❌ Letta not initialized: client={bool(self.letta_client)}, initialized={self.initialized}")
-            print(f"🎯 Using fallback roast generation...")
+            logger.warning(f"⚠️  Letta not initialized (client={bool(self.letta_client)}, initialized={self.initialized}), "
+                           f"using fallback roast generation")
             return self._generate_fallback_roast(player1_model, player2_model, winner, game_type, game_data)
         
         try:
             winner_model = player1_model if winner == 1 else player2_model
             loser_model = player2_model if winner == 1 else player1_model
             
-            print(f"🎯 Interview generation debug:")
-            print(f"   Player 1: {player1_model}, Player 2: {player2_model}")
-            print(f"   Winner: {winner} = {winner_model}")
-            print(f"   Loser: {3-winner} = {loser_model}")
-            print(f"   Available personalities: {list(self.model_personalities.keys())}")
+            logger.debug(f"🎯 Interview for {game_type}: winner {winner} = {winner_model}, loser {3-winner} = {loser_model}, "
+                         f"personalities: {list(self.model_personalities.keys())}")
             
             winner_info = self.model_personalities.get(winner_model, {})
             loser_info = self.model_personalities.get(loser_model, {})
             
-            print(f"   Winner info: {bool(winner_info)} - {winner_info.get('name', 'NO NAME')}")
-            print(f"   Loser info: {bool(loser_info)} - {loser_info.get('name', 'NO NAME')}")
             
             if not winner_info or not loser_info:
-                print(f"❌ Missing personality info for interviews")
-                print(f"   Winner info keys: {list(winner_info.keys()) if winner_info else 'NONE'}")
-                print(f"   Loser info keys: {list(loser_info.keys()) if loser_info else 'NONE'}")
+                logger.error(f"❌ Missing personality info for interviews "
+                             f"(winner {winner_model}: {bool(winner_info)}, loser {loser_model}: {bool(loser_info)})")
                 return None
             
             # Trash talk questions for the winner only
@@ -278,16 +279,13 @@ Need to study this loss and come back stronger.
             # Winner trash talk only
             roast_question = random.choice(roast_questions)
             
-            print(f"🎤 Generating roast from {winner_info['name']} about {loser_info.get('name', loser_model)}")
-            print(f"   Agent ID: {winner_info.get('agent_id', 'MISSING')}")
-            print(f"   Question: {roast_question}")
+            logger.info(f"🎤 Generating roast from {winner_info['name']} about {loser_info.get('name', loser_model)}")
+            logger.debug(f"Agent {winner_info.get('agent_id', 'MISSING')} asked: {roast_question}")
             
             try:
-                winner_response = self.letta_client.agents.messages.create(
-                    agent_id=winner_info["agent_id"],
-                    messages=[{
-                        "role": "user",
-                        "content": f"""
+                winner_response = await self._message_agent(
+                    winner_info["agent_id"],
+                    f"""
 🎤 VICTORY INTERVIEW! You just DESTROYED {loser_info.get('name', loser_model)} in {game_type}!
 
 Reporter: "{roast_question}"
@@ -303,11 +301,10 @@ ROAST TIME! Respond as {winner_info['name']} with pure TRASH TALK in 2-3 sentenc
 
 Destroy them with words:
                         """
-                    }]
                 )
-                print(f"✅ Letta response received")
+                logger.debug(f"✅ Letta response received")
             except Exception as e:
-                print(f"❌ Letta API call failed: {e}")
+                logger.error(f"❌ Letta API call failed: {e}")
                 raise
             
             # Extract winner response
@@ -323,16 +320,14 @@ Destroy them with words:
             
             # NO LOSER INTERVIEW - Winners only! 🏆
             
-            print(f"🎤 Generated ROAST from {winner_info['name']} destroying {loser_info['name']}!")
+            logger.info(f"🎤 Generated ROAST from {winner_info['name']} destroying {loser_info['name']}!")
             return interviews
             
         except Exception as e:
-            print(f"❌ Failed to generate interviews: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"❌ Failed to generate interviews: {e}")
             
             # Fallback: Generate simple roasts without Letta
-            print(f"🎯 Generating fallback roast...")
+            logger.info(f"🎯 Generating fallback roast...")
             return self._generate_fallback_roast(player1_model, player2_model, winner, game_type, game_data)
     
     def _generate_fallback_roast(self, player1_model: str, player2_model: str, winner: int, game_type: str, game_data: dict):
@@ -380,7 +375,7 @@ Destroy them with words:
                     return msg.content.strip()
             return "No response generated"
         except Exception as e:
-            print(f"Failed to extract response: {e}")
+            logger.error(f"Failed to extract response: {e}")
             return "Interview response unavailable"
     
     async def convert_to_voice_with_vapi(self, text: str, voice_style: str = "default"):
@@ -390,14 +385,14 @@ Destroy them with words:
         
         # First try ElevenLabs if configured
         if elevenlabs_api_key and "heree" not in elevenlabs_api_key:
-            print(f"🎙️ Using ElevenLabs for voice synthesis ({voice_style})")
+            logger.info(f"🎙️ Using ElevenLabs for voice synthesis ({voice_style})")
             audio_bytes = await self._convert_with_elevenlabs(text, voice_style, elevenlabs_api_key)
             if audio_bytes:
                 return audio_bytes
             else:
-                print("⚠️  ElevenLabs failed, falling back to OpenAI TTS")
+                logger.warning("⚠️  ElevenLabs failed, falling back to OpenAI TTS")
         else:
-            print("⚠️  ElevenLabs API key not configured - using OpenAI TTS fallback")
+            logger.warning("⚠️  ElevenLabs API key not configured - using OpenAI TTS fallback")
         
         # Fallback to OpenAI TTS
         return await self._convert_with_openai_tts(text, voice_style)
@@ -445,6 +440,8 @@ Destroy them with words:
         
         voice_config = elevenlabs_voice_configs.get(voice_style, elevenlabs_voice_configs["default"])
         
+        import httpx
+        
         try:
             async with httpx.AsyncClient(timeout=30.0) as client:
                 # ElevenLabs text-to-speech endpoint
@@ -468,14 +465,14 @@ Destroy them with words:
                 )
                 
                 if response.status_code == 200:
-                    print(f"✅ ElevenLabs voice synthesis successful ({len(response.content)} bytes)")
+                    logger.info(f"✅ ElevenLabs voice synthesis successful ({len(response.content)} bytes)")
                     return response.content
                 else:
-                    print(f"❌ ElevenLabs API error {response.status_code}: {response.text}")
+                    logger.error(f"❌ ElevenLabs API error {response.status_code}: {response.text}")
                     return None
                     
         except Exception as e:
-            print(f"❌ ElevenLabs synthesis error: {e}")
+            logger.error(f"❌ ElevenLabs synthesis error: {e}")
             return None
     
     async def _convert_with_openai_tts(self, text: str, voice_style: str):
@@ -491,6 +488,8 @@ Destroy them with words:
         
         voice_config = openai_voice_configs.get(voice_style, openai_voice_configs["default"])
         
+        import httpx
+        
         try:
             async with httpx.AsyncClient(timeout=30.0) as client:
                 response = await client.post(
@@ -508,14 +507,14 @@ Destroy them with words:
                 )
                 
                 if response.status_code == 200:
-                    print(f"✅ OpenAI TTS synthesis successful ({len(response.content)} bytes)")
+                    logger.info(f"✅ OpenAI TTS synthesis successful ({len(response.content)} bytes)")
                     return response.content
                 else:
-                    print(f"❌ OpenAI TTS failed: {response.text}")
+                    logger.error(f"❌ OpenAI TTS failed: {response.text}")
                     return None
                     
         except Exception as e:
-            print(f"❌ OpenAI TTS synthesis error: {e}")
+            logger.error(f"❌ OpenAI TTS synthesis error: {e}")
             return None
     
     def get_personality_stats(self):
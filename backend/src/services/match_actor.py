@@ -0,0 +1,255 @@
+"""
+Per-match actors
+Each live match is owned by one actor: a task that takes typed commands off a mailbox and
+handles them one at a time, so game state is only ever touched from that task and handlers
+need no locks. A handler that has to wait on a model returns an Effect: the slow part runs
+outside the mailbox (other commands keep flowing) and its result comes back as a message,
+so the state change it leads to is serialized like any other command.
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from src.utils.metrics import ACTOR_COMMANDS, ACTOR_MAILBOX_WAIT
+
+# An actor's task exits after this long with an empty mailbox; the next command restarts it
+IDLE_SECONDS = float(os.getenv("VERSUS_ACTOR_IDLE_SECONDS", "30"))
+
+
+# Commands (replies are the handler's response dict)
+
+@dataclass(frozen=True)
+class AnswerQuestion:
+    """Trivia: ask `player` their current question"""
+    player: int
+
+
+@dataclass(frozen=True)
+class PlayConnectionsTurn:
+    """Connections: have `player`'s model make one guess"""
+    player: int
+
+
+@dataclass(frozen=True)
+class GuessWord:
+    """Wordle: have `model` ("openai" or "anthropic") make one guess"""
+    model: str
+
+
+class ActorBusy(Exception):
+    """The command's player already has a turn in progress"""
+
+
+@dataclass
+class Effect:
+    """Returned by a handler: run `work` outside the mailbox, then `apply(result)` inside it"""
+    work: Callable[[], Awaitable[Any]]
+    apply: Callable[[Any], Awaitable[Any]]
+    # Released once applied; while held, commands for the same player are refused
+    player: Optional[str] = None
+
+
+@dataclass
+class _Envelope:
+    command: Any
+    reply: asyncio.Future
+    enqueued_at: float
+
+
+@dataclass
+class _Applied:
+    """Internal message: an Effect's work finished (or raised)"""
+    effect: Effect
+    result: Any
+    error: Optional[BaseException]
+    reply: asyncio.Future
+
+
+class MatchActor:
+    game_type = "match"
+
+    def __init__(self, game_id: str):
+        self.game_id = game_id
+        self.mailbox: asyncio.Queue = asyncio.Queue()
+        self.handlers: Dict[type, Callable[[Any], Awaitable[Any]]] = {}
+        self.busy_players: Set[str] = set()
+        self.effects: Set[asyncio.Task] = set()
+        # Effects started but not yet applied; `settled` is set when there are none
+        self.unapplied = 0
+        self.settled = asyncio.Event()
+        self.settled.set()
+        self.task: Optional[asyncio.Task] = None
+        self.stopped = False
+        self.on_idle: Optional[Callable[["MatchActor"], None]] = None
+        # Throughput
+        self.commands = 0
+        self.busy_seconds = 0.0
+        self.max_depth = 0
+        self.created_at = time.monotonic()
+
+    def on(self, command_type: type, handler: Callable[[Any], Awaitable[Any]]):
+        self.handlers[command_type] = handler
+
+    async def ask(self, command: Any) -> Any:
+        """Send a command and wait for its reply"""
+        if type(command) not in self.handlers:
+            raise TypeError(f"{type(self).__name__} has no handler for {type(command).__name__}")
+        reply = asyncio.get_running_loop().create_future()
+        self.mailbox.put_nowait(_Envelope(command, reply, time.monotonic()))
+        self.max_depth = max(self.max_depth, self.mailbox.qsize())
+        self._ensure_running()
+        return await reply
+
+    def _ensure_running(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run(), name=f"actor-{self.game_type}-{self.game_id[:8]}")
+
+    async def _run(self):
+        while True:
+            try:
+                message = await asyncio.wait_for(self.mailbox.get(), IDLE_SECONDS)
+            except asyncio.TimeoutError:
+                if self.mailbox.empty() and not self.effects:
+                    if self.on_idle is not None:
+                        self.on_idle(self)
+                    return
+                continue
+            if isinstance(message, _Applied):
+                await self._apply(message)
+            else:
+                await self._handle(message)
+
+    async def _handle(self, envelope: _Envelope):
+        command_name = type(envelope.command).__name__
+        ACTOR_MAILBOX_WAIT.observe(time.monotonic() - envelope.enqueued_at, self.game_type)
+        ACTOR_COMMANDS.inc(self.game_type, command_name)
+        self.commands += 1
+        start = time.monotonic()
+        try:
+            result = await self.handlers[type(envelope.command)](envelope.command)
+        except Exception as e:
+            if not envelope.reply.done():
+                envelope.reply.set_exception(e)
+            return
+        finally:
+            self.busy_seconds += time.monotonic() - start
+
+        if isinstance(result, Effect):
+            if result.player is not None:
+                if result.player in self.busy_players:
+                    envelope.reply.set_exception(ActorBusy(f"{result.player} already has a turn in progress"))
+                    return
+                self.busy_players.add(result.player)
+            self.unapplied += 1
+            self.settled.clear()
+            task = asyncio.create_task(self._work(result, envelope.reply))
+            self.effects.add(task)
+            task.add_done_callback(self.effects.discard)
+        elif not envelope.reply.done():
+            envelope.reply.set_result(result)
+
+    async def _work(self, effect: Effect, reply: asyncio.Future):
+        try:
+            result, error = await effect.work(), None
+        except asyncio.CancelledError:
+            self.busy_players.discard(effect.player)
+            self._effect_done()
+            if not reply.done():
+                reply.cancel()
+            raise
+        except Exception as e:
+            result, error = None, e
+        self.mailbox.put_nowait(_Applied(effect, result, error, reply))
+        self._ensure_running()
+
+    async def _apply(self, applied: _Applied):
+        self.busy_players.discard(applied.effect.player)
+        start = time.monotonic()
+        try:
+            if applied.error is not None:
+                raise applied.error
+            result = await applied.effect.apply(applied.result)
+        except Exception as e:
+            if not applied.reply.done():
+                applied.reply.set_exception(e)
+        else:
+            if not applied.reply.done():
+                applied.reply.set_result(result)
+        finally:
+            self.busy_seconds += time.monotonic() - start
+            self._effect_done()
+
+    def _effect_done(self):
+        self.unapplied -= 1
+        if self.unapplied <= 0:
+            self.unapplied = 0
+            self.settled.set()
+
+    async def stop(self, timeout: float = 0.0):
+        """Let model calls in progress finish and apply for up to `timeout` seconds, then cancel the rest"""
+        if timeout > 0 and not self.settled.is_set():
+            try:
+                await asyncio.wait_for(self.settled.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        self.stopped = True
+        tasks = [task for task in [self.task, *self.effects] if task is not None and not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        while not self.mailbox.empty():
+            message = self.mailbox.get_nowait()
+            if not message.reply.done():
+                message.reply.cancel()
+
+    def stats(self) -> Dict:
+        age = time.monotonic() - self.created_at
+        return {
+            "game_type": self.game_type,
+            "running": self.task is not None and not self.task.done(),
+            "mailbox": self.mailbox.qsize(),
+            "max_mailbox": self.max_depth,
+            "turns_in_progress": sorted(self.busy_players),
+            "commands": self.commands,
+            "commands_per_minute": round(self.commands / age * 60, 2) if age > 0 else 0.0,
+            "busy_ms": round(self.busy_seconds * 1000, 1)
+        }
+
+
+class MatchActors:
+    """Registry of running actors by game id
+
+    An actor is created on a match's first command and dropped when it goes idle; the game
+    object it owned stays in its store, and the next command starts a fresh actor for it.
+    Get the actor and send to it without an await in between, so a match never has two.
+    """
+
+    def __init__(self):
+        self.actors: Dict[str, MatchActor] = {}
+
+    def get(self, game_id: str, factory: Callable[[], MatchActor]) -> MatchActor:
+        actor = self.actors.get(game_id)
+        if actor is None or actor.stopped:
+            actor = self.actors[game_id] = factory()
+            actor.on_idle = self._forget
+        return actor
+
+    def _forget(self, actor: MatchActor):
+        if self.actors.get(actor.game_id) is actor:
+            del self.actors[actor.game_id]
+
+    async def stop(self, timeout: float = 0.0):
+        """Stop every actor, first giving turns already in progress up to `timeout` seconds to finish"""
+        actors = list(self.actors.values())
+        await asyncio.gather(*(actor.stop(timeout) for actor in actors), return_exceptions=True)
+        self.actors.clear()
+
+    def report(self) -> Dict:
+        return {game_id: actor.stats() for game_id, actor in self.actors.items()}
+
+
+# Global instance
+match_actors = MatchActors()
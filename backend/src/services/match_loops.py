@@ -0,0 +1,80 @@
+"""
+Match loop registry
+Guarantees each match is driven by exactly one game loop task, however many clients join
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Optional
+
+from src.utils.log import game_fields, get_logger
+
+logger = get_logger("matches")
+
+
+class MatchLoopRegistry:
+    def __init__(self):
+        self.tasks: Dict[str, asyncio.Task] = {}
+        # Set on shutdown: loops check it between turns and return, leaving state resumable
+        self.draining = False
+
+    def is_running(self, game_id: str) -> bool:
+        task = self.tasks.get(game_id)
+        return task is not None and not task.done()
+
+    def ensure(self, game_id: str, loop_factory: Callable[[], Awaitable]) -> bool:
+        """Start the loop for a match unless one is already running
+
+        Returns True if a new loop task was started, False if the match already
+        had one (the caller should just attach as a viewer) or the server is draining.
+        """
+        if self.is_running(game_id) or self.draining:
+            return False
+
+        task = asyncio.create_task(loop_factory(), name=f"match-loop:{game_id}")
+        self.tasks[game_id] = task
+        task.add_done_callback(lambda t: self._on_done(game_id, t))
+        return True
+
+    def _on_done(self, game_id: str, task: asyncio.Task):
+        if self.tasks.get(game_id) is task:
+            del self.tasks[game_id]
+        if task.cancelled():
+            logger.info(f"🛑 Match loop for {game_id} cancelled", extra=game_fields(game_id))
+            return
+        error = task.exception()
+        if error is not None:
+            logger.error(f"❌ Match loop for {game_id} crashed: {error}", exc_info=error, extra=game_fields(game_id))
+
+    def get(self, game_id: str) -> Optional[asyncio.Task]:
+        return self.tasks.get(game_id)
+
+    async def cancel(self, game_id: str):
+        task = self.tasks.get(game_id)
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+
+    def running_count(self) -> int:
+        return sum(1 for task in self.tasks.values() if not task.done())
+
+    async def drain(self, timeout: float = 10.0):
+        """Ask every loop to stop at its next turn boundary; cancel whatever is still running at `timeout`"""
+        self.draining = True
+        pending = [task for task in self.tasks.values() if not task.done()]
+        if not pending:
+            return
+
+        logger.info(f"⏳ Waiting for {len(pending)} match loops to finish their turn (up to {timeout:g}s)...")
+        _, still_running = await asyncio.wait(pending, timeout=timeout)
+        for task in still_running:
+            task.cancel()
+        if still_running:
+            await asyncio.gather(*still_running, return_exceptions=True)
+            logger.warning(f"🛑 Cancelled {len(still_running)} match loops mid-turn")
+
+
+# Global instance
+match_loops = MatchLoopRegistry()
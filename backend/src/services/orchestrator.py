@@ -0,0 +1,123 @@
+"""
+Server-side match orchestrator
+Drives the turn loop of a client-paced game (Trivia, Wordle, Connections) on the server: each
+player gets its own loop that sends turn commands to the match's actor, through the same turn
+guard as the manual POST endpoints, and results reach viewers over the match's websocket topic.
+A match being driven here still accepts manual turns; they just take turns with the loop.
+"""
+
+import asyncio
+import os
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List
+
+from src.services.match_actor import ActorBusy, MatchActor
+from src.services.match_loops import match_loops
+from src.services.turn_guard import TurnConflict, turn_guard
+from src.utils.log import game_fields, get_logger
+
+logger = get_logger("autoplay")
+
+# Seconds each player waits between turns (0 = back to back)
+DEFAULT_TURN_DELAY = float(os.getenv("VERSUS_AUTOPLAY_TURN_DELAY_SECONDS", "1"))
+# Per player; Wordle and Connections have no turn limit of their own
+MAX_TURNS = int(os.getenv("VERSUS_AUTOPLAY_MAX_TURNS", "30"))
+# Turns in a row that fail or don't advance before a player's loop gives up
+MAX_STALLS = int(os.getenv("VERSUS_AUTOPLAY_MAX_STALLS", "3"))
+# Wait after yielding a turn to a manual request
+CONFLICT_BACKOFF = 0.5
+
+
+@dataclass
+class TurnLoop:
+    """What the orchestrator needs to know to drive one match"""
+    game_type: str
+    players: List[str]
+    actor: Callable[[], MatchActor]  # the match's actor (get-or-create)
+    command: Callable[[str], Any]  # command that plays `player`'s next turn
+    next_turn: Callable[[str], int]  # 1-based number of `player`'s next turn
+    finished: Callable[[str], bool]  # True once `player` has no turns left
+    publish: Callable[[Dict], Awaitable]  # push an event to the match's viewers
+
+
+class Orchestrator:
+    def __init__(self):
+        # game_id -> {"game_type", "turn_delay"} for every match driven here
+        self.matches: Dict[str, Dict] = {}
+
+    def is_driving(self, game_id: str) -> bool:
+        return game_id in self.matches and match_loops.is_running(game_id)
+
+    def start(self, game_id: str, loop: TurnLoop, turn_delay: float = DEFAULT_TURN_DELAY) -> bool:
+        """Start driving a match; False if it's already being driven or the server is draining"""
+        if match_loops.is_running(game_id):
+            return False
+        started = match_loops.ensure(game_id, lambda: self._run(game_id, loop, turn_delay))
+        if started:
+            self.matches[game_id] = {"game_type": loop.game_type, "turn_delay": turn_delay}
+            logger.info(f"▶️  Autoplaying {loop.game_type} match ({turn_delay:g}s between turns)",
+                        extra=game_fields(game_id))
+        return started
+
+    async def stop(self, game_id: str) -> bool:
+        """Hand a match back to manual play; a turn in flight still completes inside the actor"""
+        if game_id not in self.matches:
+            return False
+        self.matches.pop(game_id, None)
+        await match_loops.cancel(game_id)
+        return True
+
+    async def _run(self, game_id: str, loop: TurnLoop, turn_delay: float):
+        try:
+            await asyncio.gather(*(self._drive(game_id, loop, player, turn_delay) for player in loop.players))
+        finally:
+            # On drain the match stays registered so it can be resumed after a restart
+            if not match_loops.draining:
+                self.matches.pop(game_id, None)
+        if not match_loops.draining:
+            await loop.publish({"type": "autoplay_finished", "data": {"game_id": game_id}})
+
+    async def _drive(self, game_id: str, loop: TurnLoop, player: str, turn_delay: float):
+        turns = stalls = 0
+        while not loop.finished(player) and not match_loops.draining:
+            if turns >= MAX_TURNS:
+                logger.warning(f"⚠️  {player} reached the {MAX_TURNS}-turn autoplay limit", extra=game_fields(game_id))
+                break
+
+            turn = loop.next_turn(player)
+            try:
+                result, _ = await turn_guard.run(loop.game_type, game_id, player, lambda: loop.next_turn(player),
+                                                 lambda: loop.actor().ask(loop.command(player)))
+            except (TurnConflict, ActorBusy):
+                # A manual request is playing this turn; let it finish
+                await asyncio.sleep(CONFLICT_BACKOFF)
+                continue
+            except Exception as e:
+                result = {"error": str(e)}
+                logger.error(f"❌ Autoplay turn for {player} failed: {e}", extra=game_fields(game_id, turn))
+
+            if isinstance(result, dict) and result.get("cooldown_remaining"):
+                await asyncio.sleep(result["cooldown_remaining"])
+                continue
+
+            if loop.next_turn(player) > turn:
+                turns += 1
+                stalls = 0
+            else:
+                stalls += 1
+                if stalls >= MAX_STALLS:
+                    logger.warning(f"⚠️  Stopping autoplay for {player} after {stalls} turns without progress",
+                                   extra=game_fields(game_id, turn))
+                    reason = result.get("error", "no progress") if isinstance(result, dict) else "no progress"
+                    await loop.publish({"type": "autoplay_stopped", "data": {"player": player, "reason": reason}})
+                    break
+
+            if turn_delay > 0 and not loop.finished(player):
+                await asyncio.sleep(turn_delay)
+
+    def report(self) -> Dict:
+        return {game_id: dict(info, running=match_loops.is_running(game_id)) for game_id, info in self.matches.items()}
+
+
+# Global instance
+orchestrator = Orchestrator()
@@ -0,0 +1,100 @@
+"""
+Per-provider rate limits for batch runs
+Tournaments play many matches at once against the same provider quotas. Each model call first
+takes one of its provider's concurrent-call slots, then a request from the provider's per-minute
+budget (a token bucket, so a short burst goes straight through and a sustained one is spread out)
+"""
+
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+from src.services.admission import parse_limits
+from src.utils.common import model_provider
+
+# Requests per minute and concurrent calls per provider; VERSUS_PROVIDER_RPM_BY_PROVIDER="openai=500,anthropic=50"
+# (and VERSUS_PROVIDER_CONCURRENCY_BY_PROVIDER) override the defaults. A limit of 0 turns that check off
+DEFAULT_RPM = int(os.getenv("VERSUS_PROVIDER_RPM", "60"))
+RPM_BY_PROVIDER = os.getenv("VERSUS_PROVIDER_RPM_BY_PROVIDER", "")
+DEFAULT_CONCURRENCY = int(os.getenv("VERSUS_PROVIDER_CONCURRENCY", "8"))
+CONCURRENCY_BY_PROVIDER = os.getenv("VERSUS_PROVIDER_CONCURRENCY_BY_PROVIDER", "")
+# A full bucket holds this many seconds' worth of requests
+BURST_SECONDS = 10
+
+
+class TokenBucket:
+    def __init__(self, per_minute: int, burst_seconds: float = BURST_SECONDS):
+        self.rate = per_minute / 60
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+        self.waited = 0.0
+
+    async def acquire(self):
+        # Waiters queue on the lock, so requests go out in arrival order
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                delay = (1 - self.tokens) / self.rate
+                self.waited += delay
+                await asyncio.sleep(delay)
+
+
+class ProviderLimiter:
+    def __init__(self, rpm: Optional[Dict[str, int]] = None, concurrency: Optional[Dict[str, int]] = None,
+                 default_rpm: int = DEFAULT_RPM, default_concurrency: int = DEFAULT_CONCURRENCY):
+        self.rpm = {name.lower(): value for name, value in (rpm if rpm is not None else parse_limits(RPM_BY_PROVIDER)).items()}
+        self.concurrency = {name.lower(): value for name, value in
+                            (concurrency if concurrency is not None else parse_limits(CONCURRENCY_BY_PROVIDER)).items()}
+        self.default_rpm = default_rpm
+        self.default_concurrency = default_concurrency
+        self.buckets: Dict[str, Optional[TokenBucket]] = {}
+        self.semaphores: Dict[str, Optional[asyncio.Semaphore]] = {}
+        self.calls: Dict[str, int] = {}
+
+    def _limits(self, provider: str):
+        if provider not in self.buckets:
+            rpm = self.rpm.get(provider, self.default_rpm)
+            concurrency = self.concurrency.get(provider, self.default_concurrency)
+            self.buckets[provider] = TokenBucket(rpm) if rpm > 0 else None
+            self.semaphores[provider] = asyncio.Semaphore(concurrency) if concurrency > 0 else None
+        return self.buckets[provider], self.semaphores[provider]
+
+    @asynccontextmanager
+    async def slot(self, model_id: str):
+        """Hold one call's worth of `model_id`'s provider quota for the duration of the block"""
+        provider = model_provider(model_id).lower()
+        bucket, semaphore = self._limits(provider)
+        if semaphore is not None:
+            await semaphore.acquire()
+        try:
+            if bucket is not None:
+                await bucket.acquire()
+            self.calls[provider] = self.calls.get(provider, 0) + 1
+            yield
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+
+    def report(self) -> Dict:
+        return {
+            provider: {
+                "rpm": self.rpm.get(provider, self.default_rpm),
+                "concurrency": self.concurrency.get(provider, self.default_concurrency),
+                "calls": self.calls.get(provider, 0),
+                "throttled_seconds": round(bucket.waited, 1) if bucket is not None else 0.0
+            }
+            for provider, bucket in self.buckets.items()
+        }
+
+
+# Global instance
+provider_limiter = ProviderLimiter()
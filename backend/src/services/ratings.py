@@ -0,0 +1,243 @@
+"""
+Ratings
+Elo and Glicko ratings per model, overall and per game type, updated one finished match at a
+time. Each match is recorded once (by match ID) and updates only the two players' ratings; the
+ranked leaderboard of every scope it touches is rebuilt in the same transaction and stored
+ready to serve, so reading a leaderboard costs the same after ten matches or ten million.
+"""
+
+import asyncio
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from src.utils.log import game_fields, get_logger
+
+logger = get_logger("ratings")
+
+DEFAULT_DB_PATH = os.getenv("VERSUS_RATINGS_DB", os.path.join("data", "ratings.sqlite3"))
+INITIAL_RATING = 1500.0
+ELO_K = float(os.getenv("VERSUS_ELO_K", "32"))
+# Glicko rating deviation: new players start at the maximum, and an idle player's deviation grows
+# back towards it by GLICKO_C per day (about 100 days from a settled 50 back to 350)
+GLICKO_MAX_RD = 350.0
+GLICKO_MIN_RD = 30.0
+GLICKO_C = float(os.getenv("VERSUS_GLICKO_C", "34.6"))
+GLICKO_Q = math.log(10) / 400
+DAY = 86400
+
+OVERALL = "overall"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rated_matches (
+    match_id TEXT PRIMARY KEY,
+    game_type TEXT NOT NULL,
+    player1_model TEXT NOT NULL,
+    player2_model TEXT NOT NULL,
+    score REAL NOT NULL,
+    recorded_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ratings (
+    scope TEXT NOT NULL,
+    model TEXT NOT NULL,
+    elo REAL NOT NULL,
+    glicko REAL NOT NULL,
+    glicko_rd REAL NOT NULL,
+    games INTEGER NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0,
+    draws INTEGER NOT NULL DEFAULT 0,
+    losses INTEGER NOT NULL DEFAULT 0,
+    last_played REAL,
+    PRIMARY KEY (scope, model)
+);
+CREATE TABLE IF NOT EXISTS leaderboards (
+    scope TEXT PRIMARY KEY,
+    body TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+@dataclass
+class Rating:
+    model: str
+    elo: float = INITIAL_RATING
+    glicko: float = INITIAL_RATING
+    glicko_rd: float = GLICKO_MAX_RD
+    games: int = 0
+    wins: int = 0
+    draws: int = 0
+    losses: int = 0
+    last_played: Optional[float] = None
+
+    def current_rd(self, now: float) -> float:
+        """Deviation grown for the time since this model last played"""
+        if self.last_played is None:
+            return self.glicko_rd
+        days = max(0.0, now - self.last_played) / DAY
+        return min(GLICKO_MAX_RD, math.sqrt(self.glicko_rd ** 2 + GLICKO_C ** 2 * days))
+
+
+def elo_update(rating: float, opponent: float, score: float, k: float = ELO_K) -> float:
+    expected = 1 / (1 + 10 ** ((opponent - rating) / 400))
+    return rating + k * (score - expected)
+
+
+def glicko_update(rating: float, rd: float, opponent: float, opponent_rd: float, score: float) -> Tuple[float, float]:
+    """Glicko-1 update for a single game (one game per rating period)"""
+    g = 1 / math.sqrt(1 + 3 * GLICKO_Q ** 2 * opponent_rd ** 2 / math.pi ** 2)
+    expected = 1 / (1 + 10 ** (-g * (rating - opponent) / 400))
+    d_squared = 1 / (GLICKO_Q ** 2 * g ** 2 * expected * (1 - expected))
+    precision = 1 / rd ** 2 + 1 / d_squared
+    new_rating = rating + GLICKO_Q / precision * g * (score - expected)
+    return new_rating, max(GLICKO_MIN_RD, math.sqrt(1 / precision))
+
+
+def scope_for(game_type: str) -> str:
+    return game_type.lower()
+
+
+class Ratings:
+    """SQLite-backed ratings with one materialized leaderboard per scope; every method but record() blocks"""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        # scope -> ready-to-serve leaderboard, mirrored from the leaderboards table
+        self.boards: Dict[str, Dict] = {}
+        self._data_version: Optional[int] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if os.path.dirname(self.db_path):
+                os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def _load_rating(self, conn: sqlite3.Connection, scope: str, model: str) -> Rating:
+        row = conn.execute("SELECT * FROM ratings WHERE scope = ? AND model = ?", (scope, model)).fetchone()
+        if row is None:
+            return Rating(model)
+        return Rating(**{key: row[key] for key in row.keys() if key != "scope"})
+
+    def _save_rating(self, conn: sqlite3.Connection, scope: str, rating: Rating):
+        conn.execute(
+            "INSERT OR REPLACE INTO ratings (scope, model, elo, glicko, glicko_rd, games, wins, draws, losses, last_played) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (scope, rating.model, rating.elo, rating.glicko, rating.glicko_rd, rating.games, rating.wins,
+             rating.draws, rating.losses, rating.last_played)
+        )
+
+    def _build_board(self, conn: sqlite3.Connection, scope: str, now: float) -> Dict:
+        ratings = [Rating(**{key: row[key] for key in row.keys() if key != "scope"})
+                   for row in conn.execute("SELECT * FROM ratings WHERE scope = ?", (scope,))]
+
+        def entry(rank: int, rating: Rating, value: float, **extra) -> Dict:
+            return dict({"rank": rank, "model": rating.model, "rating": round(value, 1), "games": rating.games,
+                         "wins": rating.wins, "draws": rating.draws, "losses": rating.losses}, **extra)
+
+        by_elo = sorted(ratings, key=lambda rating: -rating.elo)
+        by_glicko = sorted(ratings, key=lambda rating: -rating.glicko)
+        return {
+            "scope": scope,
+            "matches": sum(rating.games for rating in ratings) // 2,
+            "updated_at": now,
+            "elo": [entry(rank, rating, rating.elo) for rank, rating in enumerate(by_elo, 1)],
+            "glicko": [entry(rank, rating, rating.glicko, rd=round(rating.glicko_rd, 1))
+                       for rank, rating in enumerate(by_glicko, 1)]
+        }
+
+    def record_sync(self, match_id: str, game_type: str, player1_model: str, player2_model: str,
+                    winner: Optional[int]) -> bool:
+        """Rate one finished match (winner 1, 2, or None for a draw); False if it was already rated"""
+        if player1_model == player2_model:
+            return False  # a mirror match says nothing about either side
+        score = {1: 1.0, 2: 0.0}.get(winner, 0.5)
+        now = time.time()
+        scopes = (OVERALL, scope_for(game_type))
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                inserted = conn.execute(
+                    "INSERT OR IGNORE INTO rated_matches (match_id, game_type, player1_model, player2_model, score, "
+                    "recorded_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (match_id, scope_for(game_type), player1_model, player2_model, score, now)
+                ).rowcount
+                if not inserted:
+                    conn.execute("ROLLBACK")
+                    return False
+
+                boards = {}
+                for scope in scopes:
+                    first = self._load_rating(conn, scope, player1_model)
+                    second = self._load_rating(conn, scope, player2_model)
+                    first_rd, second_rd = first.current_rd(now), second.current_rd(now)
+                    # Both sides are updated from the ratings they had going into the match
+                    first.elo, second.elo = (elo_update(first.elo, second.elo, score),
+                                             elo_update(second.elo, first.elo, 1 - score))
+                    (first.glicko, first.glicko_rd), (second.glicko, second.glicko_rd) = (
+                        glicko_update(first.glicko, first_rd, second.glicko, second_rd, score),
+                        glicko_update(second.glicko, second_rd, first.glicko, first_rd, 1 - score)
+                    )
+                    for rating, result in ((first, score), (second, 1 - score)):
+                        rating.games += 1
+                        rating.wins += result == 1.0
+                        rating.draws += result == 0.5
+                        rating.losses += result == 0.0
+                        rating.last_played = now
+                        self._save_rating(conn, scope, rating)
+
+                    boards[scope] = self._build_board(conn, scope, now)
+                    conn.execute("INSERT OR REPLACE INTO leaderboards (scope, body, updated_at) VALUES (?, ?, ?)",
+                                 (scope, json.dumps(boards[scope]), now))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            self.boards.update(boards)
+            self._data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        return True
+
+    async def record(self, match_id: str, game_type: str, player1_model: str, player2_model: str,
+                     winner: Optional[int]) -> bool:
+        """Rate a finished match off the event loop; a ratings failure never fails the caller"""
+        try:
+            recorded = await asyncio.to_thread(self.record_sync, match_id, game_type, player1_model,
+                                               player2_model, winner)
+        except Exception as e:
+            logger.error(f"❌ Could not rate {game_type} match {match_id}: {e}", extra=game_fields(match_id))
+            return False
+        if recorded:
+            outcome = {1: f"{player1_model} won", 2: f"{player2_model} won"}.get(winner, "draw")
+            logger.info(f"📈 Rated {game_type}: {player1_model} vs {player2_model}, {outcome}", extra=game_fields(match_id))
+        return recorded
+
+    def _refresh(self):
+        """Reload the stored boards if another connection (e.g. the tournament CLI) has written since"""
+        with self._lock:
+            conn = self._connection()
+            version = conn.execute("PRAGMA data_version").fetchone()[0]
+            if version == self._data_version:
+                return
+            self.boards = {row["scope"]: json.loads(row["body"]) for row in conn.execute("SELECT * FROM leaderboards")}
+            self._data_version = version
+
+    def leaderboard(self, scope: str = OVERALL) -> Dict:
+        """Ranked leaderboard for "overall" or a game type, as stored by the last rated match"""
+        self._refresh()
+        scope = scope_for(scope)
+        return self.boards.get(scope) or {"scope": scope, "matches": 0, "updated_at": None, "elo": [], "glicko": []}
+
+
+# Global instance
+ratings = Ratings()
@@ -0,0 +1,127 @@
+"""
+Startup readiness and background warmers
+The server binds and serves games straight away; slow setup (Letta agents, provider SDKs,
+puzzle and question banks) runs as supervised background warmers, and callers check or
+briefly wait on a warmer before using what it prepares
+"""
+
+import asyncio
+import os
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+from src.services.task_supervisor import task_supervisor
+from src.utils.log import get_logger
+
+logger = get_logger("startup")
+
+WARMUP_RETRIES = int(os.getenv("VERSUS_WARMUP_RETRIES", "3"))
+WARMUP_BACKOFF = float(os.getenv("VERSUS_WARMUP_BACKOFF_SECONDS", "2"))
+# How long a request may wait on a warmer that is still running before degrading
+WARMUP_WAIT = float(os.getenv("VERSUS_WARMUP_WAIT_SECONDS", "5"))
+
+
+class WarmupSkipped(Exception):
+    """Raised by a warmer whose subsystem isn't configured; it is not retried"""
+
+
+class Warmer:
+    def __init__(self, name: str, warm: Callable[[], Awaitable]):
+        self.name = name
+        self.warm = warm
+        self.state = "pending"  # pending -> warming (-> retrying -> warming) -> ready | failed | skipped
+        self.error: Optional[str] = None
+        self.attempts = 0
+        self.started_at: Optional[float] = None
+        self.duration: Optional[float] = None
+        self.done = asyncio.Event()
+
+    def to_dict(self) -> Dict:
+        return {
+            "state": self.state,
+            "attempts": self.attempts,
+            "error": self.error,
+            "duration_ms": round(self.duration * 1000) if self.duration is not None else None
+        }
+
+
+class Readiness:
+    def __init__(self):
+        self.warmers: Dict[str, Warmer] = {}
+        self.serving = False  # set once the critical startup path has finished
+        self.draining = False  # set when shutdown begins; no new matches are admitted
+        self.started_at = time.time()
+
+    def register(self, name: str, warm: Callable[[], Awaitable]):
+        """Add a warmer; `warm` is called once per attempt and raises to be retried"""
+        self.warmers[name] = Warmer(name, warm)
+
+    def start(self):
+        """Kick off every registered warmer in the background"""
+        for warmer in self.warmers.values():
+            if warmer.state != "pending":
+                continue
+            task = task_supervisor.submit("warmup", warmer.name, lambda warmer=warmer: self._attempt(warmer),
+                                          max_retries=WARMUP_RETRIES, backoff=WARMUP_BACKOFF)
+            if task is None:
+                warmer.state = "failed"
+                warmer.done.set()
+            else:
+                task.add_done_callback(lambda _, warmer=warmer: self._finish(warmer))
+
+    async def _attempt(self, warmer: Warmer):
+        warmer.state = "warming"
+        warmer.attempts += 1
+        warmer.started_at = warmer.started_at or time.monotonic()
+        try:
+            await warmer.warm()
+        except WarmupSkipped as e:
+            warmer.state = "skipped"
+            warmer.error = str(e)
+            logger.info(f"⏭️  Skipping {warmer.name} warm-up: {e}")
+            return
+        except Exception as e:
+            # The supervisor retries up to WARMUP_RETRIES times before giving up
+            warmer.state = "retrying" if warmer.attempts <= WARMUP_RETRIES else "failed"
+            warmer.error = str(e)
+            raise
+        warmer.state = "ready"
+        warmer.error = None
+        warmer.duration = time.monotonic() - warmer.started_at
+        logger.info(f"🔥 {warmer.name} warm in {warmer.duration * 1000:.0f}ms")
+
+    def _finish(self, warmer: Warmer):
+        if warmer.state in ("pending", "warming", "retrying"):
+            warmer.state = "failed"  # cancelled by shutdown
+        warmer.done.set()
+
+    def is_warm(self, name: str) -> bool:
+        warmer = self.warmers.get(name)
+        return warmer is not None and warmer.state == "ready"
+
+    async def wait_for(self, name: str, timeout: float = WARMUP_WAIT) -> bool:
+        """Wait (up to `timeout`) for a running warmer; True if its subsystem is warm"""
+        warmer = self.warmers.get(name)
+        if warmer is None:
+            return False
+        # A warmer that was never started (startup didn't run) has nothing to wait for
+        if warmer.state != "pending" and not warmer.done.is_set():
+            try:
+                await asyncio.wait_for(warmer.done.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return warmer.state == "ready"
+
+    def report(self) -> Dict:
+        subsystems = {name: warmer.to_dict() for name, warmer in self.warmers.items()}
+        return {
+            "ready": self.serving and not self.draining,
+            "draining": self.draining,
+            "warm": all(warmer.state in ("ready", "skipped") for warmer in self.warmers.values()),
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "subsystems": subsystems
+        }
+
+
+# Global instance
+readiness = Readiness()
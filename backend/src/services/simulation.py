@@ -0,0 +1,273 @@
+"""
+Bot simulations
+Plays thousands of bot-vs-bot games on the real game engines (no models, no server) to study
+strategies, hints and rule changes. Games are split into chunks and spread over a process pool;
+results come back chunk by chunk and are folded into running statistics (win rates, game length
+distribution, per-bot scores), so a long run can be watched as it converges.
+"""
+
+import logging
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.games.battleship import bots as battleship_bots
+from src.games.battleship.battleship import BattleshipGame, validate_config as validate_battleship_config
+from src.games.battleship.placement import sample_layouts
+from src.games.nyt_connections import bots as connections_bots
+from src.games.nyt_connections.connections_game import ConnectionsGame, load_puzzles
+from src.games.wordle import bots as wordle_bots
+from src.games.wordle.wordle_simple import WordleGame
+from src.utils.log import get_logger
+
+logger = get_logger("simulation")
+
+# Worker processes (0 = one per core) and games per task sent to a worker
+DEFAULT_WORKERS = int(os.getenv("VERSUS_SIM_WORKERS", "0")) or os.cpu_count() or 1
+DEFAULT_CHUNK_SIZE = int(os.getenv("VERSUS_SIM_CHUNK_SIZE", "25"))
+# Chunks queued per worker, so results stream back while the rest of the run is still pending
+IN_FLIGHT_PER_WORKER = 4
+
+BOTS = {
+    "battleship": battleship_bots.BOTS,
+    "wordle": wordle_bots.BOTS,
+    "connections": connections_bots.BOTS
+}
+# What a bot's per-game score counts
+SCORES = {"battleship": "hits", "wordle": "solved", "connections": "groups"}
+WORDLE_MAX_GUESSES = 6
+CONNECTIONS_MAX_GUESSES = 16
+
+# (winner, turns, score of bot 1, score of bot 2); winner 1 or 2 is a bot, 0 a draw
+GameResult = Tuple[int, int, int, int]
+
+
+@dataclass(frozen=True)
+class SimulationConfig:
+    game_type: str
+    bot1: str
+    bot2: str
+    games: int = 1000
+    seed: int = 0
+    workers: int = DEFAULT_WORKERS
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+    # Battleship only; None for the standard 8x8 board and fleet
+    board_size: Optional[int] = None
+    ships: Optional[Dict[str, int]] = None
+    no_touch: bool = False
+
+    def validate(self):
+        if self.game_type not in BOTS:
+            raise ValueError(f"Unknown game type '{self.game_type}' (expected one of: {', '.join(BOTS)})")
+        for bot in (self.bot1, self.bot2):
+            if bot not in BOTS[self.game_type]:
+                raise ValueError(f"Unknown {self.game_type} bot '{bot}' (expected one of: "
+                                 f"{', '.join(BOTS[self.game_type])})")
+        if self.games < 1 or self.workers < 1 or self.chunk_size < 1:
+            raise ValueError("games, workers and chunk_size must be at least 1")
+        if self.game_type == "battleship":
+            validate_battleship_config(self.board_size, self.ships, self.no_touch)
+
+    def engine_options(self) -> Dict:
+        """Extra keyword arguments for the game's engine"""
+        if self.game_type == "battleship":
+            return {"board_size": self.board_size, "ships": self.ships, "no_touch": self.no_touch}
+        return {}
+
+
+@dataclass
+class SimulationStats:
+    """Running totals; every field is a sum or a count, so chunks can be folded in any order"""
+    game_type: str
+    bots: Tuple[str, str]
+    games: int = 0
+    wins: List[int] = field(default_factory=lambda: [0, 0])
+    draws: int = 0
+    lengths: Counter = field(default_factory=Counter)
+    scores: List[int] = field(default_factory=lambda: [0, 0])
+    started: float = field(default_factory=time.monotonic)
+
+    def add(self, result: GameResult):
+        winner, turns, score1, score2 = result
+        self.games += 1
+        if winner:
+            self.wins[winner - 1] += 1
+        else:
+            self.draws += 1
+        self.lengths[turns] += 1
+        self.scores[0] += score1
+        self.scores[1] += score2
+
+    def percentile(self, share: float) -> int:
+        target = share * self.games
+        seen = 0
+        for length in sorted(self.lengths):
+            seen += self.lengths[length]
+            if seen >= target:
+                return length
+        return 0
+
+    def to_dict(self) -> Dict:
+        games = self.games or 1
+        elapsed = time.monotonic() - self.started
+        return {
+            "game_type": self.game_type,
+            "games": self.games,
+            "players": [{
+                "bot": bot,
+                "wins": self.wins[i],
+                "win_rate": round(self.wins[i] / games, 4),
+                f"mean_{SCORES[self.game_type]}": round(self.scores[i] / games, 3)
+            } for i, bot in enumerate(self.bots)],
+            "draws": self.draws,
+            "draw_rate": round(self.draws / games, 4),
+            "length": {
+                "mean": round(sum(length * count for length, count in self.lengths.items()) / games, 2),
+                "min": min(self.lengths, default=0),
+                "p50": self.percentile(0.5),
+                "p90": self.percentile(0.9),
+                "max": max(self.lengths, default=0),
+                "histogram": dict(sorted(self.lengths.items()))
+            },
+            "elapsed": round(elapsed, 2),
+            "games_per_second": round(self.games / elapsed, 1) if elapsed > 0 else 0.0
+        }
+
+
+# ---- one game per engine: (winner seat, turns, seat 1 score, seat 2 score) ----------
+
+def play_battleship(bot1: str, bot2: str, rng: random.Random, board_size: Optional[int] = None,
+                    ships: Optional[Dict[str, int]] = None, no_touch: bool = False) -> GameResult:
+    game = BattleshipGame(f"bot:{bot1}", f"bot:{bot2}", board_size, ships, no_touch)
+    # Both fleets drawn in one batch from the game's own RNG
+    for player, layout in zip((1, 2), sample_layouts(game.geometry, game.ships, 2, rng, no_touch)):
+        game.place_ships_for_player(player, layout=layout)
+    game.status = "active"
+    bots = {player: battleship_bots.create_bot(name, game.board_size, game.ships, rng)
+            for player, name in ((1, bot1), (2, bot2))}
+
+    max_turns = 2 * game.board_size * game.board_size
+    while not game.winner and game.game_state["turn_count"] < max_turns:
+        player = game.current_player
+        game.make_move(*bots[player].choose(game.shots[player], game.hits[player]))
+    hits = [game.hits[player].bit_count() for player in (1, 2)]
+    return game.winner or 0, game.game_state["turn_count"], hits[0], hits[1]
+
+
+def play_wordle(bot1: str, bot2: str, rng: random.Random) -> GameResult:
+    words = wordle_bots.load_words()
+    game = WordleGame(rng.choice(words))
+    # The engine knows its two players by these names
+    slots = {1: "openai", 2: "anthropic"}
+    bots = {player: wordle_bots.create_bot(name, words, rng) for player, name in ((1, bot1), (2, bot2))}
+
+    rounds = 0
+    guesses = {}
+    while not game.game_over and rounds < WORDLE_MAX_GUESSES:
+        rounds += 1
+        guesses = {player: bots[player].choose(game.models[slots[player]]["guesses"], game.models[slots[player]]["feedback"])
+                   for player in (1, 2)}
+        for player in (1, 2):
+            game.make_guess(slots[player], guesses[player])
+
+    # The engine stops at the first solve; a solve by the other player in the same round is a tie
+    solved = [player for player in (1, 2)
+              if game.models[slots[player]]["won"] or guesses.get(player) == game.secret_word]
+    winner = solved[0] if len(solved) == 1 else 0
+    return winner, rounds, int(1 in solved), int(2 in solved)
+
+
+def play_connections(bot1: str, bot2: str, rng: random.Random) -> GameResult:
+    puzzle = rng.choice(load_puzzles())
+    boards = {1: ConnectionsGame(puzzle), 2: ConnectionsGame(puzzle)}
+    bots = {player: connections_bots.create_bot(name, puzzle, rng) for player, name in ((1, bot1), (2, bot2))}
+
+    rounds = 0
+    while rounds < CONNECTIONS_MAX_GUESSES and not any(board.game_over for board in boards.values()):
+        rounds += 1
+        # Each bot works its own board; both guess once per round
+        for player in (1, 2):
+            board = boards[player]
+            board.make_guess(f"bot:{player}", bots[player].choose(board.remaining_words, board.incorrect_guesses))
+
+    groups = {player: len(boards[player].found_groups) for player in (1, 2)}
+    solved = [player for player in (1, 2) if boards[player].game_over]
+    if len(solved) == 1:
+        winner = solved[0]
+    elif not solved and groups[1] != groups[2]:
+        winner = 1 if groups[1] > groups[2] else 2
+    else:
+        winner = 0
+    return winner, rounds, groups[1], groups[2]
+
+
+ENGINES = {"battleship": play_battleship, "wordle": play_wordle, "connections": play_connections}
+
+
+def play_game(config: SimulationConfig, index: int) -> GameResult:
+    """Game `index` of a run, in terms of bot1/bot2; bots swap seats every other game"""
+    seed = f"{config.seed}:{index}"
+    # The engines shuffle boards and place ships with the module RNG
+    random.seed(seed)
+    rng = random.Random(seed)
+    engine = ENGINES[config.game_type]
+    if index % 2:
+        winner, turns, score2, score1 = engine(config.bot2, config.bot1, rng, **config.engine_options())
+        return {0: 0, 1: 2, 2: 1}[winner], turns, score1, score2
+    return engine(config.bot1, config.bot2, rng, **config.engine_options())
+
+
+def play_chunk(config: SimulationConfig, start: int, stop: int) -> List[GameResult]:
+    return [play_game(config, index) for index in range(start, stop)]
+
+
+def quiet_engines():
+    """Engines log every game at INFO; a simulation only wants warnings"""
+    for subsystem in ("battleship", "wordle", "connections"):
+        get_logger(subsystem).setLevel(logging.WARNING)
+
+
+def simulate(config: SimulationConfig) -> Iterator[SimulationStats]:
+    """Play the run, yielding the running statistics each time a chunk of games finishes"""
+    config.validate()
+    stats = SimulationStats(config.game_type, (config.bot1, config.bot2))
+    chunks = [(start, min(start + config.chunk_size, config.games)) for start in range(0, config.games, config.chunk_size)]
+    logger.info(f"🎲 Simulating {config.games} {config.game_type} games: {config.bot1} vs {config.bot2} "
+                f"on {config.workers} workers")
+
+    if config.workers == 1:
+        quiet_engines()
+        for start, stop in chunks:
+            for result in play_chunk(config, start, stop):
+                stats.add(result)
+            yield stats
+        return
+
+    with ProcessPoolExecutor(max_workers=config.workers, initializer=quiet_engines) as pool:
+        pending = iter(chunks)
+        in_flight = set()
+        while True:
+            while len(in_flight) < config.workers * IN_FLIGHT_PER_WORKER:
+                chunk = next(pending, None)
+                if chunk is None:
+                    break
+                in_flight.add(pool.submit(play_chunk, config, *chunk))
+            if not in_flight:
+                break
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                for result in future.result():
+                    stats.add(result)
+            yield stats
+
+
+def run_simulation(config: SimulationConfig) -> Dict:
+    """Play the whole run and return its final statistics"""
+    stats: Optional[SimulationStats] = None
+    for stats in simulate(config):
+        pass
+    return stats.to_dict()
@@ -0,0 +1,151 @@
+"""
+Background task supervisor
+Tracks in-process fire-and-forget jobs by game ID,
+caps how many of each type run at once, retries failures and drains on shutdown
+"""
+
+import asyncio
+import os
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from src.utils.log import game_fields, get_logger
+
+logger = get_logger("tasks")
+
+# Per job type concurrency limits; anything not listed uses DEFAULT_LIMIT
+DEFAULT_LIMIT = int(os.getenv("VERSUS_TASK_CONCURRENCY", "4"))
+JOB_LIMITS: Dict[str, int] = {}
+
+
+class SupervisedJob:
+    """Bookkeeping for one submitted job"""
+
+    def __init__(self, job_type: str, game_id: str, max_retries: int):
+        self.job_type = job_type
+        self.game_id = game_id
+        self.max_retries = max_retries
+        self.attempts = 0
+        self.state = "queued"  # queued -> running -> done | failed | cancelled
+        self.error: Optional[str] = None
+        self.submitted_at = time.time()
+        self.task: Optional[asyncio.Task] = None
+
+    def to_dict(self) -> Dict:
+        return {
+            "job_type": self.job_type,
+            "game_id": self.game_id,
+            "state": self.state,
+            "attempts": self.attempts,
+            "error": self.error,
+            "age_seconds": round(time.time() - self.submitted_at, 1)
+        }
+
+
+class TaskSupervisor:
+    def __init__(self, limits: Optional[Dict[str, int]] = None, default_limit: int = DEFAULT_LIMIT):
+        self.limits = dict(limits or JOB_LIMITS)
+        self.default_limit = default_limit
+        self.semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.jobs: Dict[asyncio.Task, SupervisedJob] = {}
+        self.counters: Dict[str, Dict[str, int]] = {}
+        self.accepting = True
+
+    def _semaphore(self, job_type: str) -> asyncio.Semaphore:
+        if job_type not in self.semaphores:
+            self.semaphores[job_type] = asyncio.Semaphore(self.limits.get(job_type, self.default_limit))
+        return self.semaphores[job_type]
+
+    def _count(self, job_type: str, outcome: str):
+        counters = self.counters.setdefault(job_type, {"completed": 0, "failed": 0, "retried": 0, "cancelled": 0})
+        counters[outcome] += 1
+
+    def submit(self, job_type: str, game_id: str, job_factory: Callable[[], Awaitable],
+               max_retries: int = 2, backoff: float = 1.0) -> Optional[asyncio.Task]:
+        """Run a background job under supervision
+
+        `job_factory` is called once per attempt, so it must build a fresh
+        coroutine each time. Failed attempts are retried with exponential
+        backoff (backoff, 2*backoff, ...). Returns None once shutdown has begun.
+        """
+        if not self.accepting:
+            logger.warning(f"⚠️  Supervisor shutting down, dropping {job_type} job for {game_id}", extra=game_fields(game_id))
+            return None
+
+        job = SupervisedJob(job_type, game_id, max_retries)
+        task = asyncio.create_task(self._run(job, job_factory, backoff), name=f"{job_type}:{game_id}")
+        job.task = task
+        self.jobs[task] = job
+        task.add_done_callback(lambda t: self.jobs.pop(t, None))
+        return task
+
+    async def _run(self, job: SupervisedJob, job_factory: Callable[[], Awaitable], backoff: float):
+        semaphore = self._semaphore(job.job_type)
+        try:
+            while True:
+                async with semaphore:
+                    job.state = "running"
+                    job.attempts += 1
+                    try:
+                        await job_factory()
+                        job.state = "done"
+                        self._count(job.job_type, "completed")
+                        return
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as e:
+                        job.error = str(e)
+                        if job.attempts > job.max_retries:
+                            job.state = "failed"
+                            self._count(job.job_type, "failed")
+                            logger.exception(f"❌ {job.job_type} job for {job.game_id} failed after {job.attempts} attempts: {e}",
+                                             extra=game_fields(job.game_id))
+                            return
+                        self._count(job.job_type, "retried")
+
+                # Wait outside the semaphore so a failing job doesn't hold a slot
+                delay = backoff * (2 ** (job.attempts - 1))
+                logger.warning(f"🔁 Retrying {job.job_type} job for {job.game_id} in {delay:.1f}s ({job.error})",
+                               extra=game_fields(job.game_id))
+                job.state = "queued"
+                await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            job.state = "cancelled"
+            self._count(job.job_type, "cancelled")
+            raise
+
+    def jobs_for(self, game_id: str) -> List[Dict]:
+        return [job.to_dict() for job in self.jobs.values() if job.game_id == game_id]
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """In-flight and queued counts per job type, plus lifetime outcomes"""
+        stats = {}
+        job_types = set(self.counters) | {job.job_type for job in self.jobs.values()}
+        for job_type in job_types:
+            active = [job for job in self.jobs.values() if job.job_type == job_type]
+            stats[job_type] = {
+                "limit": self.limits.get(job_type, self.default_limit),
+                "in_flight": sum(1 for job in active if job.state == "running"),
+                "queued": sum(1 for job in active if job.state == "queued"),
+                **self.counters.get(job_type, {"completed": 0, "failed": 0, "retried": 0, "cancelled": 0})
+            }
+        return stats
+
+    async def shutdown(self, timeout: float = 10.0):
+        """Stop accepting jobs, let running ones finish up to `timeout`, then cancel the rest"""
+        self.accepting = False
+        pending = [task for task in self.jobs if not task.done()]
+        if not pending:
+            return
+
+        logger.info(f"⏳ Draining {len(pending)} background jobs (up to {timeout:g}s)...")
+        done, still_running = await asyncio.wait(pending, timeout=timeout)
+        for task in still_running:
+            task.cancel()
+        if still_running:
+            await asyncio.gather(*still_running, return_exceptions=True)
+            logger.info(f"🛑 Cancelled {len(still_running)} background jobs that did not finish in time")
+
+
+# Global instance
+task_supervisor = TaskSupervisor()
@@ -0,0 +1,507 @@
+"""
+Tournaments
+Runs model-vs-model match matrices headlessly: every pairing of the given models, in each game
+type, as a round-robin or over Swiss rounds, with several matches in flight at once. Matches go
+through the shared provider rate limits, and each one is checkpointed in a local SQLite results
+store as it finishes, so an interrupted tournament resumes where it stopped and never replays a
+finished (paid) match.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from src.games.battleship.battleship import validate_config as validate_battleship_config
+from src.services.headless import GAME_TYPES, play_match
+from src.services.provider_limits import ProviderLimiter, provider_limiter
+from src.services.ratings import Ratings, ratings as default_ratings
+from src.utils.common import preload_provider_sdks
+from src.utils.log import game_fields, get_logger
+
+logger = get_logger("tournaments")
+
+DEFAULT_DB_PATH = os.getenv("VERSUS_TOURNAMENT_DB", os.path.join("data", "tournaments.sqlite3"))
+# Matches in flight per tournament
+DEFAULT_CONCURRENCY = int(os.getenv("VERSUS_TOURNAMENT_CONCURRENCY", "4"))
+DEFAULT_MAX_ATTEMPTS = int(os.getenv("VERSUS_TOURNAMENT_MAX_ATTEMPTS", "2"))
+
+FORMATS = ("round_robin", "swiss")
+# Standings points per match
+WIN_POINTS, DRAW_POINTS = 1.0, 0.5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tournaments (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    config TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'running',
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS matches (
+    tournament_id TEXT NOT NULL,
+    match_key TEXT NOT NULL,
+    round INTEGER NOT NULL,
+    game_type TEXT NOT NULL,
+    player1_model TEXT NOT NULL,
+    player2_model TEXT NOT NULL,
+    seed INTEGER NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    winner INTEGER,
+    winner_model TEXT,
+    turns INTEGER,
+    duration REAL,
+    player1_latency_ms REAL,
+    player2_latency_ms REAL,
+    player1_tokens INTEGER,
+    player2_tokens INTEGER,
+    result TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (tournament_id, match_key)
+);
+CREATE INDEX IF NOT EXISTS matches_state ON matches (tournament_id, state, round);
+"""
+
+
+@dataclass
+class TournamentConfig:
+    models: List[str]
+    game_types: List[str]
+    format: str = "round_robin"
+    # Matches per pairing and game type; seats alternate, and each seat swap replays the same puzzle
+    matches_per_pair: int = 2
+    # Swiss only
+    rounds: int = 3
+    concurrency: int = DEFAULT_CONCURRENCY
+    seed: int = 0
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    # Per game type, passed to the headless match (e.g. {"trivia": {"questions": 5}})
+    options: Dict[str, Dict] = field(default_factory=dict)
+
+    def validate(self):
+        if len(set(self.models)) < 2:
+            raise ValueError("A tournament needs at least two different models")
+        unknown = [game_type for game_type in self.game_types if game_type not in GAME_TYPES]
+        if unknown or not self.game_types:
+            raise ValueError(f"Game types must be some of: {', '.join(GAME_TYPES)}")
+        if self.format not in FORMATS:
+            raise ValueError(f"Format must be one of: {', '.join(FORMATS)}")
+        if self.matches_per_pair < 1 or self.rounds < 1 or self.concurrency < 1 or self.max_attempts < 1:
+            raise ValueError("matches_per_pair, rounds, concurrency and max_attempts must be at least 1")
+        if "battleship" in self.options:
+            battleship = self.options["battleship"]
+            validate_battleship_config(battleship.get("board_size"), battleship.get("ships"),
+                                       bool(battleship.get("no_touch")))
+
+    @property
+    def total_rounds(self) -> int:
+        return self.rounds if self.format == "swiss" else 1
+
+
+class TournamentStore:
+    """SQLite results store; every method blocks, so call them off the event loop"""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if os.path.dirname(self.db_path):
+                os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def _execute(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._connection().execute(sql, params).fetchall()
+
+    def create(self, name: str, config: TournamentConfig) -> str:
+        tournament_id = uuid.uuid4().hex[:12]
+        now = time.time()
+        self._execute("INSERT INTO tournaments (id, name, config, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                      (tournament_id, name, json.dumps(asdict(config)), now, now))
+        return tournament_id
+
+    def get(self, tournament_id: str) -> Optional[Dict]:
+        rows = self._execute("SELECT * FROM tournaments WHERE id = ?", (tournament_id,))
+        if not rows:
+            return None
+        tournament = dict(rows[0])
+        tournament["config"] = json.loads(tournament["config"])
+        return tournament
+
+    def recent(self, limit: int = 50) -> List[Dict]:
+        rows = self._execute("SELECT id, name, state, created_at, updated_at FROM tournaments "
+                             "ORDER BY created_at DESC LIMIT ?", (limit,))
+        return [dict(row) for row in rows]
+
+    def set_state(self, tournament_id: str, state: str):
+        self._execute("UPDATE tournaments SET state = ?, updated_at = ? WHERE id = ?", (state, time.time(), tournament_id))
+
+    def add_matches(self, tournament_id: str, matches: List[Dict]):
+        """Insert scheduled matches; ones already scheduled (on a resumed run) are left as they are"""
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN")
+            try:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO matches (tournament_id, match_key, round, game_type, player1_model, "
+                    "player2_model, seed, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(tournament_id, m["match_key"], m["round"], m["game_type"], m["player1_model"],
+                      m["player2_model"], m["seed"], now) for m in matches]
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def has_round(self, tournament_id: str, round_number: int) -> bool:
+        return bool(self._execute("SELECT 1 FROM matches WHERE tournament_id = ? AND round = ? LIMIT 1",
+                                  (tournament_id, round_number)))
+
+    def recover(self, tournament_id: str, retry_failed: bool = False) -> int:
+        """Put matches interrupted mid-play (and failed ones, if asked) back in the queue"""
+        states = ("running", "failed") if retry_failed else ("running",)
+        rows = self._execute(
+            f"UPDATE matches SET state = 'pending', attempts = 0, updated_at = ? WHERE tournament_id = ? "
+            f"AND state IN ({', '.join('?' * len(states))}) RETURNING match_key",
+            (time.time(), tournament_id, *states)
+        )
+        return len(rows)
+
+    def pending(self, tournament_id: str, round_number: int) -> List[Dict]:
+        rows = self._execute("SELECT * FROM matches WHERE tournament_id = ? AND round = ? AND state = 'pending' "
+                             "ORDER BY match_key", (tournament_id, round_number))
+        return [dict(row) for row in rows]
+
+    def mark_running(self, tournament_id: str, match_key: str):
+        self._execute("UPDATE matches SET state = 'running', attempts = attempts + 1, updated_at = ? "
+                      "WHERE tournament_id = ? AND match_key = ?", (time.time(), tournament_id, match_key))
+
+    def record_result(self, tournament_id: str, match_key: str, result: Dict):
+        usage = result["usage"]
+        self._execute(
+            "UPDATE matches SET state = 'done', winner = ?, winner_model = ?, turns = ?, duration = ?, "
+            "player1_latency_ms = ?, player2_latency_ms = ?, player1_tokens = ?, player2_tokens = ?, "
+            "result = ?, error = NULL, updated_at = ? WHERE tournament_id = ? AND match_key = ?",
+            (result["winner"] or 0, result["winner_model"], result["turns"], result["duration"],
+             usage["player1"]["latency_ms"], usage["player2"]["latency_ms"],
+             usage["player1"]["input_tokens"] + usage["player1"]["output_tokens"],
+             usage["player2"]["input_tokens"] + usage["player2"]["output_tokens"],
+             json.dumps(result), time.time(), tournament_id, match_key)
+        )
+
+    def record_failure(self, tournament_id: str, match_key: str, error: str, retry: bool):
+        self._execute("UPDATE matches SET state = ?, error = ?, updated_at = ? WHERE tournament_id = ? AND match_key = ?",
+                      ("pending" if retry else "failed", error, time.time(), tournament_id, match_key))
+
+    def requeue(self, tournament_id: str, match_key: str):
+        """Undo mark_running for a match that was interrupted, not failed"""
+        self._execute("UPDATE matches SET state = 'pending', attempts = attempts - 1, updated_at = ? "
+                      "WHERE tournament_id = ? AND match_key = ? AND state = 'running'",
+                      (time.time(), tournament_id, match_key))
+
+    def matches(self, tournament_id: str, state: Optional[str] = None) -> List[Dict]:
+        sql = "SELECT * FROM matches WHERE tournament_id = ?"
+        params: tuple = (tournament_id,)
+        if state:
+            sql += " AND state = ?"
+            params += (state,)
+        rows = self._execute(sql + " ORDER BY round, match_key", params)
+        matches = []
+        for row in rows:
+            match = dict(row)
+            match["result"] = json.loads(match["result"]) if match["result"] else None
+            matches.append(match)
+        return matches
+
+    def progress(self, tournament_id: str) -> Dict[str, int]:
+        rows = self._execute("SELECT state, COUNT(*) AS n FROM matches WHERE tournament_id = ? GROUP BY state",
+                             (tournament_id,))
+        progress = {"pending": 0, "running": 0, "done": 0, "failed": 0}
+        progress.update({row["state"]: row["n"] for row in rows})
+        return progress
+
+
+# ---- schedules and standings -------------------------------------------
+
+def match_seed(config: TournamentConfig, round_number: int, game_type: str, pair: Tuple[str, str], game: int) -> int:
+    """Stable per-game seed: both seatings of a pairing get the same board, word, puzzle or questions"""
+    return zlib.crc32(f"{config.seed}:{round_number}:{game_type}:{':'.join(sorted(pair))}:{game}".encode())
+
+
+def pair_matches(config: TournamentConfig, round_number: int, game_type: str, pairs: List[Tuple[str, str]]) -> List[Dict]:
+    matches = []
+    for first, second in pairs:
+        for k in range(config.matches_per_pair):
+            player1, player2 = (first, second) if k % 2 == 0 else (second, first)
+            matches.append({
+                "match_key": f"{round_number}:{game_type}:{first}:{second}:{k}",
+                "round": round_number,
+                "game_type": game_type,
+                "player1_model": player1,
+                "player2_model": player2,
+                "seed": match_seed(config, round_number, game_type, (first, second), k // 2)
+            })
+    return matches
+
+
+def round_robin_pairs(models: List[str]) -> List[Tuple[str, str]]:
+    return [(models[i], models[j]) for i in range(len(models)) for j in range(i + 1, len(models))]
+
+
+def swiss_pairs(models: List[str], standings: Dict[str, Dict], played: Dict[str, set]) -> List[Tuple[str, str]]:
+    """Pair players with equal or nearest scores, avoiding rematches where possible
+
+    With an odd field the lowest-ranked of the players with the most games sits the round out.
+    """
+    ranked = sorted(models, key=lambda model: (-standings.get(model, {}).get("points", 0.0), models.index(model)))
+    if len(ranked) % 2:
+        most = max(standings.get(model, {}).get("played", 0) for model in ranked)
+        ranked.remove(next(model for model in reversed(ranked) if standings.get(model, {}).get("played", 0) == most))
+    pairs = []
+    while ranked:
+        first = ranked.pop(0)
+        opponent = next((model for model in ranked if model not in played.get(first, set())), ranked[0])
+        ranked.remove(opponent)
+        pairs.append((first, opponent))
+    return pairs
+
+
+def standings(matches: List[Dict], models: Optional[List[str]] = None) -> List[Dict]:
+    """Per-model table from finished matches, best first"""
+    table: Dict[str, Dict] = {}
+
+    def row(model: str) -> Dict:
+        return table.setdefault(model, {"model": model, "played": 0, "wins": 0, "draws": 0, "losses": 0,
+                                        "points": 0.0, "turns": 0, "latency_ms": 0.0, "tokens": 0, "_timed": 0})
+
+    for model in models or []:
+        row(model)
+    for match in matches:
+        if match["state"] != "done":
+            continue
+        for seat in (1, 2):
+            entry = row(match[f"player{seat}_model"])
+            entry["played"] += 1
+            entry["turns"] += match["turns"] or 0
+            entry["tokens"] += match[f"player{seat}_tokens"] or 0
+            if match[f"player{seat}_latency_ms"]:
+                entry["latency_ms"] += match[f"player{seat}_latency_ms"]
+                entry["_timed"] += 1
+            if not match["winner"]:
+                entry["draws"] += 1
+                entry["points"] += DRAW_POINTS
+            elif match["winner"] == seat:
+                entry["wins"] += 1
+                entry["points"] += WIN_POINTS
+            else:
+                entry["losses"] += 1
+
+    rows = []
+    for entry in table.values():
+        timed = entry.pop("_timed")
+        entry["latency_ms"] = round(entry["latency_ms"] / timed, 1) if timed else 0.0
+        rows.append(entry)
+    return sorted(rows, key=lambda entry: (-entry["points"], -entry["wins"], entry["model"]))
+
+
+# ---- runner ---------------------------------------------------------------
+
+class TournamentRunner:
+    def __init__(self, store: TournamentStore, tournament_id: str, config: TournamentConfig,
+                 limiter: Optional[ProviderLimiter] = None, ratings: Optional[Ratings] = None):
+        self.store = store
+        self.tournament_id = tournament_id
+        self.config = config
+        self.limiter = limiter or provider_limiter
+        # Finished matches also count towards the models' ratings
+        self.ratings = ratings or default_ratings
+        # Set on shutdown: matches in progress finish, no new ones start
+        self.draining = False
+
+    async def _db(self, method, *args):
+        return await asyncio.to_thread(method, *args)
+
+    async def run(self, retry_failed: bool = False) -> Dict:
+        """Play every match that isn't finished yet, round by round; returns the final progress"""
+        tournament_id, config = self.tournament_id, self.config
+        recovered = await self._db(self.store.recover, tournament_id, retry_failed)
+        if recovered:
+            logger.info(f"🔄 Re-queued {recovered} tournament matches", extra=game_fields(tournament_id))
+        await self._db(self.store.set_state, tournament_id, "running")
+        # Matches start in parallel threads; importing the SDKs once up front keeps them from racing the first imports
+        await self._db(preload_provider_sdks)
+
+        try:
+            for round_number in range(1, config.total_rounds + 1):
+                if not await self._db(self.store.has_round, tournament_id, round_number):
+                    await self._db(self.store.add_matches, tournament_id, await self._schedule(round_number))
+                pending = await self._db(self.store.pending, tournament_id, round_number)
+                if pending:
+                    logger.info(f"🏟️  Round {round_number}/{config.total_rounds}: {len(pending)} matches to play",
+                                extra=game_fields(tournament_id))
+                    await self._play_round(pending)
+                if self.draining:
+                    await self._db(self.store.set_state, tournament_id, "paused")
+                    logger.info("⏸️  Tournament paused for shutdown; resume it to play the remaining matches",
+                                extra=game_fields(tournament_id))
+                    return await self._db(self.store.progress, tournament_id)
+        except asyncio.CancelledError:
+            await asyncio.shield(self._db(self.store.set_state, tournament_id, "paused"))
+            logger.info("⏸️  Tournament paused; resume it to play the remaining matches", extra=game_fields(tournament_id))
+            raise
+
+        progress = await self._db(self.store.progress, tournament_id)
+        await self._db(self.store.set_state, tournament_id, "finished")
+        logger.info(f"🏆 Tournament finished: {progress['done']} played, {progress['failed']} failed",
+                    extra=game_fields(tournament_id))
+        return progress
+
+    async def _schedule(self, round_number: int) -> List[Dict]:
+        config = self.config
+        matches = []
+        if config.format == "round_robin":
+            for game_type in config.game_types:
+                matches += pair_matches(config, round_number, game_type, round_robin_pairs(config.models))
+            return matches
+
+        # Swiss: each game type has its own table, paired on the results so far
+        finished = await self._db(self.store.matches, self.tournament_id, "done")
+        for game_type in config.game_types:
+            of_type = [match for match in finished if match["game_type"] == game_type]
+            table = {entry["model"]: entry for entry in standings(of_type, config.models)}
+            played: Dict[str, set] = {}
+            for match in of_type:
+                played.setdefault(match["player1_model"], set()).add(match["player2_model"])
+                played.setdefault(match["player2_model"], set()).add(match["player1_model"])
+            matches += pair_matches(config, round_number, game_type, swiss_pairs(config.models, table, played))
+        return matches
+
+    async def _play_round(self, pending: List[Dict]):
+        semaphore = asyncio.Semaphore(self.config.concurrency)
+
+        async def play(match: Dict):
+            async with semaphore:
+                if not self.draining:
+                    await self._play(match)
+
+        await asyncio.gather(*(play(match) for match in pending))
+
+    async def _play(self, match: Dict):
+        tournament_id, key = self.tournament_id, match["match_key"]
+        for attempt in range(1, self.config.max_attempts + 1):
+            if self.draining:
+                return  # still pending, so the resumed tournament retries it
+            await self._db(self.store.mark_running, tournament_id, key)
+            try:
+                result = await play_match(match["game_type"], match["player1_model"], match["player2_model"],
+                                          seed=match["seed"], limiter=self.limiter,
+                                          options=self.config.options.get(match["game_type"]))
+            except asyncio.CancelledError:
+                await asyncio.shield(self._db(self.store.requeue, tournament_id, key))
+                raise
+            except Exception as e:
+                retry = attempt < self.config.max_attempts
+                logger.warning(f"⚠️  Match {key} failed ({e}){', retrying' if retry else ''}",
+                               extra=game_fields(tournament_id))
+                await self._db(self.store.record_failure, tournament_id, key, str(e), retry)
+                continue
+            await self._db(self.store.record_result, tournament_id, key, result.to_dict())
+            await self.ratings.record(f"tournament:{tournament_id}:{key}", result.game_type, result.player1_model,
+                                      result.player2_model, result.winner)
+            return
+
+
+class Tournaments:
+    """Tournaments running in this process, by ID"""
+
+    def __init__(self, store: Optional[TournamentStore] = None):
+        self.store = store or TournamentStore()
+        self.tasks: Dict[str, asyncio.Task] = {}
+        self.runners: Dict[str, TournamentRunner] = {}
+
+    async def create(self, config: TournamentConfig, name: Optional[str] = None) -> str:
+        config.validate()
+        name = name or f"{len(config.models)} models, {', '.join(config.game_types)}"
+        tournament_id = await asyncio.to_thread(self.store.create, name, config)
+        self.resume(tournament_id, config)
+        return tournament_id
+
+    def is_running(self, tournament_id: str) -> bool:
+        task = self.tasks.get(tournament_id)
+        return task is not None and not task.done()
+
+    def resume(self, tournament_id: str, config: TournamentConfig, retry_failed: bool = False) -> bool:
+        """Start (or restart) playing a tournament's unfinished matches; False if it's already running"""
+        if self.is_running(tournament_id):
+            return False
+        runner = TournamentRunner(self.store, tournament_id, config)
+        task = asyncio.create_task(runner.run(retry_failed), name=f"tournament-{tournament_id}")
+        task.add_done_callback(lambda t: self._finished(tournament_id, t))
+        self.tasks[tournament_id] = task
+        self.runners[tournament_id] = runner
+        return True
+
+    def _finished(self, tournament_id: str, task: asyncio.Task):
+        if self.tasks.get(tournament_id) is task:
+            del self.tasks[tournament_id]
+            self.runners.pop(tournament_id, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"❌ Tournament stopped: {task.exception()}", extra=game_fields(tournament_id))
+
+    async def pause(self, tournament_id: str) -> bool:
+        task = self.tasks.get(tournament_id)
+        if task is None or task.done():
+            return False
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return True
+
+    async def stop(self, timeout: float = 0.0):
+        """Pause everything (on shutdown); paused tournaments resume from their checkpoint
+
+        Matches already being played get up to `timeout` seconds to finish, so their model
+        calls aren't paid for twice; only the ones still running after that are replayed.
+        """
+        for runner in self.runners.values():
+            runner.draining = True
+        running = [task for task in self.tasks.values() if not task.done()]
+        if timeout > 0 and running:
+            await asyncio.wait(running, timeout=timeout)
+        await asyncio.gather(*(self.pause(tournament_id) for tournament_id in list(self.tasks)))
+
+    async def report(self, tournament_id: str) -> Optional[Dict]:
+        tournament = await asyncio.to_thread(self.store.get, tournament_id)
+        if tournament is None:
+            return None
+        matches = await asyncio.to_thread(self.store.matches, tournament_id)
+        config = tournament["config"]
+        by_type = {game_type: standings([m for m in matches if m["game_type"] == game_type], config["models"])
+                   for game_type in config["game_types"]}
+        return {
+            **tournament,
+            "running": self.is_running(tournament_id),
+            "progress": await asyncio.to_thread(self.store.progress, tournament_id),
+            "standings": standings(matches, config["models"]),
+            "standings_by_game": by_type
+        }
+
+
+# Global instance
+tournaments = Tournaments()
@@ -0,0 +1,127 @@
+"""
+Idempotent turns
+Turn-advancing endpoints each make a paid LLM call, so a client retrying after a timeout must
+not play a second turn. A turn can be tagged with an Idempotency-Key and/or the turn number the
+client expects to play: a finished turn is answered from cache, a duplicate of the turn in
+progress waits for its result, and any other request racing it is refused
+"""
+
+import asyncio
+import os
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from src.utils.log import game_fields, get_logger
+from src.utils.metrics import TURN_REPLAYS
+
+logger = get_logger("turns")
+
+# Finished turns remembered per player, and players remembered overall (oldest forgotten first)
+TURNS_PER_PLAYER = int(os.getenv("VERSUS_TURN_CACHE_TURNS", "16"))
+MAX_PLAYERS = int(os.getenv("VERSUS_TURN_CACHE_PLAYERS", "4096"))
+
+
+class TurnConflict(Exception):
+    """A turn request that is neither a duplicate nor the next turn"""
+
+    def __init__(self, message: str, current_turn: int):
+        super().__init__(message)
+        self.current_turn = current_turn
+
+
+class _PendingTurn:
+    def __init__(self, turn: int, key: Optional[str]):
+        self.turn = turn
+        self.key = key
+        self.result = asyncio.get_running_loop().create_future()
+        # Nobody may be waiting on a failed turn; don't log its exception as unretrieved
+        self.result.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+
+class _PlayerTurns:
+    def __init__(self):
+        self.results: "OrderedDict[int, Any]" = OrderedDict()  # turn -> response
+        self.keys: Dict[str, int] = {}  # idempotency key -> turn
+        self.pending: Optional[_PendingTurn] = None
+
+    def remember(self, turn: int, key: Optional[str], result: Any, limit: int):
+        self.results[turn] = result
+        if key is not None:
+            self.keys[key] = turn
+        while len(self.results) > limit:
+            forgotten, _ = self.results.popitem(last=False)
+            self.keys = {k: t for k, t in self.keys.items() if t != forgotten}
+
+
+class TurnGuard:
+    def __init__(self, turns_per_player: int = TURNS_PER_PLAYER, max_players: int = MAX_PLAYERS):
+        self.turns_per_player = turns_per_player
+        self.max_players = max_players
+        self.players: "OrderedDict[Tuple[str, str], _PlayerTurns]" = OrderedDict()
+
+    def _player(self, game_id: str, player: str) -> _PlayerTurns:
+        slot = (game_id, player)
+        turns = self.players.get(slot)
+        if turns is None:
+            turns = self.players[slot] = _PlayerTurns()
+            while len(self.players) > self.max_players:
+                self.players.popitem(last=False)
+        else:
+            self.players.move_to_end(slot)
+        return turns
+
+    async def run(self, game_type: str, game_id: str, player: str, next_turn: Callable[[], int],
+                  play: Callable[[], Awaitable[Any]], key: Optional[str] = None,
+                  expected_turn: Optional[int] = None) -> Tuple[Any, bool]:
+        """Play `player`'s next turn once; returns (response, replayed)
+
+        `next_turn` reads the 1-based number of the player's next turn from the game. `play` runs
+        only for a new turn, and its response is cached only if the turn number moved on (a
+        cooldown or other refusal isn't a turn). Raises TurnConflict for a stale or future
+        `expected_turn`, or when another turn for this player is already in progress.
+        """
+        turns = self._player(game_id, player)
+        current_turn = next_turn()
+
+        if key is not None and key in turns.keys:
+            TURN_REPLAYS.inc(game_type, "replayed")
+            return turns.results[turns.keys[key]], True
+        if expected_turn is not None and expected_turn in turns.results:
+            TURN_REPLAYS.inc(game_type, "replayed")
+            return turns.results[expected_turn], True
+
+        pending = turns.pending
+        if pending is not None:
+            if (key is not None and key == pending.key) or (expected_turn is not None and expected_turn == pending.turn):
+                TURN_REPLAYS.inc(game_type, "coalesced")
+                return await asyncio.shield(pending.result), True
+            TURN_REPLAYS.inc(game_type, "conflict")
+            raise TurnConflict(f"Turn {pending.turn} is already in progress", pending.turn)
+
+        if expected_turn is not None and expected_turn != current_turn:
+            TURN_REPLAYS.inc(game_type, "conflict")
+            logger.info(f"↩️  {player} asked for turn {expected_turn}, next is {current_turn}",
+                        extra=game_fields(game_id, current_turn))
+            raise TurnConflict(f"Expected turn {expected_turn} but the next turn is {current_turn}", current_turn)
+
+        pending = turns.pending = _PendingTurn(current_turn, key)
+        try:
+            result = await play()
+        except asyncio.CancelledError:
+            pending.result.cancel()
+            raise
+        except BaseException as e:
+            # Not cached: a retry of a failed turn plays it again
+            pending.result.set_exception(e)
+            raise
+        else:
+            if next_turn() > current_turn:
+                turns.remember(current_turn, key, result, self.turns_per_player)
+            pending.result.set_result(result)
+            return result, False
+        finally:
+            turns.pending = None
+
+
+# Global instance
+turn_guard = TurnGuard()
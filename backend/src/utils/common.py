@@ -4,16 +4,92 @@ Common utilities and base classes for all games
 
 import os
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 from enum import Enum
 from dotenv import load_dotenv
 import asyncio
 
+from src.games.battleship.coordinates import DEFAULT_BOARD_SIZE, format_coordinate, parse_coordinate, random_coordinate
+from src.utils.log import get_logger
+from src.utils.metrics import track_llm_call
+from src.utils.pacing import Pacing, get_pacing
+
+logger = get_logger("llm")
+
 # Load environment variables from backend/.env
 backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))  # Go up 3 levels from src/utils/common.py
 env_path = os.path.join(backend_dir, '.env')
 load_dotenv(env_path)
 
+# SDK module and API key variable per provider; SDKs are imported by LLMClient on first use
+PROVIDER_SDKS = {
+    "OPENAI": ("openai", "OPENAI_API_KEY"),
+    "ANTHROPIC": ("anthropic", "ANTHROPIC_API_KEY"),
+    "GOOGLE": ("google.generativeai", "GOOGLE_API_KEY"),
+    "GROQ": ("groq", "GROQ_API_KEY")
+}
+
+def preload_provider_sdks() -> List[str]:
+    """Import the SDK of every provider with an API key set, so the first match doesn't pay for it
+
+    Blocking; run it in a thread. Returns the providers that were loaded.
+    """
+    import importlib
+    
+    loaded = []
+    for provider, (module, key_var) in PROVIDER_SDKS.items():
+        if not os.getenv(key_var):
+            continue
+        try:
+            importlib.import_module(module)
+            loaded.append(provider)
+        except ImportError as e:
+            logger.warning(f"⚠️  {key_var} is set but the {provider} SDK could not be imported: {e}")
+    return loaded
+
+def model_provider(model_id: str) -> str:
+    """Provider (a PROVIDER_SDKS key) that serves a model ID; BOT for built-in strategy bots ("bot:<name>")"""
+    model_id_lower = model_id.lower()
+    
+    # Simulation bots play without a provider
+    if model_id_lower.startswith("bot:"):
+        return "BOT"
+    
+    # OpenAI models
+    if any(x in model_id_lower for x in ['gpt', 'o1', 'davinci', 'curie', 'babbage', 'ada']):
+        return "OPENAI"
+    
+    # Claude models
+    elif 'claude' in model_id_lower:
+        return "ANTHROPIC"
+    
+    # Gemini models
+    elif 'gemini' in model_id_lower:
+        return "GOOGLE"
+    
+    # Groq models
+    elif any(x in model_id_lower for x in ['mixtral', 'llama', 'groq']):
+        return "GROQ"
+    
+    # Default to OpenAI
+    else:
+        return "OPENAI"
+
+def response_tokens(response: Any) -> Tuple[int, int]:
+    """(input, output) tokens from a provider SDK response or raw API JSON; (0, 0) if it has none"""
+    usage = response.get("usage") if isinstance(response, dict) else getattr(response, "usage", None)
+    if usage is None:
+        # Gemini reports usage under a different name
+        usage = getattr(response, "usage_metadata", None)
+        if usage is None:
+            return 0, 0
+    read = usage.get if isinstance(usage, dict) else lambda name: getattr(usage, name, None)
+    for input_name, output_name in (("prompt_tokens", "completion_tokens"), ("input_tokens", "output_tokens"),
+                                    ("prompt_token_count", "candidates_token_count")):
+        if read(input_name) is not None or read(output_name) is not None:
+            return int(read(input_name) or 0), int(read(output_name) or 0)
+    return 0, 0
+
 class GameStatus(Enum):
     """Game status enumeration"""
     WAITING = "waiting"
@@ -36,29 +112,19 @@ class LLMClient:
         self.model_type, self.model_name = self._parse_model_id(model_id)
         self.client = self._initialize_client()
     
+    def __getstate__(self):
+        # SDK clients hold sockets and locks; snapshots keep only what's needed to rebuild one
+        state = self.__dict__.copy()
+        state["client"] = None
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.client = self._initialize_client()
+    
     def _parse_model_id(self, model_id: str) -> Tuple[str, str]:
         """Parse model ID to determine provider and model name"""
-        model_id_lower = model_id.lower()
-        
-        # OpenAI models
-        if any(x in model_id_lower for x in ['gpt', 'o1', 'davinci', 'curie', 'babbage', 'ada']):
-            return "OPENAI", model_id
-        
-        # Claude models
-        elif 'claude' in model_id_lower:
-            return "ANTHROPIC", model_id
-        
-        # Gemini models
-        elif 'gemini' in model_id_lower:
-            return "GOOGLE", model_id
-        
-        # Groq models
-        elif any(x in model_id_lower for x in ['mixtral', 'llama', 'groq']):
-            return "GROQ", model_id
-        
-        # Default to OpenAI
-        else:
-            return "OPENAI", model_id
+        return model_provider(model_id), model_id
     
     def _initialize_client(self):
         """Initialize the appropriate API client"""
@@ -91,151 +157,144 @@ class LLMClient:
                 raise ValueError("GROQ_API_KEY not found in environment variables")
             return Groq(api_key=api_key)
             
+        elif self.model_type == "BOT":
+            return None
+            
         else:
             raise ValueError(f"Unknown model type: {self.model_type}")
     
     def get_response(self, prompt: str, max_tokens: int = 100, temperature: float = 0.7) -> str:
         """Get a generic response from the LLM"""
         try:
-            if self.model_type == "OPENAI":
-                response = self.client.chat.completions.create(
-                    model=self.model_name,
-                    messages=[
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=temperature,
-                    max_tokens=max_tokens
-                )
-                return response.choices[0].message.content.strip()
+            with track_llm_call(self.model_type) as call:
+                if self.model_type == "OPENAI":
+                    response = self.client.chat.completions.create(
+                        model=self.model_name,
+                        messages=[
+                            {"role": "user", "content": prompt}
+                        ],
+                        temperature=temperature,
+                        max_tokens=max_tokens
+                    )
+                    call.tokens(*response_tokens(response))
+                    return response.choices[0].message.content.strip()
                 
-            elif self.model_type == "ANTHROPIC":
-                response = self.client.messages.create(
-                    model=self.model_name,
-                    messages=[
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=temperature,
-                    max_tokens=max_tokens
-                )
-                return response.content[0].text.strip()
+                elif self.model_type == "ANTHROPIC":
+                    response = self.client.messages.create(
+                        model=self.model_name,
+                        messages=[
+                            {"role": "user", "content": prompt}
+                        ],
+                        temperature=temperature,
+                        max_tokens=max_tokens
+                    )
+                    call.tokens(*response_tokens(response))
+                    return response.content[0].text.strip()
                 
-            elif self.model_type == "GOOGLE":
-                # Google Gemini uses a different API structure
-                response = self.client.generate_content(prompt)
-                return response.text.strip()
+                elif self.model_type == "GOOGLE":
+                    # Google Gemini uses a different API structure
+                    response = self.client.generate_content(prompt)
+                    call.tokens(*response_tokens(response))
+                    return response.text.strip()
                 
-            elif self.model_type == "GROQ":
-                response = self.client.chat.completions.create(
-                    model=self.model_name,
-                    messages=[
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=temperature,
-                    max_tokens=max_tokens
-                )
-                return response.choices[0].message.content.strip()
+                elif self.model_type == "GROQ":
+                    response = self.client.chat.completions.create(
+                        model=self.model_name,
+                        messages=[
+                            {"role": "user", "content": prompt}
+                        ],
+                        temperature=temperature,
+                        max_tokens=max_tokens
+                    )
+                    call.tokens(*response_tokens(response))
+                    return response.choices[0].message.content.strip()
                 
-            elif self.model_type == "GEMINI":
-                model = self.client.GenerativeModel(self.model_name)
-                response = model.generate_content(prompt)
-                return response.text.strip()
+                elif self.model_type == "GEMINI":
+                    model = self.client.GenerativeModel(self.model_name)
+                    response = model.generate_content(prompt)
+                    return response.text.strip()
                 
-            else:
-                raise ValueError(f"Unknown model type: {self.model_type}")
+                else:
+                    raise ValueError(f"Unknown model type: {self.model_type}")
                 
         except Exception as e:
-            print(f"Error getting response from {self.model_id}: {e}")
+            logger.error(f"Error getting response from {self.model_id}: {e}")
             return None
     
     def get_move(self, prompt: str, game_state: dict = None) -> str:
         """Get a move from the LLM (sync version for battleship)"""
+        board_size = (game_state or {}).get("board_size", DEFAULT_BOARD_SIZE)
         try:
             # First, try to get a move from the LLM
-            if self.model_type == "OPENAI":
-                response = self.client.chat.completions.create(
-                    model=self.model_name,
-                    messages=[
-                        {"role": "system", "content": "You are playing Battleship. Reply with ONLY a coordinate like 'A5'. No other text."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.7,
-                    max_tokens=10
-                )
-                content = response.choices[0].message.content.strip()
+            with track_llm_call(self.model_type) as call:
+                if self.model_type == "OPENAI":
+                    response = self.client.chat.completions.create(
+                        model=self.model_name,
+                        messages=[
+                            {"role": "system", "content": "You are playing Battleship. Reply with ONLY a coordinate like 'A5'. No other text."},
+                            {"role": "user", "content": prompt}
+                        ],
+                        temperature=0.7,
+                        max_tokens=10
+                    )
+                    call.tokens(*response_tokens(response))
+                    content = response.choices[0].message.content.strip()
                 
-            elif self.model_type == "ANTHROPIC":
-                response = self.client.messages.create(
-                    model=self.model_name,
-                    messages=[
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=10,
-                    temperature=0.7
-                )
-                content = response.content[0].text.strip()
+                elif self.model_type == "ANTHROPIC":
+                    response = self.client.messages.create(
+                        model=self.model_name,
+                        messages=[
+                            {"role": "user", "content": prompt}
+                        ],
+                        max_tokens=10,
+                        temperature=0.7
+                    )
+                    call.tokens(*response_tokens(response))
+                    content = response.content[0].text.strip()
                 
-            elif self.model_type == "GROQ":
-                response = self.client.chat.completions.create(
-                    model=self.model_name,
-                    messages=[
-                        {"role": "system", "content": "You are playing Battleship. Reply with ONLY a coordinate like 'A5'. No other text."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.7,
-                    max_tokens=10
-                )
-                content = response.choices[0].message.content.strip()
+                elif self.model_type == "GROQ":
+                    response = self.client.chat.completions.create(
+                        model=self.model_name,
+                        messages=[
+                            {"role": "system", "content": "You are playing Battleship. Reply with ONLY a coordinate like 'A5'. No other text."},
+                            {"role": "user", "content": prompt}
+                        ],
+                        temperature=0.7,
+                        max_tokens=10
+                    )
+                    call.tokens(*response_tokens(response))
+                    content = response.choices[0].message.content.strip()
                 
-            elif self.model_type == "GOOGLE":
-                response = self.client.generate_content(prompt)
-                content = response.text.strip()
+                elif self.model_type == "GOOGLE":
+                    response = self.client.generate_content(prompt)
+                    call.tokens(*response_tokens(response))
+                    content = response.text.strip()
                 
-            else:
-                # Fallback - use suggested position from prompt
-                import re
-                suggested_match = re.search(r'Suggested position: ([A-H][1-8])', prompt)
-                if suggested_match:
-                    return suggested_match.group(1)
                 else:
-                    # Random fallback
-                    import random
-                    import string
-                    col = random.choice(string.ascii_uppercase[:8])
-                    row = random.randint(1, 8)
-                    return f"{col}{row}"
+                    # Fallback - use the recommended target from the prompt
+                    return self._fallback_move(prompt, board_size)
             
-            # Clean up the response - extract just the coordinate
-            import re
-            # Look for pattern like A5, H8, etc.
-            coord_match = re.search(r'[A-Ha-h][1-8]', content)
-            if coord_match:
-                return coord_match.group(0).upper()
+            # Clean up the response - extract just the coordinate (one on this board, like A5 or H8)
+            coordinate = parse_coordinate(content, board_size)
+            if coordinate:
+                return format_coordinate(*coordinate)
             
-            # If no valid coordinate found, use suggested from prompt
-            suggested_match = re.search(r'Suggested position: ([A-H][1-8])', prompt)
-            if suggested_match:
-                return suggested_match.group(1)
-            
-            # Last resort - random valid move
-            import random
-            import string
-            col = random.choice(string.ascii_uppercase[:8])
-            row = random.randint(1, 8)
-            return f"{col}{row}"
+            # If no valid coordinate found, use the recommended target from the prompt
+            return self._fallback_move(prompt, board_size)
                 
         except Exception as e:
-            print(f"Error getting move from {self.model_type} ({self.model_name}): {e}")
-            # Extract suggested position from prompt as fallback
-            import re
-            suggested_match = re.search(r'Suggested position: ([A-H][1-8])', prompt)
-            if suggested_match:
-                return suggested_match.group(1)
-            # Final fallback - random move
-            import random
-            import string
-            col = random.choice(string.ascii_uppercase[:8])
-            row = random.randint(1, 8)
-            return f"{col}{row}"
+            logger.error(f"Error getting move from {self.model_type} ({self.model_name}): {e}")
+            # Extract the recommended target from the prompt as fallback
+            return self._fallback_move(prompt, board_size)
+    
+    @staticmethod
+    def _fallback_move(prompt: str, board_size: int) -> str:
+        """The prompt's recommended target, or a random cell if it has none"""
+        recommended = prompt.split("RECOMMENDED: Target", 1)[1] if "RECOMMENDED: Target" in prompt else ""
+        coordinate = parse_coordinate(recommended, board_size)
+        if coordinate:
+            return format_coordinate(*coordinate)
+        return random_coordinate(board_size)
     
     async def get_move_async(self, prompt: str, game_state: dict = None) -> str:
         """Get a move from the LLM (async version for other games)"""
@@ -247,6 +306,9 @@ class LLMClient:
 class BaseGame(ABC):
     """Base class for all games"""
     
+    # Presentation pacing; set per match (a class default, so games restored from older snapshots have it too)
+    pacing: Pacing = get_pacing()
+    
     def __init__(self, player1_model: str, player2_model: str, use_async: bool = False):
         self.player1 = LLMClient(player1_model, use_async)
         self.player2 = LLMClient(player2_model, use_async)
@@ -0,0 +1,158 @@
+"""
+Structured, non-blocking logging
+Records are handed to a queue and written by a background listener thread, so a slow
+stdout never stalls the event loop. Output is JSON (with game_id/turn fields) or plain text
+"""
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+from typing import Dict, Optional, TextIO
+
+ROOT_LOGGER = "versus"
+
+# VERSUS_LOG_LEVEL sets the default; VERSUS_LOG_LEVELS="battleship=DEBUG,letta=WARNING" overrides per subsystem
+DEFAULT_LEVEL = os.getenv("VERSUS_LOG_LEVEL", "INFO").upper()
+SUBSYSTEM_LEVELS = os.getenv("VERSUS_LOG_LEVELS", "")
+# "json", "text", or "auto" (text on a terminal, JSON otherwise)
+LOG_FORMAT = os.getenv("VERSUS_LOG_FORMAT", "auto").lower()
+# Fraction of sampled (per-move) debug records that are kept
+SAMPLE_RATE = float(os.getenv("VERSUS_LOG_SAMPLE_RATE", "0.1"))
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "sampled"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def get_logger(subsystem: str) -> logging.Logger:
+    """Logger for one subsystem (battleship, trivia, letta, jobs, ...)"""
+    return logging.getLogger(f"{ROOT_LOGGER}.{subsystem}")
+
+
+def game_fields(game_id: Optional[str] = None, turn: Optional[int] = None, **fields) -> Dict:
+    """`extra=` payload tagging a record with its match and turn"""
+    extra = {key: value for key, value in fields.items() if value is not None}
+    if game_id is not None:
+        extra["game_id"] = game_id
+    if turn is not None:
+        extra["turn"] = turn
+    return extra
+
+
+def move_fields(game_id: Optional[str] = None, turn: Optional[int] = None, **fields) -> Dict:
+    """Like game_fields, but marks a high-volume per-move record for sampling"""
+    extra = game_fields(game_id, turn, **fields)
+    extra["sampled"] = True
+    return extra
+
+
+class SamplingFilter(logging.Filter):
+    """Keep only SAMPLE_RATE of the records flagged as sampled"""
+
+    def __init__(self, rate: float = SAMPLE_RATE):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "sampled", False):
+            return random.random() < self.rate
+        return True
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Render the message and traceback on the calling thread, but keep the record's extra fields"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "msg": record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """The console look the server has always had, with game/turn appended when present"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = record.getMessage()
+        tags = [f"{key}={getattr(record, key)}" for key in ("game_id", "turn") if hasattr(record, key)]
+        if tags:
+            line = f"{line} [{' '.join(tags)}]"
+        if record.exc_text:
+            line = f"{line}\n{record.exc_text}"
+        return line
+
+
+def _parse_levels(spec: str) -> Dict[str, str]:
+    levels = {}
+    for item in spec.split(","):
+        name, sep, level = item.partition("=")
+        if sep and name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def setup_logging(level: str = DEFAULT_LEVEL, fmt: str = LOG_FORMAT, levels: str = SUBSYSTEM_LEVELS,
+                  output: Optional[TextIO] = None):
+    """Route every versus.* logger through a queue to one writer thread (idempotent)
+
+    Logs go to stdout unless `output` is given, e.g. stderr for scripts whose stdout is data.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    output = output or sys.stdout
+    if fmt == "auto":
+        fmt = "text" if output.isatty() else "json"
+    stream = logging.StreamHandler(output)
+    stream.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+
+    log_queue: "queue.Queue" = queue.Queue(-1)
+    queue_handler = _QueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter())
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(level)
+    root.addHandler(queue_handler)
+    root.propagate = False
+    for subsystem, subsystem_level in _parse_levels(levels).items():
+        get_logger(subsystem).setLevel(subsystem_level)
+
+    _listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,167 @@
+"""
+Event loop lag monitor
+A heartbeat task measures how late the loop wakes up; a watchdog thread grabs the
+loop thread's stack when it stalls so blocking calls can be traced to a call site
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.log import get_logger
+from src.utils.metrics import LOOP_BLOCKS, LOOP_LAG
+
+logger = get_logger("loop")
+
+DEFAULT_INTERVAL = float(os.getenv("VERSUS_LOOP_MONITOR_INTERVAL_MS", "100")) / 1000
+DEFAULT_THRESHOLD = float(os.getenv("VERSUS_LOOP_LAG_THRESHOLD_MS", "250")) / 1000
+# Log the full stack of every stall (useful when running smoke tests)
+STRICT = os.getenv("VERSUS_LOOP_STRICT", "0") == "1"
+
+# Weight of the newest beat in recent_lag (about the last second at the default interval)
+LAG_SMOOTHING = 0.2
+
+# Frames under this directory count as "our" code when picking a call site
+SOURCE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STACK_DEPTH = 12
+
+
+class LoopMonitor:
+    def __init__(self, interval: float = DEFAULT_INTERVAL, threshold: float = DEFAULT_THRESHOLD,
+                 strict: bool = STRICT):
+        self.interval = interval
+        self.threshold = threshold
+        self.strict = strict
+        self.loop_thread_id: Optional[int] = None
+        self.last_beat = time.monotonic()
+        self.max_lag = 0.0
+        # Exponentially weighted recent lag, for load shedding decisions
+        self.recent_lag = 0.0
+        self.stalls = 0
+        # call site -> {"count", "total_seconds", "max_seconds", "stack"}
+        self.offenders: Dict[str, Dict] = {}
+        self._heartbeat: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        # (beat the stall started after, call site, stack) captured by the watchdog
+        self._captured: Optional[Tuple[float, str, List[str]]] = None
+
+    def start(self):
+        """Start monitoring the running loop (call from inside it)"""
+        if self._heartbeat is not None:
+            return
+        self.loop_thread_id = threading.get_ident()
+        self.last_beat = time.monotonic()
+        self._stop.clear()
+        self._heartbeat = asyncio.create_task(self._beat(), name="loop-monitor")
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(f"🩺 Loop monitor running (stall threshold {self.threshold * 1000:.0f}ms)")
+
+    async def stop(self):
+        self._stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            try:
+                await self._heartbeat
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat = None
+        self._watchdog = None
+
+    async def _beat(self):
+        while True:
+            before = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - before - self.interval)
+            LOOP_LAG.observe(lag)
+            self.max_lag = max(self.max_lag, lag)
+            self.recent_lag += LAG_SMOOTHING * (lag - self.recent_lag)
+            if lag >= self.threshold:
+                self._record_stall(self.last_beat, lag)
+            self.last_beat = now
+
+    def _watch(self):
+        """Watchdog thread: while the loop is stalled, capture what it is running"""
+        while not self._stop.wait(self.interval / 2):
+            beat = self.last_beat
+            # The heartbeat sleeps `interval` between beats, so only time beyond that is lag
+            if time.monotonic() - beat < self.interval + self.threshold:
+                continue
+            if self._captured is not None and self._captured[0] == beat:
+                continue  # already captured this stall
+            frame = sys._current_frames().get(self.loop_thread_id)
+            if frame is None:
+                continue
+            stack = traceback.extract_stack(frame)
+            self._captured = (beat, self._call_site(stack), [
+                f"{entry.filename}:{entry.lineno} in {entry.name}" for entry in stack[-STACK_DEPTH:]
+            ])
+
+    def _call_site(self, stack: traceback.StackSummary) -> str:
+        """Innermost frame in project code, else the innermost frame overall"""
+        for entry in reversed(stack):
+            if entry.filename.startswith(SOURCE_ROOT) and not entry.filename.endswith("loop_monitor.py"):
+                return f"{os.path.relpath(entry.filename, os.path.dirname(SOURCE_ROOT))}:{entry.lineno} in {entry.name}"
+        if stack:
+            entry = stack[-1]
+            return f"{os.path.basename(entry.filename)}:{entry.lineno} in {entry.name}"
+        return "unknown"
+
+    def _record_stall(self, beat: float, lag: float):
+        captured = self._captured
+        if captured is not None and captured[0] == beat:
+            _, site, stack = captured
+        else:
+            # Stall was shorter than the watchdog's polling period
+            site, stack = "unknown", []
+        self._captured = None
+
+        self.stalls += 1
+        LOOP_BLOCKS.inc(site)
+        offender = self.offenders.setdefault(site, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0, "stack": stack})
+        offender["count"] += 1
+        offender["total_seconds"] += lag
+        offender["max_seconds"] = max(offender["max_seconds"], lag)
+        if stack:
+            offender["stack"] = stack
+
+        message = f"🐢 Event loop blocked for {lag * 1000:.0f}ms at {site}"
+        if self.strict and stack:
+            message += "\n   " + "\n   ".join(stack)
+        logger.warning(message)
+
+    def report(self) -> Dict:
+        """Stall counts and worst offenders, heaviest first"""
+        offenders = sorted(self.offenders.items(), key=lambda item: item[1]["total_seconds"], reverse=True)
+        return {
+            "running": self._heartbeat is not None,
+            "threshold_ms": round(self.threshold * 1000),
+            "stalls": self.stalls,
+            "max_lag_ms": round(self.max_lag * 1000, 1),
+            "recent_lag_ms": round(self.recent_lag * 1000, 1),
+            "offenders": [
+                {
+                    "call_site": site,
+                    "count": data["count"],
+                    "total_ms": round(data["total_seconds"] * 1000, 1),
+                    "max_ms": round(data["max_seconds"] * 1000, 1),
+                    "stack": data["stack"]
+                }
+                for site, data in offenders
+            ]
+        }
+
+    def reset(self):
+        self.offenders.clear()
+        self.stalls = 0
+        self.max_lag = 0.0
+
+
+# Global instance
+loop_monitor = LoopMonitor()
@@ -0,0 +1,329 @@
+"""
+Prometheus-style metrics
+Counters and histograms are sharded per thread so the hot path never takes a lock;
+shards are only merged when /metrics is scraped
+"""
+
+import bisect
+import inspect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from src.utils.log import get_logger
+
+logger = get_logger("metrics")
+
+# Seconds; covers quick socket fan-outs up to slow LLM turns
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = Tuple[str, ...]
+# A gauge callback returns {label values: value}, directly or as an awaitable
+GaugeCallback = Callable[[], Union[Dict[LabelValues, float], Awaitable[Dict[LabelValues, float]]]]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: LabelValues, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Sharded:
+    """Per-thread storage: each thread only ever writes to its own dict"""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[dict] = []
+
+    def _shard(self) -> dict:
+        shard = getattr(self._local, "values", None)
+        if shard is None:
+            shard = {}
+            self._local.values = shard
+            self._shards.append(shard)  # list.append is atomic under the GIL
+        return shard
+
+    def _snapshots(self) -> List[dict]:
+        # dict.copy() runs without releasing the GIL, so each copy is consistent
+        return [shard.copy() for shard in list(self._shards)]
+
+
+class Counter(_Sharded):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = ()):
+        super().__init__()
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+
+    def inc(self, *label_values: str, amount: float = 1):
+        shard = self._shard()
+        shard[label_values] = shard.get(label_values, 0) + amount
+
+    def collect(self) -> Dict[LabelValues, float]:
+        totals: Dict[LabelValues, float] = {}
+        for snapshot in self._snapshots():
+            for key, value in snapshot.items():
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+                for key, value in sorted(self.collect().items())]
+
+
+class Histogram(_Sharded):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__()
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *label_values: str):
+        shard = self._shard()
+        series = shard.get(label_values)
+        if series is None:
+            # One slot per bucket, then +Inf, then the running sum
+            series = [0] * (len(self.buckets) + 2)
+            shard[label_values] = series
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    @contextmanager
+    def time(self, *label_values: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *label_values)
+
+    def collect(self) -> Dict[LabelValues, List[float]]:
+        totals: Dict[LabelValues, List[float]] = {}
+        for snapshot in self._snapshots():
+            for key, series in snapshot.items():
+                merged = totals.setdefault(key, [0] * len(series))
+                for i, value in enumerate(list(series)):
+                    merged[i] += value
+        return totals
+
+    def render(self) -> List[str]:
+        lines = []
+        for key, series in sorted(self.collect().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                le = _format_value(bound) if bound != float("inf") else "+Inf"
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, ('le', le))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """Value read from a callback at scrape time, so keeping it current costs nothing"""
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = (),
+                 callback: Optional[GaugeCallback] = None):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.callback = callback
+
+    def set_function(self, callback: GaugeCallback):
+        self.callback = callback
+
+    async def render_async(self) -> List[str]:
+        if self.callback is None:
+            return []
+        values = self.callback()
+        if inspect.isawaitable(values):
+            values = await values
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+                for key, value in sorted(values.items())]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics: Dict[str, Union[Counter, Histogram, Gauge]] = {}
+
+    def _register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labels: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labels))
+
+    def histogram(self, name: str, help_text: str, labels: Tuple[str, ...] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, labels, buckets))
+
+    def gauge(self, name: str, help_text: str, labels: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, labels))
+
+    async def render(self) -> str:
+        """Text exposition format (version 0.0.4)"""
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            if isinstance(metric, Gauge):
+                try:
+                    lines.extend(await metric.render_async())
+                except Exception as e:
+                    logger.warning(f"⚠️  Could not collect {metric.name}: {e}")
+            else:
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Global instance
+metrics = MetricsRegistry()
+
+GAMES_ACTIVE = metrics.gauge("versus_games_active", "Matches currently in progress", ("game_type",))
+GAMES_FINISHED = metrics.counter("versus_games_finished_total", "Matches that reached a result", ("game_type",))
+TURN_DURATION = metrics.histogram("versus_turn_duration_seconds", "Time to produce one turn, including the model call",
+                                  ("game_type", "model"))
+
+LLM_CALLS = metrics.counter("versus_llm_calls_total", "LLM API calls", ("provider",))
+LLM_ERRORS = metrics.counter("versus_llm_errors_total", "LLM API calls that failed", ("provider",))
+LLM_LATENCY = metrics.histogram("versus_llm_call_duration_seconds", "LLM API call latency", ("provider",))
+LLM_TOKENS = metrics.counter("versus_llm_tokens_total", "Tokens reported by LLM providers", ("provider", "direction"))
+
+WEBSOCKET_CONNECTIONS = metrics.gauge("versus_websocket_connections", "Subscribed sockets per channel", ("channel",))
+BROADCAST_FANOUT = metrics.histogram("versus_broadcast_fanout_seconds", "Time to deliver one published message to every subscriber",
+                                     ("channel",), buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0))
+VOTES = metrics.counter("versus_votes_total", "Audience votes received", ("model",))
+
+LOOP_LAG = metrics.histogram("versus_event_loop_lag_seconds", "How late the event loop ran a scheduled wake-up",
+                             buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0))
+LOOP_BLOCKS = metrics.counter("versus_event_loop_blocks_total", "Event loop stalls over the threshold, by blocking call site",
+                              ("call_site",))
+
+JOB_QUEUE_DEPTH = metrics.gauge("versus_job_queue_jobs", "Background jobs by type and state", ("job_type", "state"))
+
+LLM_IN_FLIGHT = metrics.gauge("versus_llm_calls_in_flight", "LLM API calls currently waiting on a provider", ("provider",))
+ADMISSION_REJECTED = metrics.counter("versus_admission_rejected_total", "New matches turned away by admission control",
+                                     ("game_type", "reason"))
+TURN_REPLAYS = metrics.counter("versus_turn_replays_total",
+                               "Turn requests answered without a new turn: replayed, coalesced or refused as a conflict",
+                               ("game_type", "outcome"))
+ACTOR_COMMANDS = metrics.counter("versus_actor_commands_total", "Commands handled by match actors", ("game_type", "command"))
+ACTOR_MAILBOX_WAIT = metrics.histogram("versus_actor_mailbox_wait_seconds", "Time a command waited in a match actor's mailbox",
+                                       ("game_type",))
+WAITING_ROOM = metrics.gauge("versus_waiting_room_size", "Clients holding a place in line for a new match", ("game_type",))
+
+# Calls in progress per provider: +1 on entry, -1 on exit on the same per-thread shards as the
+# counters (unregistered, it's exported through LLM_IN_FLIGHT), so tracking a call takes no lock
+_in_flight = Counter("versus_llm_calls_in_flight", "LLM API calls currently waiting on a provider", ("provider",))
+
+
+def llm_calls_in_flight() -> Dict[str, int]:
+    return {provider: int(count) for (provider,), count in _in_flight.collect().items() if count}
+
+
+LLM_IN_FLIGHT.set_function(lambda: {(provider,): count for provider, count in llm_calls_in_flight().items()})
+
+
+class LLMUsage:
+    """Calls, latency and tokens of every LLM call made inside one llm_usage() block"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self._lock = threading.Lock()
+
+    def add(self, calls: int = 0, errors: int = 0, seconds: float = 0.0, input_tokens: int = 0, output_tokens: int = 0):
+        with self._lock:
+            self.calls += calls
+            self.errors += errors
+            self.seconds += seconds
+            self.input_tokens += input_tokens
+            self.output_tokens += output_tokens
+
+    def to_dict(self) -> Dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "latency_ms": round(self.seconds / self.calls * 1000, 1) if self.calls else 0.0,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens
+        }
+
+
+# Usage blocks open in the current context; asyncio tasks and to_thread calls inherit them
+_usage_scopes: ContextVar[Tuple[LLMUsage, ...]] = ContextVar("llm_usage_scopes", default=())
+
+
+@contextmanager
+def llm_usage(usage: Optional[LLMUsage] = None):
+    """Add the LLM calls made inside this block (in this task and the threads it starts) to `usage` (or a new LLMUsage)"""
+    usage = usage if usage is not None else LLMUsage()
+    token = _usage_scopes.set(_usage_scopes.get() + (usage,))
+    try:
+        yield usage
+    finally:
+        _usage_scopes.reset(token)
+
+
+class LLMCall:
+    """Handle yielded by track_llm_call for callers that report failures without raising"""
+
+    def __init__(self, provider: str):
+        self.provider = provider
+        self.failed = False
+        self.scopes = _usage_scopes.get()
+
+    def fail(self):
+        self.failed = True
+
+    def tokens(self, input_tokens: int, output_tokens: int):
+        """Record the token usage a provider reported for this call"""
+        LLM_TOKENS.inc(self.provider, "input", amount=input_tokens)
+        LLM_TOKENS.inc(self.provider, "output", amount=output_tokens)
+        for usage in self.scopes:
+            usage.add(input_tokens=input_tokens, output_tokens=output_tokens)
+
+
+@contextmanager
+def track_llm_call(provider: str):
+    """Count and time one LLM call; exceptions (or call.fail()) are recorded as errors"""
+    provider = provider.lower()
+    LLM_CALLS.inc(provider)
+    call = LLMCall(provider)
+    _in_flight.inc(provider)
+    start = time.perf_counter()
+    try:
+        yield call
+    except Exception:
+        call.fail()
+        raise
+    finally:
+        _in_flight.inc(provider, amount=-1)
+        if call.failed:
+            LLM_ERRORS.inc(provider)
+        elapsed = time.perf_counter() - start
+        LLM_LATENCY.observe(elapsed, provider)
+        for usage in call.scopes:
+            usage.add(calls=1, errors=int(call.failed), seconds=elapsed)
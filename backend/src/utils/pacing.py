@@ -0,0 +1,43 @@
+"""
+Presentation pacing
+Delays that only exist so viewers can follow a match (ship placement reveals, pauses while a
+debate argument is read aloud, the trivia wrong-answer cooldown, autoplay turn gaps) scale with
+a per-match profile: live keeps the show's timing, fast shortens it, and turbo removes it so
+automated and benchmark matches run at compute and model speed
+"""
+
+import asyncio
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+# Share of the live delays kept by the fast profile
+FAST_SCALE = float(os.getenv("VERSUS_PACING_FAST_SCALE", "0.25"))
+
+
+@dataclass(frozen=True)
+class Pacing:
+    name: str
+    scale: float  # multiplier on every live delay
+
+    def seconds(self, live_seconds: float) -> float:
+        return live_seconds * self.scale
+
+    async def pause(self, live_seconds: float):
+        """Sleep for this profile's share of a live delay (turbo only yields to the loop)"""
+        await asyncio.sleep(self.seconds(live_seconds))
+
+
+PROFILES = {
+    "live": Pacing("live", 1.0),
+    "fast": Pacing("fast", FAST_SCALE),
+    "turbo": Pacing("turbo", 0.0)
+}
+
+
+def get_pacing(name: Optional[str] = None) -> Pacing:
+    """Profile by name; defaults to VERSUS_PACING (live). Raises ValueError for an unknown name"""
+    name = (name or os.getenv("VERSUS_PACING", "live")).lower()
+    if name not in PROFILES:
+        raise ValueError(f"Unknown pacing profile '{name}' (expected one of: {', '.join(PROFILES)})")
+    return PROFILES[name]
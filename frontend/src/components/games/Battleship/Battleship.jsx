@@ -4,7 +4,8 @@ import GameBoard from '../../common/GameBoard';
 import GameTimer from '../../common/GameTimer';
 import './Battleship.css';
 
-const BOARD_SIZE = 8;
+// Until the server tells us otherwise (matches can be played on boards up to 26x26)
+const DEFAULT_BOARD_SIZE = 8;
 
 const GAME_STATUS = {
   WAITING: 'waiting',
@@ -27,7 +28,10 @@ const Battleship = ({ player1Model, player2Model, onBack }) => {
   const [gameTimer, setGameTimer] = useState(0);
   const [isConnected, setIsConnected] = useState(false);
   const [gameStarted, setGameStarted] = useState(false);
+  const [boardSize, setBoardSize] = useState(DEFAULT_BOARD_SIZE);
   const wsRef = useRef(null);
+  const lastSeqRef = useRef(null);
+  const boardSizeRef = useRef(DEFAULT_BOARD_SIZE);
 
   // Convert model IDs to the backend format
   const getBackendModelName = (modelId) => {
@@ -175,10 +179,67 @@ const Battleship = ({ player1Model, player2Model, onBack }) => {
     }, 2000);
   };
 
+  // Resize every grid when the match is on a different board; snapshots that follow fill them in
+  const applyBoardSize = (size) => {
+    if (!size || size === boardSizeRef.current) return;
+    boardSizeRef.current = size;
+    setBoardSize(size);
+    setPlayer1Board(createEmptyBoard(size));
+    setPlayer2Board(createEmptyBoard(size));
+    setPlayer1Shots(createEmptyBoard(size));
+    setPlayer2Shots(createEmptyBoard(size));
+  };
+
+  const requestState = () => {
+    if (wsRef.current && wsRef.current.readyState === WebSocket.OPEN) {
+      wsRef.current.send(JSON.stringify({ type: 'get_state' }));
+    }
+  };
+
+  const applyShot = (shots, row, col, result) => {
+    const next = shots.map(r => [...r]);
+    next[row][col] = result;
+    return next;
+  };
+
   const handleGameStateUpdate = (data) => {
     console.log('Game state update:', data.type);
     
-    if (data.type === 'ship_placed') {
+    // Events carry a per-game sequence number; full snapshots reset it and a gap
+    // means we missed something, so ask the server for a fresh snapshot.
+    // Interview events are numbered on their own topic, so they don't count here
+    if (typeof data.seq === 'number' && data.type !== 'post_game_interviews') {
+      if (data.type === 'game_state') {
+        lastSeqRef.current = data.seq;
+      } else if (lastSeqRef.current !== null && data.seq > lastSeqRef.current + 1) {
+        console.warn(`Missed events ${lastSeqRef.current + 1}-${data.seq - 1}, resyncing`);
+        lastSeqRef.current = data.seq;
+        requestState();
+      } else {
+        lastSeqRef.current = data.seq;
+      }
+    }
+    
+    if (typeof data.boardSize === 'number') {
+      applyBoardSize(data.boardSize);
+    }
+    
+    if (data.type === 'shot') {
+      if (data.row >= boardSizeRef.current || data.col >= boardSizeRef.current) {
+        // Shot off the grid we know about: we missed the board size, so fetch a full snapshot
+        requestState();
+        return;
+      }
+      const cell = `${String.fromCharCode(65 + data.col)}${data.row + 1}`;
+      if (data.player === 1) {
+        setPlayer1Shots(prev => applyShot(prev, data.row, data.col, data.result));
+      } else {
+        setPlayer2Shots(prev => applyShot(prev, data.row, data.col, data.result));
+      }
+      setCurrentPlayer(data.currentPlayer);
+      if (data.winner) setWinner(data.winner);
+      setMessage(`Player ${data.player} fired at ${cell} - ${data.result.toUpperCase()}!${data.fallback ? ' (fallback: recommended target)' : ''}`);
+    } else if (data.type === 'ship_placed') {
       if (data.player === 1) {
         setPlayer1Board(data.board);
       } else {
@@ -239,8 +300,8 @@ const Battleship = ({ player1Model, player2Model, onBack }) => {
   };
 
   // Initialize empty board
-  function createEmptyBoard() {
-    return Array(BOARD_SIZE).fill(null).map(() => Array(BOARD_SIZE).fill(null));
+  function createEmptyBoard(size = DEFAULT_BOARD_SIZE) {
+    return Array(size).fill(null).map(() => Array(size).fill(null));
   }
 
   // Get column letters
@@ -250,9 +311,9 @@ const Battleship = ({ player1Model, player2Model, onBack }) => {
   const renderOwnBoard = (player) => (row, col) => {
     const board = player === 1 ? player1Board : player2Board;
     const shots = player === 1 ? player2Shots : player1Shots;
-    const cellValue = board[row][col];
-    const isHit = shots[row][col] === 'hit';
-    const isMiss = shots[row][col] === 'miss';
+    const cellValue = board[row]?.[col];
+    const isHit = shots[row]?.[col] === 'hit';
+    const isMiss = shots[row]?.[col] === 'miss';
 
     if (isMiss && !cellValue) {
       return <div className="cell-miss">💨</div>;
@@ -294,7 +355,7 @@ const Battleship = ({ player1Model, player2Model, onBack }) => {
   // Render cell for target board (shows shots taken)
   const renderTargetBoard = (player) => (row, col) => {
     const shots = player === 1 ? player1Shots : player2Shots;
-    const shotResult = shots[row][col];
+    const shotResult = shots[row]?.[col];
 
     if (shotResult === 'hit') {
       return <div className="cell-hit">💥</div>;
@@ -362,16 +423,16 @@ const Battleship = ({ player1Model, player2Model, onBack }) => {
                   <thead>
                     <tr>
                       <th className="corner-cell"></th>
-                      {Array.from({ length: BOARD_SIZE }, (_, i) => (
+                      {Array.from({ length: boardSize }, (_, i) => (
                         <th key={i} className="col-label">{getColumnLabel(i)}</th>
                       ))}
                     </tr>
                   </thead>
                   <tbody>
-                    {Array.from({ length: BOARD_SIZE }, (_, row) => (
+                    {Array.from({ length: boardSize }, (_, row) => (
                       <tr key={row}>
                         <td className="row-label">{row + 1}</td>
-                        {Array.from({ length: BOARD_SIZE }, (_, col) => (
+                        {Array.from({ length: boardSize }, (_, col) => (
                           <td key={`${row}-${col}`} className="game-cell own-cell">
                             {renderOwnBoard(1)(row, col)}
                           </td>
@@ -390,16 +451,16 @@ const Battleship = ({ player1Model, player2Model, onBack }) => {
                   <thead>
                     <tr>
                       <th className="corner-cell"></th>
-                      {Array.from({ length: BOARD_SIZE }, (_, i) => (
+                      {Array.from({ length: boardSize }, (_, i) => (
                         <th key={i} className="col-label">{getColumnLabel(i)}</th>
                       ))}
                     </tr>
                   </thead>
                   <tbody>
-                    {Array.from({ length: BOARD_SIZE }, (_, row) => (
+                    {Array.from({ length: boardSize }, (_, row) => (
                       <tr key={row}>
                         <td className="row-label">{row + 1}</td>
-                        {Array.from({ length: BOARD_SIZE }, (_, col) => (
+                        {Array.from({ length: boardSize }, (_, col) => (
                           <td key={`${row}-${col}`} className="game-cell target-cell">
                             {renderTargetBoard(1)(row, col)}
                           </td>
@@ -438,16 +499,16 @@ const Battleship = ({ player1Model, player2Model, onBack }) => {
                   <thead>
                     <tr>
                       <th className="corner-cell"></th>
-                      {Array.from({ length: BOARD_SIZE }, (_, i) => (
+                      {Array.from({ length: boardSize }, (_, i) => (
                         <th key={i} className="col-label">{getColumnLabel(i)}</th>
                       ))}
                     </tr>
                   </thead>
                   <tbody>
-                    {Array.from({ length: BOARD_SIZE }, (_, row) => (
+                    {Array.from({ length: boardSize }, (_, row) => (
                       <tr key={row}>
                         <td className="row-label">{row + 1}</td>
-                        {Array.from({ length: BOARD_SIZE }, (_, col) => (
+                        {Array.from({ length: boardSize }, (_, col) => (
                           <td key={`${row}-${col}`} className="game-cell target-cell">
                             {renderTargetBoard(2)(row, col)}
                           </td>
@@ -466,16 +527,16 @@ const Battleship = ({ player1Model, player2Model, onBack }) => {
                   <thead>
                     <tr>
                       <th className="corner-cell"></th>
-                      {Array.from({ length: BOARD_SIZE }, (_, i) => (
+                      {Array.from({ length: boardSize }, (_, i) => (
                         <th key={i} className="col-label">{getColumnLabel(i)}</th>
                       ))}
                     </tr>
                   </thead>
                   <tbody>
-                    {Array.from({ length: BOARD_SIZE }, (_, row) => (
+                    {Array.from({ length: boardSize }, (_, row) => (
                       <tr key={row}>
                         <td className="row-label">{row + 1}</td>
-                        {Array.from({ length: BOARD_SIZE }, (_, col) => (
+                        {Array.from({ length: boardSize }, (_, col) => (
                           <td key={`${row}-${col}`} className="game-cell own-cell">
                             {renderOwnBoard(2)(row, col)}
                           </td>